@@ -1,2 +1,17 @@
-#define DOCSTRING_LERP "lerp, invlerp and remap\nExported for convenience, since these are internally used in the LerpThing.\n\nThese are your normal lerp functions.\n\n    lerp(a: float, b:float, t) -> float\n        Returns interpolation from a to b at point in time t\n\n    invlerp(a: float, b: float, v: float) -> float\n        Returns t for interpolation from a to b at point v.\n\n    remap(a0: float, a1: float, b0: float, b1: float, v0: float) -> float\n        Maps point v0 in range a0/a1 onto range b0/b1.\n\n\"point in time\" in this context means between 0 and 1.\n\n    lerp(0, 10, 0.5) --> 5\n    invlerp(0, 10, 5) --> 0.5\n    remap(0, 10, 0, 100, 5) --> 50\n"
+#define DOCSTRING_LERP "lerp, invlerp and remap\nExported for convenience, since these are internally used in the LerpThing.\n\nThese are your normal lerp functions.\n\n    lerp(a: float, b:float, t, ease=None) -> float\n        Returns interpolation from a to b at point in time t, optionally\n        eased by `ease(t)`\n\n    invlerp(a: float, b: float, v: float) -> float\n        Returns t for interpolation from a to b at point v.\n\n    remap(a0: float, a1: float, b0: float, b1: float, v0: float) -> float\n        Maps point v0 in range a0/a1 onto range b0/b1.\n\n\"point in time\" in this context means between 0 and 1.\n\n    lerp(0, 10, 0.5) --> 5\n    invlerp(0, 10, 5) --> 0.5\n    remap(0, 10, 0, 100, 5) --> 50\n\nThe easing functions in `pgcooldown.easings` are run directly in C, any\nother callable is called as usual.\n"
+#define DOCSTRING_LERP_INTO "lerp_into(out, a, b, t, ease=None) -> out\nLerp the sequences a and b element-wise at point in time t into `out`.\nIf given, `ease(t)` is used instead of `t`.\n\n`a` and `b` must be sequences of numbers with the same length as `out`.\n`out` can be any mutable sequence, e.g. a list or a pygame Vector2.  If\n`out` supports the buffer protocol with doubles (e.g. `array('d')`), the\nresults are written directly into the buffer without creating float\nobjects.\n\nThe output buffer is returned for convenience.\n\n    out = [0, 0]\n    lerp_into(out, (0, 0), (10, 100), 0.5) --> [5.0, 50.0]\n"
+#define DOCSTRING_LERP_KEYFRAMES "lerp_keyframes(times, values, t, eases=None) -> float\nLerp between keyframes at time t.\n\n`times` are the ascending points in time of the keyframes, `values` the\nvalues at these points.  The segment around `t` is found by binary search,\nand lerped, optionally eased by `eases`, which is either one easing\nfunction for all segments, or a sequence of one easing function or `None`\nper segment.\n\nBefore the first and after the last keyframe, the first/last value is\nreturned.\n\n    lerp_keyframes((0, 1, 3), (0, 10, 0), 2) --> 5.0\n\nThis is what the KeyframeTrack uses internally.\n"
 #define DOCSTRING_COOLDOWN "Track a cooldown over a period of time.\n\n    cooldown = Cooldown(5)\n\n    while True:\n        do_stuff()\n\n        if key_pressed\n            if key == 'P':\n                cooldown.pause()\n            elif key == 'ESC':\n                cooldown.start()\n\n        if cooldown.cold():\n            launch_stuff()\n            cooldown.reset()\n\nCooldown can be used to time sprite animation frame changes,\nweapon cooldown in shmups, all sorts of events when programming a\ngame.\n\nIf you want to use the cooldown more as a timing gauge, e.g. to\nmodify acceleration of a sprite over time, have a look at the\n`LerpThing` class in this package, which makes this incredibly\neasy.\n\nWhen instantiated (and started), Cooldown stores the current time.\nThe cooldown will become `cold` when the given duration has passed.\n\nWhile a cooldown is paused, the remaining time doesn't change.\n\nAt any time, the cooldown can be reset to its initial or a new\nvalue.\n\nA cooldown can be compared to int/float/bool, in which case the\n`remaining` property is used.\n\nCooldown provides a \"copy constructor\", meaning you can\ninitialize a new cooldown with an existing one.  The full state\nof the initial cooldown is used, including `paused`, `wrap`, and\nthe remaining time.\n\nWhen a cooldown is reset, depending on when you checked the\n`cold` state, more time may have passed than the actual cooldown\nduration.\n\nThe `wrap` attribute decides, if the cooldown then is just reset\nback to the duration, or if this additional time is taken into\naccount.  The `wrap` argument of the `reset` function overwrites\nthe default configuration of the cooldown instance.\n\n    c0 = Cooldown(5)\n    c1 = Cooldown(5, wrap=True)\n    sleep(7)\n    c0.temperature, c1.temperature\n        --> -2.000088164 -2.0000879129999998\n\n    c0.reset()\n    c1.reset()\n    c0.temperature, c1.temperature\n        --> 4.999999539 2.999883194\n\n    sleep(7)\n    c0.temperature, c1.temperature\n        --> -2.000189442 -4.000306759000001\n\n    c0.reset(wrap=True)\n    c1.reset(wrap=False)\n    c0.temperature, c1.temperature\n        --> 2.999748423 4.999999169\n\nA cooldown can be used as an iterator, returning the time\nremaining.\n\n    for t in Cooldown(5):\n        print(t)\n        sleep(1)\n\n    4.998921067\n    3.998788201\n    2.998640238\n    1.9984825379999993\n    0.998318566\n\n\nArguments\n---------\nduration: float | pgcooldown.Cooldown\n    Time to cooldown in seconds\n\ncold: bool = False\n    Start the cooldown already cold, e.g. for initial events.\n\npaused: bool = False\n    Created the cooldown in paused state.  Use `cooldown.start()` to\n    run it.\n\nwrap: bool = False\n    Set the reset mode to wrapped (see above).\n    Can be overwritten by the `wrap` argument to the `reset` function.\n\n\nAttributes\n----------\nAll attributes are read/write.\n\nduration: float\n    When calling `reset`, the cooldown is set to this value. Can be\n    assigned to directly or by calling `cooldown.reset(duration)`\n\ntemperature: float\n    The time left (or passed) until cooldown.  Will go negative once the\n    cooldown time has passed.\n\nremaining: float\n    Same as temperature, but will not go below 0.  When assigning, a\n    negative value will be reset to 0.\n\nnormalized: float\n    returns the current \"distance\" in the cooldown between 0 and 1, with\n    one being cold.  Ideal for being used in an easing function or lerp.\n\npaused: bool\n    to check if the cooldown is paused.  Alternatively use\n    cooldown.pause()/.start()/.is_paused() if you prefer methods.\n\nwrap: bool\n    Activate or deactivate wrap mode.\n\n\nMethods\n-------\nCooldown provides a __repr__, the comparism methods <, <=, ==, >=, >,\ncan be converted to float/int/bool, and can be used as an iterator.  The\n'temperature' value is used for all operations, so results can be\nnegative.  As an iterator, StopIteration is raised when the temperature\ngoes below 0 though.\n\ncold(): bool\n    Has the time of the cooldown run out?\n\nhot(): bool\n    Is there stil time remaining before cooldown?  This is just for\n    convenience to not write `not cooldown.cold()` all over the place.\n\nreset([new-duration], *, wrap=bool):\n    Resets the cooldown.  Without argument, resets to the current\n    duration, otherwise the given value.  See wrap for nuance.\n\n    `reset()` return `self`, so it can e.g. be chained with `pause()`\n\n\npause(), start(), is_paused():\n    Pause, start, check the cooldown.  Time is frozen during the\n    pause.\n\nset_to(val):\n    Same as `cooldown.temperature = val`.\n\nset_cold():\n    Same as `cooldown.temperature = 0`.\n"
+#define DOCSTRING_TOKENBUCKET "Rate limit with bursts.\n\n    bucket = TokenBucket(capacity=10, rate=2)\n\n    while True:\n        if fire_pressed and bucket.try_consume():\n            launch_bullet()\n\nThe bucket holds up to `capacity` tokens and refills with `rate` tokens\nper second.  Every event consumes tokens, so bursts up to `capacity`\nevents are possible, while the long term rate is limited to `rate`.\n\nThe refill is calculated from the same clock as the Cooldown when the\nbucket is accessed, there is no background timer.\n\n\nArguments\n---------\ncapacity: float\n    Maximum number of tokens in the bucket\n\nrate: float\n    Tokens refilled per second\n\ntokens: float = capacity\n    Initial number of tokens, keyword only.  Starts full by default.\n\n\nAttributes\n----------\ncapacity: float\n    Maximum number of tokens.  Shrinking it drops surplus tokens.\n\nrate: float\n    Tokens refilled per second.\n\ntokens: float\n    Tokens currently in the bucket.\n\n\nMethods\n-------\ntry_consume(n=1): bool\n    Take `n` tokens if available.  Returns False and takes nothing\n    otherwise.\n\ntime_until_available(n=1): float\n    Seconds until `n` tokens are available, 0 if they already are,\n    `inf` if they never will be (`n > capacity` or `rate == 0`).\n\nreset():\n    Refill the bucket."
+#define DOCSTRING_SLIDINGWINDOWLIMITER "Limit events per time window.\n\n    limiter = SlidingWindowLimiter(limit=100, window=60)\n\n    if not limiter.try_consume():\n        reject_request()\n\nAt most `limit` events are allowed within any `window` seconds.\n\nInstead of storing a timestamp per event, the window is approximated with\nthe counts of the current and the previous fixed window, with the previous\nwindow weighted by how much it still overlaps.  This is O(1) in time and\nmemory, no matter how many events there are.\n\n\nArguments\n---------\nlimit: float\n    Maximum number of events per window\n\nwindow: float\n    Length of the window in seconds\n\n\nAttributes\n----------\nlimit: float\n    Maximum number of events per window, read/write.\n\nwindow: float\n    Length of the window in seconds, read only.\n\ncount: float\n    The approximated number of events in the sliding window, read only.\n\n\nMethods\n-------\ntry_consume(n=1): bool\n    Count `n` events if they fit into the limit.  Returns False and counts\n    nothing otherwise.\n\ntime_until_available(n=1): float\n    Seconds until `n` events fit into the limit, 0 if they already do,\n    `inf` if they never will (`n > limit`).\n\nreset():\n    Forget all events."
+#define DOCSTRING_KEYEDRATELIMITER "One rate limiter per key, checked in bulk.\n\n    limiter = KeyedRateLimiter(TokenBucket(capacity=5, rate=1))\n\n    # Once per tick for all clients that sent a request\n    allowed = limiter.try_consume_many(client_ids)\n\n    # Now and then\n    limiter.prune()\n\nThe given TokenBucket or SlidingWindowLimiter serves as prototype.  Every\nnew key gets a fresh limiter with its configuration, i.e. a full bucket or\nan empty window.  Changing the prototype later doesn't affect existing\nkeys.\n\n`try_consume_many` checks thousands of keys in one call without going\nthrough python per key.\n\n\nArguments\n---------\nlimiter: TokenBucket | SlidingWindowLimiter\n    The prototype for all keys\n\n\nAttributes\n----------\nprototype: TokenBucket | SlidingWindowLimiter\n    The limiter given at creation, read only.\n\n\nMethods\n-------\nKeyedRateLimiter supports `len()` and `key in limiter`.\n\ntry_consume(key, n=1): bool\n    `try_consume` on the limiter of `key`.\n\ntry_consume_many(keys, n=1): list[bool]\n    `try_consume` on the limiters of all keys in order.\n\ntime_until_available(key, n=1): float\n    `time_until_available` on the limiter of `key`.\n\ndiscard(key):\n    Forget `key`.  Does nothing for unknown keys.\n\nprune(): int\n    Forget all keys whose limiter is back in its initial state (full\n    bucket, empty window), since they are identical to a new one.\n    Returns the number of removed keys."
+#define DOCSTRING_THROTTLE "Let calls through at most once per cooldown.\n\n    on_mouse_move = Throttle(handle_mouse_move, 0.1)\n\n    # or as decorator\n    @throttle(0.1)\n    def on_mouse_move(event):\n        ...\n\nThis is the `if cd.cold(): cd.reset(); do_thing()` pattern in one C call.\nA suppressed call returns None without calling into python.\n\nWith `trailing=True`, the last suppressed call is run once the cooldown\nis cold, through the `crond` that must be given then.  The crond needs to\nbe updated in the game loop as usual.\n\nWhen used as a method decorator, every instance gets its own throttle on\nfirst access, stored in the instance `__dict__` as with\n`functools.cached_property`.\n\n\nArguments\n---------\nfunc: callable\n    The function to throttle\n\nseconds: float\n    The cooldown between two calls\n\nwrap: bool = False\n    Reset the cooldown in wrap mode, see Cooldown.\n\nleading: bool = True\n    Run the call that finds the cooldown cold immediately.  Keyword only.\n\ntrailing: bool = False\n    Run the last suppressed call at the end of the cooldown.  Keyword only.\n\ncrond: CronD = None\n    The crond that runs trailing calls.  Keyword only.\n\n\nAttributes\n----------\ncooldown: Cooldown\n    The underlying cooldown, read only.\n\npending: bool\n    Is a trailing call waiting?\n\n__wrapped__: callable\n    The throttled function.\n\n\nMethods\n-------\nflush():\n    Run the pending trailing call now.\n\ncancel():\n    Drop the pending trailing call."
+#define DOCSTRING_DEBOUNCE "Run a call only after the calls stopped for a while.\n\n    crond = CronD()\n    save_settings = Debounce(write_settings_to_disk, 1.0, crond)\n\nEvery call restarts the cooldown.  The last call is run through the\ncrond, once no further call came in for `seconds`.  The crond needs to be\nupdated in the game loop as usual.\n\nThe crond job is only rescheduled when it runs while the cooldown is still\nhot, so a call costs one C call, independent of how often it is repeated.\n\nWhen used as a method decorator, every instance gets its own debounce on\nfirst access, stored in the instance `__dict__` as with\n`functools.cached_property`.\n\n\nArguments\n---------\nfunc: callable\n    The function to debounce\n\nseconds: float\n    The quiet period before the call is run\n\ncrond: CronD = None\n    The crond that runs trailing calls.  Only optional with\n    `trailing=False`.\n\nleading: bool = False\n    Run the first call of a burst immediately.  Keyword only.\n\ntrailing: bool = True\n    Run the last call of a burst after the quiet period.  Keyword only.\n\n\nAttributes, Methods\n-------------------\nSame as Throttle."
+#define DOCSTRING_COOLDOWNTABLE "A table of cooldowns in a buffer shared between processes.\n\n    shm = SharedMemory(create=True, size=CooldownTable.nbytes(1000))\n    table = CooldownTable(shm.buf, create=True, duration=1.5)\n\n    # in the other processes\n    shm = SharedMemory(name)\n    table = CooldownTable(shm.buf)\n\n    if table.try_acquire(account_id):\n        do_rate_limited_thing()\n\nThe cooldowns are stored as deadlines in monotonic nanoseconds directly in\nthe buffer, which can be a `multiprocessing.shared_memory` buffer, an mmap'd\nfile or anything else writable that supports the buffer protocol.  All\nprocesses on the same host see the same timers, without copies or IPC.\n\nAll updates are atomic.  `try_acquire` checks for cold and starts the\ncooldown in one compare and set, so only one process wins a cold slot.\nOn platforms without lock free 64 bit atomics or a monotonic clock,\n`CooldownTable()` raises `NotImplementedError`.\n\nThe table is indexed by int, mapping keys to slots is up to the\napplication.  There is no pause in shared cooldowns.\n\nSee `SharedCooldownTable` for a wrapper that manages the shared memory.\n\n\nArguments\n---------\nbuffer: Buffer\n    A writable, 8 byte aligned buffer of at least `nbytes(size)` bytes.\n\ncreate: bool = False\n    Initialize a new table in the buffer with all cooldowns cold.\n    Otherwise, the buffer must already contain a table.\n\nduration: float = 0.0\n    The initial duration of all cooldowns when creating.  Keyword only.\n\n\nMethods\n-------\nnbytes(size) -> int:\n    Static method, the buffer size needed for `size` cooldowns.\n\ntry_acquire(index, duration=None) -> bool:\n    Start the cooldown if it is cold.  Without `duration`, the stored one\n    is used.\n\ntry_acquire_many(indices, duration=None) -> list[bool]:\n    `try_acquire` for many indices in one call.\n\nreset(index, duration=None):\n    Restart the cooldown unconditionally.\n\nset_cold(index):\n    Make the cooldown cold.\n\ncompare_and_set(index, expected, new) -> bool:\n    Set the deadline to `new` if it is `expected`.  Deadlines are\n    nanoseconds of `CLOCK_MONOTONIC`, `QueryPerformanceCounter` on Windows.\n\ndeadline(index) -> int:\n    The deadline in monotonic nanoseconds.\n\nremaining(index) -> float:\n    Time until the cooldown is cold.\n\nremaining_many(indices=None) -> list[float]:\n    `remaining` for many indices or the whole table.\n\ncold_indices() -> list[int]:\n    The indices of all cold cooldowns.\n\nrelease():\n    Release the buffer, so e.g. the shared memory can be closed.\n\nThe table also is a sequence, `table[i]` returns a CooldownView."
+#define DOCSTRING_COOLDOWNVIEW "A Cooldown-like view on a slot of a CooldownTable.\n\n    cd = table[account_id]\n    if cd.cold():\n        cd.reset()\n\nSupports `cold()`, `hot()`, `reset(duration=None)`, `set_cold()`,\n`try_acquire()`, `bool()`, `float()`, calling it and the `duration`,\n`remaining`, `temperature` and `normalized` attributes like Cooldown.\n\nAdditionally, `deadline` is the deadline in monotonic nanoseconds, `table`\nand `index` tell which slot this is a view on.\n\nThere is no pause in shared cooldowns."
+#define DOCSTRING_COOLDOWNREGISTRY "Call back when watched cooldowns go cold, instead of polling them.\n\n    registry = CooldownRegistry()\n    registry.watch(enemy.reload_cooldown, lambda cd: enemy.reload())\n\n    while True:\n        ...\n        registry.poll()\n\nPolling `cold()` on thousands of cooldowns per frame costs time for every\ncooldown, even if only a few of them go cold.  The registry keeps the\nwatched cooldowns ordered by deadline, so `poll()` only looks at the ones\nthat actually went cold since the last poll.\n\nA callback is called with the cooldown as argument, once every time the\ncooldown goes from hot to cold.  Cooldowns stay watched until `unwatch()`,\nso after a `reset()` the callback fires again.  A cooldown that is already\ncold when it is watched, fires only after it was reset and ran out again.\n\n`reset()`, `pause()`, `set_cold()`, changes of `duration`, `remaining`,\n... are all tracked, the deadline in the registry is updated right away.\n\nA cooldown can only be watched by one registry at a time.  Watching it\nagain in the same registry replaces the callback.\n\n\nMethods\n-------\nwatch(cooldown, callback):\n    Call `callback(cooldown)` whenever the cooldown goes cold.\n\nunwatch(cooldown) -> bool:\n    Stop watching the cooldown.  Returns if it was watched.\n\npoll() -> int:\n    Run the callbacks of all cooldowns that went cold.  Returns their\n    number.\n\ntime_until_next() -> float:\n    Seconds until the next watched cooldown goes cold, inf if none.\n\nclear():\n    Stop watching all cooldowns.\n\n`len()` and `in` are supported as well."
+#define DOCSTRING_CRONJOB "A job scheduled in a CronD.\n\nThere is no need to instantiate this class yourself, it is returned by\n`CronD.add`.\n\nCalling the job returns the job itself while it is scheduled and None\nonce it is finished or removed, just like the weakref that was returned\nby `add` in earlier versions.\n\n\nArguments\n---------\ncooldown: Cooldown | float\n    Cooldown in seconds before the task runs\n\ntask: callable\n    A zero parameter callback\n    If you want to provide parameters to the called function, either\n    provide a wrapper to it, or use a `functools.partial`.\n\nrepeat: bool = False\n    Run the task again after each cooldown until removed.\n\n\nAttributes\n----------\ncooldown: Cooldown\n    The cooldown of the job, read only.\n\ntask: callable\n\nrepeat: bool\n\nscheduled: bool\n    Is the job still waiting in a CronD?\n\nlane: int\n    The priority lane of the job in its CronD, read only.\n\noffset: float\n    How much `jitter` and `spread` push back the first run, 0 after it ran,\n    read only."
+#define DOCSTRING_CROND "A job manager class named after the unix scheduling daemon.\n\nIn the spirit of unix's crond, this class can be used to run functions\nafter a cooldown once or repeatedly.\n\n    crond = CronD()\n\n    # `run_after_ten_seconds()` will be run after 10s.\n    cid = crond.add(10, run_after_ten_seconds, False)\n\n    # Remove the job with the id `cid` if it has not yet run or repeats.\n    crond.remove(cid)\n\n    while True:\n        ...\n        crond.update()\n\nJobs are kept in a heap ordered by the time they are due, so `update()`\nonly looks at the jobs that are due.  Changes to the cooldown of a job,\ne.g. `set_cold()`, `reset()` or `start()`, move the job to its new place\nin the heap.  A job with a paused cooldown doesn't run until the cooldown\nis started.\n\nMany repeating jobs with the same period added at once stay aligned and\nall run in the same frame.  `jitter` and `spread` push back the first run\nof a job by its `offset`.  The cooldown itself is not changed, it might be\nshared.  After the delayed first run, a repeating job restarts its cooldown\nfrom there, so the offset is kept and the period is unchanged.\n\nJobs can be put into priority lanes.  Lane 0 is the most important, each\nlane has its own heap and `update()` runs the due jobs lane by lane.\nWith `max_jobs` set, the due jobs of lane 1 and up that don't fit into\nthe budget of an update are deferred to a later update, or shed.  Lane 0\nalways runs completely.\n\n\nArguments\n---------\njitter: float = 0\n    Add a random offset in `[0, jitter)` seconds to every new job,\n    keyword only.\n\nspread: float = 0\n    Distribute new repeating jobs evenly over a window of `spread`\n    seconds, usually their period, keyword only.\n\nseed: int = 0\n    Seed of the random generator used for `jitter`, keyword only.  The\n    same seed and the same sequence of `add()` calls give the same\n    offsets.\n\nlanes: int = 1\n    Number of priority lanes, keyword only.\n\nmax_jobs: int | None = None\n    Jobs to run per update before lanes after the first are held back,\n    keyword only.  None for no limit.\n\nshed: bool = False\n    Shed the jobs that are held back instead of deferring them, keyword\n    only.  Shed one shot jobs are removed, shed repeating jobs skip this\n    run.\n\n\nMethods\n-------\nadd(cooldown, task, repeat=False, *, lane=0, jitter=None, spread=None) -> Cronjob:\n    Schedule a new task.  `cooldown` is the time to wait, either a float\n    or a Cooldown.  With `repeat=True`, the job repeats until removed, the\n    cooldown is reset in wrap mode after every run.  `lane` is the\n    priority lane of the job, `jitter` and `spread` override the defaults\n    of the crond for this job.  Returns the job, use it to remove a\n    pending or repeating job.\n\nremove(cid):\n    Remove a pending or repeating job.  Does nothing if the job already\n    finished.\n\nupdate():\n    Run all jobs that are due and reschedule repeating ones, lane by\n    lane.  A repeating job runs at most once per update.\n\nreset_stats():\n    Set the counters in `stats` to 0.\n\n\nAttributes\n----------\nheap: list[Cronjob]\n    The scheduled jobs, as a new list.  Use `len(crond)` for their\n    number.\n\njitter: float, spread: float\n    The defaults for jobs added from now on.\n\nlanes: int\n    Number of priority lanes, read only.\n\nmax_jobs: int | None, shed: bool\n    See above.\n\nstats: list[dict[str, int]]\n    Counters per lane: `due` jobs seen by `update()`, deferred jobs are\n    counted again on every update, and how many of them were `run`,\n    `deferred` or `shed`."
+#define DOCSTRING_EASING "An easing function implemented in C.\n\n    from pgcooldown.easings import out_quad\n\n    out_quad(0.5)\n    --> 0.75\n\nAll easings from rpeasings are available in `pgcooldown.easings`, with the\nsame names and results.\n\nEasing objects can be called like any other function, but `lerp()`,\n`lerp_into()`, LerpThing & co. detect them and run the easing directly in\nC, without a python call."
+#define DOCSTRING_ANIMATIONDRIVER "Push lerped values into attributes, many at once.\n\n    driver = AnimationDriver()\n\n    for sprite in sprites:\n        driver.bind(sprite, 'alpha', LerpThing(255, 0, 2), callback=kill_sprite)\n\n    while True:\n        ...\n        driver.update()\n\nEvery bound tween is evaluated once per `update()` and the result assigned\nto `target.attr`.  LerpThings are evaluated in C, straight from their\nattributes, any other tween (VectorLerpThing, KeyframeTrack, ...) is\ncalled.  The setter for the attribute is looked up once per target type,\nnot on every assignment.\n\nOnce a tween is finished, its final value is assigned, the binding is\nremoved and the optional callback is called with the target.\n\nTweens must be callable and have a `finished()` method like the\nLerpThing.\n\n\nMethods\n-------\nbind(target, attr, tween, callback=None):\n    Assign `tween()` to `target.attr` on every update.  Binding the same\n    attribute of the same target again replaces the tween.\n\nunbind(target, attr=None) -> int:\n    Remove the binding of `attr`, or of all attributes of the target.\n    Returns the number of removed bindings.  Unbinding all attributes of a\n    target has to scan all bindings.\n\nupdate() -> int:\n    Assign the current values of all tweens.  Returns the number of\n    finished bindings.\n\nclear():\n    Remove all bindings.\n\n`len()` is supported as well."
+#define DOCSTRING_FIXEDSTEP "Fixed timestep accumulator for a variable rate loop.\n\n    physics = FixedStep(1 / 120)\n\n    while True:\n        steps, alpha = physics.update()\n        for _ in range(steps):\n            world.step(physics.dt)\n\n        world.render(interpolate=alpha)\n\n`update()` adds the time since the last call and returns the number of\nsteps of `dt` that are due, plus `alpha`, the fraction of the next step\nthat has already passed, to interpolate between the last two states.\nThe time left over is carried into the next frame, like a Cooldown with\n`wrap=True`, but in one call per frame.\n\nIf the loop falls too far behind, e.g. because the steps take longer than\n`dt`, catching up would only make it worse.  At most `max_steps` are\nreturned per update, the time of the steps above that is dropped and\nadded to `dropped`.\n\n\nArguments\n---------\ndt: float\n    Length of a step in seconds\n\nmax_steps: int = 8\n    Maximum number of steps per update, keyword only.\n\n\nAttributes\n----------\ndt: float\n    Length of a step.  Changing it applies from the next update.\n\nmax_steps: int\n    Maximum number of steps per update.\n\nalpha: float\n    Fraction of the next step that has passed at the last update.\n\ndropped: float\n    Total seconds dropped because of `max_steps`.  Can be set, e.g. to 0\n    after logging it.\n\n\nMethods\n-------\nupdate() -> tuple[int, float]:\n    Returns the number of due steps and `alpha`.\n\nreset():\n    Restart from now, discard the accumulated time and `dropped`."
@@ -0,0 +1,108 @@
+/* C API of pgcooldown
+ *
+ * Use Cooldown, lerp & co. from other C extensions without going through
+ * python calls.
+ *
+ *     #include <Python.h>
+ *     #include <pgcooldown_capi.h>
+ *
+ *     PyMODINIT_FUNC PyInit_mymodule(void) {
+ *         if (PgCooldown_Import() < 0)
+ *             return NULL;
+ *         ...
+ *     }
+ *
+ *     if (PgCooldown_API->IsCold(cooldown) > 0) {
+ *         ...
+ *     }
+ *
+ * The header is self contained, there is nothing to link against.  The API
+ * is looked up at runtime from the capsule `pgcooldown._pgcooldown._C_API`.
+ *
+ * Versioning: New functions are only ever appended to the struct.  A module
+ * compiled against version N runs with any pgcooldown that exports version N
+ * or later, `PgCooldown_Import` raises ImportError otherwise.
+ *
+ * Error handling: Functions returning int return -1 with an exception set on
+ * error.  Functions returning double return -1.0 with an exception set, use
+ * `PyErr_Occurred()` to tell it apart from a valid -1.0, just like
+ * `PyFloat_AsDouble`.  A `cooldown` that is no Cooldown raises TypeError.
+ *
+ * The GIL must be held for all functions taking PyObjects.
+ */
+
+#ifndef PGCOOLDOWN_CAPI_H
+#define PGCOOLDOWN_CAPI_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#define PGCOOLDOWN_CAPI_VERSION 1
+#define PGCOOLDOWN_CAPSULE_NAME "pgcooldown._pgcooldown._C_API"
+
+typedef struct {
+    /* Version 1 */
+    int version;
+    PyTypeObject *CooldownType;
+
+    /* Single cooldowns */
+    int (*Check)(PyObject *o);
+    int (*IsCold)(PyObject *cooldown);
+    double (*GetTemperature)(PyObject *cooldown);
+    double (*GetRemaining)(PyObject *cooldown);
+    double (*GetNormalized)(PyObject *cooldown);
+    /* `duration` < 0 keeps the current duration, `wrap` < 0 uses the wrap
+     * attribute of the cooldown, like `cooldown.reset()` without arguments */
+    int (*Reset)(PyObject *cooldown, double duration, int wrap);
+    int (*SetCold)(PyObject *cooldown);
+
+    /* Batches, `out` has room for `n` values.  IsColdMany returns the
+     * number of cold cooldowns. */
+    Py_ssize_t (*IsColdMany)(PyObject *const *cooldowns, Py_ssize_t n, char *out);
+    int (*GetRemainingMany)(PyObject *const *cooldowns, Py_ssize_t n, double *out);
+    int (*GetNormalizedMany)(PyObject *const *cooldowns, Py_ssize_t n, double *out);
+    int (*ResetMany)(PyObject *const *cooldowns, Py_ssize_t n, double duration, int wrap);
+
+    /* lerp & co.  `ease` can be NULL, Py_None, an Easing or any callable.
+     * The GIL is only needed for easings that are not an Easing. */
+    double (*Lerp)(double a, double b, double t);
+    double (*InvLerp)(double a, double b, double v);
+    double (*Remap)(double a0, double a1, double b0, double b1, double v);
+    int (*Ease)(PyObject *ease, double t, double *out);
+    int (*LerpMany)(const double *a, const double *b, const double *t, Py_ssize_t n,
+                    PyObject *ease, double *out);
+    void (*RemapMany)(double a0, double a1, double b0, double b1,
+                      const double *v, Py_ssize_t n, double *out);
+} PgCooldown_CAPI;
+
+#ifndef PGCOOLDOWN_MODULE
+
+static PgCooldown_CAPI *PgCooldown_API = NULL;
+
+static int PgCooldown_Import(void) {
+    PgCooldown_CAPI *api;
+
+    api = (PgCooldown_CAPI *)PyCapsule_Import(PGCOOLDOWN_CAPSULE_NAME, 0);
+    if (api == NULL)
+        return -1;
+
+    if (api->version < PGCOOLDOWN_CAPI_VERSION) {
+        PyErr_Format(PyExc_ImportError,
+                     "pgcooldown C API version %d or later required, found %d",
+                     PGCOOLDOWN_CAPI_VERSION, api->version);
+        return -1;
+    }
+
+    PgCooldown_API = api;
+
+    return 0;
+}
+
+#endif /* PGCOOLDOWN_MODULE */
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* PGCOOLDOWN_CAPI_H */
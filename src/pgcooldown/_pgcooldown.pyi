@@ -1,10 +1,15 @@
-from typing import Any
+from typing import Any, Callable, Hashable, Iterable, MutableSequence, Sequence
+from collections.abc import Buffer
 
 __all__: list[str]
 
-def lerp(a: float, b: float, t: float) -> float: ...
+def lerp(a: float, b: float, t: float, ease: Callable[[float], float] | None = None) -> float: ...
 def invlerp(a: float, b: float, v: float) -> float: ...
 def remap(a0: float, a1: float, b0: float, b1: float, v: float) -> float: ...
+def lerp_into(out: MutableSequence[float], a: Sequence[float], b: Sequence[float], t: float,
+              ease: Callable[[float], float] | None = None) -> MutableSequence[float]: ...
+def lerp_keyframes(times: Sequence[float], values: Sequence[float], t: float,
+                   eases: Callable[[float], float] | Sequence[Callable[[float], float] | None] | None = None) -> float: ...
 
 class Cooldown:
     duration: float
@@ -34,3 +39,177 @@ class Cooldown:
     def set_cold(self) -> None: ...
     def set_to(self, t: int = 0) -> None: ...
     def start(self) -> None: ...
+
+class TokenBucket:
+    capacity: float
+    rate: float
+    tokens: float
+
+    def __init__(self, capacity: float, rate: float, *, tokens: float | None = None) -> None: ...
+    def __repr__(self) -> str: ...
+    def reset(self) -> None: ...
+    def time_until_available(self, n: float = 1) -> float: ...
+    def try_consume(self, n: float = 1) -> bool: ...
+
+class SlidingWindowLimiter:
+    count: float
+    limit: float
+    window: float
+
+    def __init__(self, limit: float, window: float) -> None: ...
+    def __repr__(self) -> str: ...
+    def reset(self) -> None: ...
+    def time_until_available(self, n: float = 1) -> float: ...
+    def try_consume(self, n: float = 1) -> bool: ...
+
+class KeyedRateLimiter:
+    prototype: TokenBucket | SlidingWindowLimiter
+
+    def __init__(self, limiter: TokenBucket | SlidingWindowLimiter) -> None: ...
+    def __contains__(self, key: Hashable) -> bool: ...
+    def __len__(self) -> int: ...
+    def discard(self, key: Hashable) -> None: ...
+    def prune(self) -> int: ...
+    def time_until_available(self, key: Hashable, n: float = 1) -> float: ...
+    def try_consume(self, key: Hashable, n: float = 1) -> bool: ...
+    def try_consume_many(self, keys: Iterable[Hashable], n: float = 1) -> list[bool]: ...
+
+class Throttle:
+    __wrapped__: Callable[..., Any]
+    cooldown: Cooldown
+    pending: bool
+
+    def __init__(self, func: Callable[..., Any], seconds: float, wrap: bool = False, *,
+                 leading: bool = True, trailing: bool = False, crond: Any = None) -> None: ...
+    def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
+    def __get__(self, instance: object, owner: type | None = None) -> Any: ...
+    def __set_name__(self, owner: type, name: str) -> None: ...
+    def __repr__(self) -> str: ...
+    def cancel(self) -> None: ...
+    def flush(self) -> Any: ...
+
+class Debounce:
+    __wrapped__: Callable[..., Any]
+    cooldown: Cooldown
+    pending: bool
+
+    def __init__(self, func: Callable[..., Any], seconds: float, crond: Any = None, *,
+                 leading: bool = False, trailing: bool = True) -> None: ...
+    def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
+    def __get__(self, instance: object, owner: type | None = None) -> Any: ...
+    def __set_name__(self, owner: type, name: str) -> None: ...
+    def __repr__(self) -> str: ...
+    def cancel(self) -> None: ...
+    def flush(self) -> Any: ...
+
+class CooldownTable:
+    def __init__(self, buffer: Buffer, create: bool = False, *, duration: float = 0.0) -> None: ...
+    def __getitem__(self, index: int) -> CooldownView: ...
+    def __len__(self) -> int: ...
+    def __repr__(self) -> str: ...
+    @staticmethod
+    def nbytes(size: int) -> int: ...
+    def cold_indices(self) -> list[int]: ...
+    def compare_and_set(self, index: int, expected: int, new: int) -> bool: ...
+    def deadline(self, index: int) -> int: ...
+    def release(self) -> None: ...
+    def remaining(self, index: int) -> float: ...
+    def remaining_many(self, indices: Iterable[int] | None = None) -> list[float]: ...
+    def reset(self, index: int, duration: float | None = None) -> None: ...
+    def set_cold(self, index: int) -> None: ...
+    def try_acquire(self, index: int, duration: float | None = None) -> bool: ...
+    def try_acquire_many(self, indices: Iterable[int], duration: float | None = None) -> list[bool]: ...
+
+class CooldownView:
+    deadline: int
+    duration: float
+    index: int
+    normalized: float
+    remaining: float
+    table: CooldownTable
+    temperature: float
+
+    def __bool__(self) -> bool: ...
+    def __call__(self, *args: Any, **kwargs: Any) -> float: ...
+    def __float__(self) -> float: ...
+    def __repr__(self) -> str: ...
+    def cold(self) -> bool: ...
+    def hot(self) -> bool: ...
+    def reset(self, duration: float | None = None) -> None: ...
+    def set_cold(self) -> None: ...
+    def try_acquire(self) -> bool: ...
+
+class CooldownRegistry:
+    def __init__(self) -> None: ...
+    def __contains__(self, cooldown: object) -> bool: ...
+    def __len__(self) -> int: ...
+    def __repr__(self) -> str: ...
+    def clear(self) -> None: ...
+    def poll(self) -> int: ...
+    def time_until_next(self) -> float: ...
+    def unwatch(self, cooldown: Cooldown) -> bool: ...
+    def watch(self, cooldown: Cooldown, callback: Callable[[Cooldown], Any]) -> None: ...
+
+class Cronjob:
+    cooldown: Cooldown
+    lane: int
+    offset: float
+    repeat: bool
+    scheduled: bool
+    task: Callable[[], Any]
+
+    def __init__(self, cooldown: Cooldown | float, task: Callable[[], Any], repeat: bool = False) -> None: ...
+    def __call__(self) -> Cronjob | None: ...
+    def __repr__(self) -> str: ...
+
+class CronD:
+    heap: list[Cronjob]
+    jitter: float
+    lanes: int
+    max_jobs: int | None
+    shed: bool
+    spread: float
+    stats: list[dict[str, int]]
+
+    def __init__(self, *, jitter: float = 0.0, spread: float = 0.0, seed: int = 0,
+                 lanes: int = 1, max_jobs: int | None = None, shed: bool = False) -> None: ...
+    def __len__(self) -> int: ...
+    def __repr__(self) -> str: ...
+    def add(self, cooldown: Cooldown | float, task: Callable[[], Any], repeat: bool = False, *,
+            lane: int = 0, jitter: float | None = None, spread: float | None = None) -> Cronjob: ...
+    def remove(self, cid: Cronjob | None) -> None: ...
+    def reset_stats(self) -> None: ...
+    def update(self) -> None: ...
+
+class AnimationDriver:
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def __repr__(self) -> str: ...
+    def bind(self, target: object, attr: str, tween: Callable[[], Any],
+             callback: Callable[[Any], Any] | None = None) -> None: ...
+    def clear(self) -> None: ...
+    def unbind(self, target: object, attr: str | None = None) -> int: ...
+    def update(self) -> int: ...
+
+class FixedStep:
+    alpha: float
+    dropped: float
+    dt: float
+    max_steps: int
+
+    def __init__(self, dt: float, *, max_steps: int = 8) -> None: ...
+    def __repr__(self) -> str: ...
+    def reset(self) -> None: ...
+    def update(self) -> tuple[int, float]: ...
+
+class Easing:
+    __name__: str
+    __qualname__: str
+
+    def __call__(self, t: float, /) -> float: ...
+    def __reduce__(self) -> str: ...
+    def __repr__(self) -> str: ...
+
+easings: dict[str, Easing]
+
+_C_API: object
@@ -0,0 +1,1124 @@
+"""Pure python implementation of the core.
+
+Cooldown, lerp, invlerp, remap, lerp_into, lerp_keyframes, the easings and
+the classes scheduling on a Cooldown, CooldownRegistry, Cronjob and CronD,
+with the same behaviour as the C extension.  Used on PyPy, where calls into C
+extensions go through the slow cpyext layer, while the JIT makes plain python
+fast.  See the package `__init__` for how the implementation is selected.
+
+The only difference to the C implementation is the clock.  The C Cooldown
+uses the realtime clock, this one `time.monotonic_ns()`.
+"""
+
+from _weakref import ref as _ref
+from math import cos, copysign, fmod, inf, nan, pi, sin, sqrt
+from time import monotonic_ns
+
+__all__ = ['Cooldown', 'lerp', 'invlerp', 'remap', 'lerp_into', 'lerp_keyframes',
+           'easings', 'CooldownRegistry', 'Cronjob', 'CronD']
+
+_U64 = 0xffffffffffffffff
+
+
+def _as_double(o):
+    """float(o) with the rules of `PyFloat_AsDouble`, strings are no numbers"""
+    if type(o) is float:
+        return o
+
+    cls = type(o)
+    if hasattr(cls, '__float__'):
+        return float(cls.__float__(o))
+    if hasattr(cls, '__index__'):
+        return float(cls.__index__(o))
+
+    raise TypeError(f'must be real number, not {cls.__name__}')
+
+
+def _fdiv(a, b):
+    """a / b as in C, inf or nan instead of ZeroDivisionError"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return nan
+        return copysign(inf, a) * copysign(1.0, b)
+
+
+def lerp(a, b, t, ease=None):
+    try:
+        a, b, t = _as_double(a), _as_double(b), _as_double(t)
+    except TypeError:
+        raise TypeError('lerp expects 3 floats and an optional easing function') from None
+
+    if ease is not None:
+        t = _as_double(ease(t))
+
+    return t * (b - a) + a
+
+
+def invlerp(a, b, v):
+    try:
+        a, b, v = _as_double(a), _as_double(b), _as_double(v)
+    except TypeError:
+        raise TypeError('invlerp expects 3 floats') from None
+
+    if b - a == 0:
+        raise ValueError('invlerp expects `a` and `b` to differ')
+
+    return (v - a) / (b - a)
+
+
+def remap(a0, a1, b0, b1, v):
+    try:
+        a0, a1, b0, b1, v = (_as_double(a0), _as_double(a1), _as_double(b0),
+                             _as_double(b1), _as_double(v))
+    except TypeError:
+        raise TypeError('remap expects 5 floats') from None
+
+    return _fdiv(v - a0, a1 - a0) * (b1 - b0) + b0
+
+
+def lerp_into(out, a, b, t, ease=None):
+    try:
+        t = _as_double(t)
+    except TypeError:
+        raise TypeError('lerp_into expects t to be a float') from None
+
+    if ease is not None:
+        t = _as_double(ease(t))
+
+    if len(a) != len(b):
+        raise ValueError('lerp_into expects a and b to be of the same length')
+    if len(out) != len(a):
+        raise ValueError('lerp_into expects out to be of the same length as a and b')
+
+    try:
+        for i in range(len(a)):
+            va = _as_double(a[i])
+            out[i] = t * (_as_double(b[i]) - va) + va
+    except TypeError:
+        raise TypeError('lerp_into expects sequences of floats') from None
+
+    return out
+
+
+def lerp_keyframes(times, values, t, eases=None):
+    try:
+        t = _as_double(t)
+    except TypeError:
+        raise TypeError('lerp_keyframes expects t to be a float') from None
+
+    n = len(times)
+    if not n or len(values) != n:
+        raise ValueError('lerp_keyframes expects times and values to be non-empty and of the same length')
+
+    if eases is not None and not callable(eases) and len(eases) != n - 1:
+        raise ValueError('lerp_keyframes expects one easing function per segment')
+
+    try:
+        # Outside of the track, hold the first/last value
+        if t < _as_double(times[0]):
+            return _as_double(values[0])
+        if n == 1 or t > _as_double(times[-1]):
+            return _as_double(values[-1])
+
+        # bisect_right over the inner keyframes, without importing bisect
+        lo, hi = 1, n - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if t < _as_double(times[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        i = lo - 1
+
+        t0, t1 = _as_double(times[i]), _as_double(times[i + 1])
+        v0, v1 = _as_double(values[i]), _as_double(values[i + 1])
+    except TypeError:
+        raise TypeError('lerp_keyframes expects sequences of floats') from None
+
+    t = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+
+    ease = eases if eases is None or callable(eases) else eases[i]
+    if ease is not None:
+        t = _as_double(ease(t))
+
+    return t * (v1 - v0) + v0
+
+
+class Cooldown:
+    """Track a cooldown over a period of time.
+
+    See the documentation of the C implementation.
+    """
+    __slots__ = ('_t0', '_duration', '_wrap', '_paused', '_remaining', '_watch', '_jobs')
+
+    def __init__(self, duration, *, wrap=False, cold=False, paused=False):
+        # The registry entry and CronD jobs using us, kept by a second __init__
+        if not hasattr(self, '_jobs'):
+            self._watch = None
+            self._jobs = None
+
+        if isinstance(duration, Cooldown):
+            self._t0 = duration._t0
+            self._duration = duration._duration
+            self._wrap = duration._wrap
+            self._paused = duration._paused
+            self._remaining = duration._remaining
+            self._rekey()
+            return
+
+        self._duration = _as_double(duration)
+        self._wrap = bool(wrap)
+        self._t0 = 0
+        self._remaining = 0.0
+
+        # Do this first, since otherwise the timer is already running
+        self._paused = bool(paused)
+        self._set_temperature(self._duration)
+        if cold:
+            self._set_temperature(0.0)
+
+    def _get_temperature(self):
+        if self._paused:
+            return self._remaining
+
+        return self._duration - (monotonic_ns() - self._t0) / 1e9
+
+    def _set_temperature(self, val):
+        if self._paused:
+            self._remaining = val
+        else:
+            self._t0 = monotonic_ns() - int((self._duration - val) * 1e9)
+
+        if self._watch is not None or self._jobs:
+            self._rekey()
+
+    def _set_paused(self, val):
+        if val:
+            # Order is important!
+            self._remaining = self._get_temperature()
+            self._paused = True
+            self._rekey()
+        else:
+            self._paused = False
+            self._set_temperature(self._remaining)
+            self._remaining = 0.0
+
+    def _rekey(self):
+        """Move our deadline in the registry and CronD heaps"""
+        if self._watch is not None:
+            registry = self._watch.registry()
+            if registry is None:
+                self._watch = None
+            else:
+                registry._rekey(self._watch)
+
+        if self._jobs:
+            stale = False
+            for job in self._jobs:
+                crond = job._get_crond()
+                if crond is None:
+                    stale = True
+                else:
+                    crond._rekey(job)
+
+            # Left behind by a CronD that is gone
+            if stale:
+                self._jobs = [job for job in self._jobs if job._get_crond() is not None] or None
+
+    def __repr__(self):
+        return f'Cooldown({self._duration}, wrap={self._wrap}, paused={self._paused}) at {id(self):#x}'
+
+    def __call__(self):
+        return max(self._get_temperature(), 0.0)
+
+    def __bool__(self):
+        return self._get_temperature() > 0.0
+
+    def __int__(self):
+        return int(self._get_temperature())
+
+    def __float__(self):
+        return self._get_temperature()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not max(self._get_temperature(), 0.0):
+            raise StopIteration
+
+        return self._get_temperature()
+
+    def _compare(self, other):
+        try:
+            return self._get_temperature(), float(other)
+        except (TypeError, ValueError):
+            raise TypeError('Operand cannot be converted to float') from None
+
+    def __lt__(self, other):
+        temperature, other = self._compare(other)
+        return temperature < other
+
+    def __le__(self, other):
+        temperature, other = self._compare(other)
+        return temperature <= other
+
+    def __eq__(self, other):
+        temperature, other = self._compare(other)
+        return temperature == other
+
+    def __ne__(self, other):
+        temperature, other = self._compare(other)
+        return temperature != other
+
+    def __gt__(self, other):
+        temperature, other = self._compare(other)
+        return temperature > other
+
+    def __ge__(self, other):
+        temperature, other = self._compare(other)
+        return temperature >= other
+
+    __hash__ = None
+
+    def cold(self):
+        return self._get_temperature() <= 0.0
+
+    def hot(self):
+        return self._get_temperature() > 0.0
+
+    def reset(self, new=None, /, *, wrap=None):
+        new = self._duration if new is None else _as_double(new)
+        if wrap is None:
+            wrap = self._wrap
+
+        if not wrap:
+            temperature = new
+        else:
+            temperature = self._get_temperature()
+            if temperature <= 0:
+                # fmod(x, 0) is nan in C, there is nothing to wrap into
+                temperature = fmod(temperature, new) + new if new else 0.0
+            else:
+                temperature = new
+
+        # Only now overwrite!
+        self._duration = new
+        self._set_temperature(temperature)
+
+        return self
+
+    def pause(self):
+        self._set_paused(True)
+        return self
+
+    def start(self):
+        self._set_paused(False)
+
+    def is_paused(self):
+        return self._paused
+
+    def set_to(self, t):
+        t = _as_double(t)
+        if t > self._duration:
+            raise ValueError('value larger than duration, use reset() instead.')
+
+        self._set_temperature(t)
+
+    def set_cold(self):
+        self._set_temperature(0.0)
+
+    @property
+    def duration(self):
+        return self._duration
+
+    @duration.setter
+    def duration(self, val):
+        try:
+            self._duration = _as_double(val)
+        except (TypeError, ValueError):
+            raise TypeError('duration must be a float') from None
+
+        self._rekey()
+
+    @property
+    def wrap(self):
+        return self._wrap
+
+    @wrap.setter
+    def wrap(self, val):
+        self._wrap = bool(val)
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @paused.setter
+    def paused(self, val):
+        self._set_paused(bool(val))
+
+    @property
+    def temperature(self):
+        return self._get_temperature()
+
+    @temperature.setter
+    def temperature(self, val):
+        try:
+            val = _as_double(val)
+        except (TypeError, ValueError):
+            raise TypeError('temperature must be a float') from None
+
+        self._set_temperature(val)
+
+    @property
+    def remaining(self):
+        return max(self._get_temperature(), 0.0)
+
+    @remaining.setter
+    def remaining(self, val):
+        self._set_temperature(_as_double(val))
+
+    @property
+    def normalized(self):
+        if not self._duration:
+            return 0.0
+
+        return 1 - max(self._get_temperature(), 0.0) / self._duration
+
+    @normalized.setter
+    def normalized(self, val):
+        try:
+            val = _as_double(val)
+        except (TypeError, ValueError):
+            raise TypeError('normalized must be a float') from None
+
+        self._set_temperature(self._duration * val)
+
+
+def _reject_c_cooldown(o, what):
+    """The C Cooldown would be taken for a duration, refuse it instead"""
+    for cls in type(o).__mro__:
+        if cls.__module__ == '_pgcooldown' and cls.__name__ == 'Cooldown':
+            raise TypeError(f'{what} needs a pure python Cooldown, the C Cooldown is not supported')
+
+
+def _as_index(o):
+    """operator.index() without importing operator"""
+    try:
+        return type(o).__index__(o)
+    except AttributeError:
+        raise TypeError(f"'{type(o).__name__}' object cannot be interpreted as an integer") from None
+
+
+def _non_negative(val, name):
+    try:
+        val = _as_double(val)
+    except TypeError:
+        raise TypeError(f'{name} must be a float') from None
+
+    if val < 0:
+        raise ValueError(f'{name} must not be negative')
+
+    return val
+
+
+# The binary heaps of the CooldownRegistry and CronD, as in C.  The items
+# know their position, so a changed deadline is moved in place, which heapq
+# can't do.  Items need `_deadline`, `_seq` and `_index` attributes.
+
+def _heap_less(a, b):
+    return a._deadline < b._deadline or (a._deadline == b._deadline and a._seq < b._seq)
+
+
+def _heap_sift(heap, i):
+    """Move item i up or down to its place"""
+    item = heap[i]
+
+    while i > 0:
+        parent = (i - 1) // 2
+        if not _heap_less(item, heap[parent]):
+            break
+        heap[i] = heap[parent]
+        heap[i]._index = i
+        i = parent
+
+    n = len(heap)
+    while 2 * i + 1 < n:
+        child = 2 * i + 1
+        if child + 1 < n and _heap_less(heap[child + 1], heap[child]):
+            child += 1
+        if not _heap_less(heap[child], item):
+            break
+        heap[i] = heap[child]
+        heap[i]._index = i
+        i = child
+
+    heap[i] = item
+    item._index = i
+
+
+def _heap_push(heap, item):
+    item._index = len(heap)
+    heap.append(item)
+    _heap_sift(heap, item._index)
+
+
+def _heap_remove(heap, i):
+    item = heap[i]
+    last = heap.pop()
+
+    if last is not item:
+        heap[i] = last
+        last._index = i
+        _heap_sift(heap, i)
+
+    item._index = -1
+    return item
+
+
+class _Watch:
+    """A watched cooldown in the heap of a CooldownRegistry"""
+    __slots__ = ('_deadline', '_seq', '_index', 'cooldown', 'callback', 'fired', 'registry')
+
+
+class CooldownRegistry:
+    """Call back when watched cooldowns go cold.
+
+    See the documentation of the C implementation.
+    """
+    __slots__ = ('_t0', '_heap', '_seq', '_ref', '__weakref__')
+
+    def __init__(self):
+        if hasattr(self, '_heap'):
+            self.clear()
+        else:
+            # The cooldowns only hold a weak reference, like the borrowed
+            # pointer in C, so they don't keep us alive.
+            self._ref = _ref(self)
+            self._heap = []
+            self._seq = 0
+
+        self._t0 = monotonic_ns()
+
+    def _now(self):
+        return (monotonic_ns() - self._t0) / 1e9
+
+    def _deadline(self, cooldown):
+        if cooldown._paused:
+            return inf
+
+        return (cooldown._t0 - self._t0) / 1e9 + cooldown._duration
+
+    def _rekey(self, watch):
+        deadline = self._deadline(watch.cooldown)
+
+        # Only a cooldown that is hot again can go cold again
+        if watch.fired and deadline <= self._now():
+            return
+
+        watch.fired = False
+        watch._deadline = deadline
+        _heap_sift(self._heap, watch._index)
+
+    def _remove(self, i):
+        _heap_remove(self._heap, i).cooldown._watch = None
+
+    def __repr__(self):
+        return f'CooldownRegistry(len={len(self._heap)}) at {id(self):#x}'
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, cooldown):
+        return (isinstance(cooldown, Cooldown) and cooldown._watch is not None
+                and cooldown._watch.registry is self._ref)
+
+    def watch(self, cooldown, callback, /):
+        if not isinstance(cooldown, Cooldown):
+            _reject_c_cooldown(cooldown, 'CooldownRegistry')
+            raise TypeError('only Cooldowns can be watched')
+
+        if not callable(callback):
+            raise TypeError('callback must be callable')
+
+        # Watching again only replaces the callback
+        if cooldown in self:
+            cooldown._watch.callback = callback
+            return
+
+        if cooldown._watch is not None and cooldown._watch.registry() is not None:
+            raise ValueError('cooldown is already watched by another registry')
+
+        watch = _Watch()
+        watch._deadline = self._deadline(cooldown)
+        watch._seq = self._seq
+        self._seq += 1
+        watch.cooldown = cooldown
+        watch.callback = callback
+        watch.fired = False
+        watch.registry = self._ref
+
+        # A cooldown that is already cold didn't cross zero while watched
+        if watch._deadline <= self._now():
+            watch._deadline = inf
+            watch.fired = True
+
+        cooldown._watch = watch
+        _heap_push(self._heap, watch)
+
+    def unwatch(self, cooldown, /):
+        if cooldown not in self:
+            return False
+
+        self._remove(cooldown._watch._index)
+        return True
+
+    def poll(self):
+        heap = self._heap
+        now = self._now()
+        fired = []
+
+        # Collect first, the callbacks may change the heap
+        while heap and heap[0]._deadline <= now:
+            top = heap[0]
+            fired.append((top.callback, top.cooldown))
+            top.fired = True
+            top._deadline = inf
+            _heap_sift(heap, 0)
+
+        for callback, cooldown in fired:
+            callback(cooldown)
+
+        return len(fired)
+
+    def time_until_next(self):
+        if not self._heap:
+            return inf
+
+        return max(0.0, self._heap[0]._deadline - self._now())
+
+    def clear(self):
+        while self._heap:
+            self._remove(len(self._heap) - 1)
+
+
+class Cronjob:
+    """A task scheduled in a CronD, returned by `CronD.add()`.
+
+    See the documentation of the C implementation.
+    """
+    __slots__ = ('_cooldown', '_task', '_repeat', '_crond', '_lane', '_offset',
+                 '_deadline', '_seq', '_index')
+
+    def __init__(self, cooldown, task, repeat=False):
+        if hasattr(self, '_crond') and self._get_crond() is not None:
+            raise RuntimeError('Cronjob is scheduled')
+
+        if not callable(task):
+            raise TypeError('task must be callable')
+
+        if not isinstance(cooldown, Cooldown):
+            _reject_c_cooldown(cooldown, 'Cronjob')
+            cooldown = Cooldown(cooldown)
+
+        self._cooldown = cooldown
+        self._task = task
+        self._repeat = bool(repeat)
+        self._crond = None
+        self._lane = 0
+        self._offset = 0.0
+        self._deadline = inf
+        self._seq = 0
+        self._index = -1
+
+    def _get_crond(self):
+        """The CronD we're scheduled in, or None"""
+        return None if self._crond is None else self._crond()
+
+    def __repr__(self):
+        return f'Cronjob({self._cooldown!r}, {self._task!r}, repeat={self._repeat}) at {id(self):#x}'
+
+    def __call__(self):
+        # Behave like the weakref that `add()` used to return
+        return self if self._get_crond() is not None else None
+
+    @property
+    def cooldown(self):
+        return self._cooldown
+
+    @property
+    def task(self):
+        return self._task
+
+    @task.setter
+    def task(self, val):
+        if not callable(val):
+            raise TypeError('task must be callable')
+
+        self._task = val
+
+    @property
+    def repeat(self):
+        return self._repeat
+
+    @repeat.setter
+    def repeat(self, val):
+        self._repeat = bool(val)
+
+    @property
+    def scheduled(self):
+        return self._get_crond() is not None
+
+    @property
+    def lane(self):
+        return self._lane
+
+    @property
+    def offset(self):
+        return self._offset
+
+
+class _Lane:
+    """The heap and counters of a CronD priority lane"""
+    __slots__ = ('heap', 'due', 'run', 'deferred', 'shed')
+
+    def __init__(self):
+        self.heap = []
+        self.due = self.run = self.deferred = self.shed = 0
+
+
+class CronD:
+    """Run tasks when their cooldown goes cold.
+
+    See the documentation of the C implementation.
+    """
+    __slots__ = ('_t0', '_lanes', '_len', '_seq', '_max_jobs', '_shed', '_jitter',
+                 '_spread', '_rng', '_spread_count', '_ref', '__weakref__')
+
+    def __init__(self, *, jitter=0.0, spread=0.0, seed=0, lanes=1, max_jobs=None, shed=False):
+        jitter, spread = _as_double(jitter), _as_double(spread)
+        if not isinstance(seed, int):
+            raise TypeError(f"argument 'seed' must be int, not {type(seed).__name__}")
+        lanes = _as_index(lanes)
+
+        if jitter < 0 or spread < 0:
+            raise ValueError('jitter and spread must not be negative')
+        if lanes < 1:
+            raise ValueError('lanes must be at least 1')
+        self.max_jobs = max_jobs
+
+        if hasattr(self, '_lanes'):
+            self._clear()
+        else:
+            # Jobs only hold a weak reference, like the borrowed pointer in
+            # C, so cooldowns that outlive us don't keep us alive.
+            self._ref = _ref(self)
+            self._len = 0
+            self._seq = 0
+
+        self._lanes = [_Lane() for _ in range(lanes)]
+        self._shed = bool(shed)
+
+        self._t0 = monotonic_ns()
+        self._jitter = jitter
+        self._spread = spread
+        self._rng = seed & _U64
+        self._spread_count = 0
+
+    def _now(self):
+        return (monotonic_ns() - self._t0) / 1e9
+
+    def _deadline(self, job):
+        cooldown = job._cooldown
+        if cooldown._paused:
+            return inf
+
+        return (cooldown._t0 - self._t0) / 1e9 + cooldown._duration + job._offset
+
+    def _push(self, job):
+        """Schedule job in its lane at the time its cooldown goes cold"""
+        cooldown = job._cooldown
+
+        job._deadline = self._deadline(job)
+        job._seq = self._seq
+        self._seq += 1
+
+        if cooldown._jobs is None:
+            cooldown._jobs = [job]
+        else:
+            cooldown._jobs.append(job)
+        job._crond = self._ref
+        self._len += 1
+        _heap_push(self._lanes[job._lane].heap, job)
+
+    def _pop(self, lane, i):
+        """Take job i out of the lane's heap"""
+        job = _heap_remove(lane.heap, i)
+        self._len -= 1
+
+        jobs = job._cooldown._jobs
+        jobs.remove(job)
+        if not jobs:
+            job._cooldown._jobs = None
+
+        return job
+
+    def _rekey(self, job):
+        job._deadline = self._deadline(job)
+        _heap_sift(self._lanes[job._lane].heap, job._index)
+
+    def _rearm(self, job):
+        """Restart the cooldown of a repeating job after its run.
+
+        The first run after a jitter/spread offset restarts from now instead
+        of wrapping, so the following runs keep the offset phase.
+        """
+        cooldown = job._cooldown
+
+        # No wrapping for a zero duration, fmod would give NaN
+        cooldown.reset(cooldown._duration, wrap=cooldown._duration > 0 and job._offset == 0)
+        job._offset = 0.0
+
+    def _count_due(self, heap, i, now):
+        """Number of due jobs in the subheap at i, only visits the due ones"""
+        if i >= len(heap) or heap[i]._deadline > now:
+            return 0
+
+        return 1 + self._count_due(heap, 2 * i + 1, now) + self._count_due(heap, 2 * i + 2, now)
+
+    def _overload(self, lane, now):
+        """The budget of the update is used up, defer or shed the due jobs of lane"""
+        n = self._count_due(lane.heap, 0, now)
+
+        lane.due += n
+        if not self._shed:
+            lane.deferred += n
+            return
+
+        # Repeating jobs skip this run.  They are pushed back right away, but
+        # always behind the due ones, so exactly n pops take the due jobs.
+        lane.shed += n
+        for _ in range(n):
+            job = self._pop(lane, 0)
+            if job._repeat:
+                self._rearm(job)
+                self._push(job)
+            else:
+                job._crond = None
+
+    def _random(self):
+        """splitmix64, uniform in [0, 1)"""
+        self._rng = z = (self._rng + 0x9e3779b97f4a7c15) & _U64
+        z = ((z ^ (z >> 30)) * 0xbf58476d1ce4e5b9) & _U64
+        z = ((z ^ (z >> 27)) * 0x94d049bb133111eb) & _U64
+        z ^= z >> 31
+
+        return (z >> 11) * 2.0 ** -53
+
+    def _offset(self, job, jitter, spread):
+        """Push back the first deadline of a new job, see the C implementation"""
+        job._offset = 0.0
+
+        if jitter > 0:
+            job._offset += jitter * self._random()
+
+        if spread > 0 and job._repeat:
+            job._offset += spread * fmod(self._spread_count * 0.6180339887498949, 1.0)
+            self._spread_count += 1
+
+    def _clear(self):
+        for lane in self._lanes:
+            while lane.heap:
+                self._pop(lane, len(lane.heap) - 1)._crond = None
+
+    def __repr__(self):
+        return f'CronD(len={self._len}) at {id(self):#x}'
+
+    def __len__(self):
+        return self._len
+
+    def add(self, cooldown, task, repeat=False, *, lane=0, jitter=None, spread=None):
+        lane = _as_index(lane)
+        jitter = self._jitter if jitter is None else _non_negative(jitter, 'jitter')
+        spread = self._spread if spread is None else _non_negative(spread, 'spread')
+
+        if not 0 <= lane < len(self._lanes):
+            raise ValueError('lane must be in range(lanes)')
+
+        job = Cronjob(cooldown, task, repeat)
+        job._lane = lane
+        self._offset(job, jitter, spread)
+        self._push(job)
+
+        return job
+
+    def remove(self, cid):
+        # Handles used to be weakrefs, so accept those too
+        if isinstance(cid, _ref):
+            cid = cid()
+
+        if cid is None:
+            return
+
+        if not isinstance(cid, Cronjob):
+            raise TypeError('remove expects the Cronjob returned by add')
+
+        if cid._crond is not self._ref:
+            return
+
+        # A running job is only unlinked, update() drops it
+        cid._crond = None
+        if cid._index >= 0:
+            self._pop(self._lanes[cid._lane], cid._index)
+
+    def update(self):
+        budget = self._max_jobs
+        now = self._now()
+        due = []
+
+        # Collect first.  The tasks may add or remove jobs, and repeating
+        # jobs are only pushed back after all due jobs ran, so a job with a
+        # zero cooldown runs once per update instead of forever.
+        for i, lane in enumerate(self._lanes):
+            heap = lane.heap
+            while heap and heap[0]._deadline <= now:
+                # The first lane is never held back
+                if i > 0 and budget == 0:
+                    self._overload(lane, now)
+                    break
+
+                due.append(self._pop(lane, 0))
+                lane.due += 1
+                if budget > 0:
+                    budget -= 1
+
+        ref = self._ref
+        for i, job in enumerate(due):
+            # Removed by an earlier task
+            if job._crond is not ref:
+                continue
+
+            try:
+                job._task()
+            except BaseException:
+                job._crond = None
+
+                # Jobs that didn't run yet stay scheduled
+                for job in due[i + 1:]:
+                    if job._crond is ref and job._index < 0:
+                        self._push(job)
+                raise
+
+            # Unless the task called __init__ with fewer lanes
+            if job._lane < len(self._lanes):
+                self._lanes[job._lane].run += 1
+
+            # Still scheduled, unless the task removed itself
+            if job._crond is not ref:
+                continue
+
+            if job._repeat:
+                self._rearm(job)
+                self._push(job)
+            else:
+                job._crond = None
+
+    def reset_stats(self):
+        for lane in self._lanes:
+            lane.due = lane.run = lane.deferred = lane.shed = 0
+
+    @property
+    def heap(self):
+        return [job for lane in self._lanes for job in lane.heap]
+
+    @property
+    def jitter(self):
+        return self._jitter
+
+    @jitter.setter
+    def jitter(self, val):
+        self._jitter = _non_negative(val, 'jitter')
+
+    @property
+    def spread(self):
+        return self._spread
+
+    @spread.setter
+    def spread(self, val):
+        self._spread = _non_negative(val, 'spread')
+
+    @property
+    def lanes(self):
+        return len(self._lanes)
+
+    @property
+    def max_jobs(self):
+        return None if self._max_jobs < 0 else self._max_jobs
+
+    @max_jobs.setter
+    def max_jobs(self, val):
+        if val is None:
+            self._max_jobs = -1
+            return
+
+        val = _as_index(val)
+        if val < 0:
+            raise ValueError('max_jobs must not be negative')
+
+        self._max_jobs = val
+
+    @property
+    def shed(self):
+        return self._shed
+
+    @shed.setter
+    def shed(self, val):
+        self._shed = bool(val)
+
+    @property
+    def stats(self):
+        return [{'due': lane.due, 'run': lane.run, 'deferred': lane.deferred, 'shed': lane.shed}
+                for lane in self._lanes]
+
+
+# The easings, in the same order of operations as the C implementation, so
+# the results are bit identical.
+
+_BACK_C1 = 1.70158
+_BACK_C2 = _BACK_C1 * 1.525
+_BACK_C3 = _BACK_C1 + 1
+_BOUNCE_N1 = 7.5625
+_BOUNCE_D1 = 2.75
+
+
+def null(x): return x  # noqa: E704
+
+def in_sine(x): return 1 - cos((x * pi) / 2)  # noqa: E302, E704
+def out_sine(x): return sin((x * pi) / 2)  # noqa: E704
+def in_out_sine(x): return -(cos(pi * x) - 1) / 2  # noqa: E704
+
+def in_quad(x): return x * x  # noqa: E302, E704
+def out_quad(x): return 1 - (1 - x) * (1 - x)  # noqa: E704
+def in_out_quad(x): return 2 * x * x if x < 0.5 else 1 - (-2 * x + 2) ** 2 / 2  # noqa: E704
+
+def in_cubic(x): return x * x * x  # noqa: E302, E704
+def out_cubic(x): return 1 - (1 - x) * (1 - x) * (1 - x)  # noqa: E704
+def in_out_cubic(x): return 4 * x * x * x if x < 0.5 else 1 - (-2 * x + 2) * (-2 * x + 2) * (-2 * x + 2) / 2  # noqa: E501, E704
+
+def in_quart(x): return x * x * x * x  # noqa: E302, E704
+def out_quart(x): return 1 - (1 - x) * (1 - x) * (1 - x) * (1 - x)  # noqa: E704
+
+
+def in_out_quart(x):
+    y = -2 * x + 2
+    return 8 * x * x * x * x if x < 0.5 else 1 - y * y * y * y / 2
+
+
+def in_quint(x): return x * x * x * x * x  # noqa: E704
+def out_quint(x): return 1 - (1 - x) * (1 - x) * (1 - x) * (1 - x) * (1 - x)  # noqa: E704
+
+
+def in_out_quint(x):
+    y = -2 * x + 2
+    return 16 * x * x * x * x * x if x < 0.5 else 1 - y * y * y * y * y / 2
+
+
+def in_expo(x): return 0.0 if x == 0 else 2.0 ** (10 * x - 10)  # noqa: E704
+def out_expo(x): return 1.0 if x == 1 else 1 - 2.0 ** (-10 * x)  # noqa: E704
+
+
+def in_out_expo(x):
+    if x == 0:
+        return 0.0
+    if x == 1:
+        return 1.0
+    if x < 0.5:
+        return 2.0 ** (20 * x - 10) / 2
+    return (2 - 2.0 ** (-20 * x + 10)) / 2
+
+
+def in_circ(x): return 1 - sqrt(1 - float(x) ** 2)  # noqa: E704
+def out_circ(x): return sqrt(1 - float(x - 1) ** 2)  # noqa: E704
+
+
+def in_out_circ(x):
+    if x < 0.5:
+        return (1 - sqrt(1 - float(2 * x) ** 2)) / 2
+    return (sqrt(1 - float(-2 * x + 2) ** 2) + 1) / 2
+
+
+def in_back(x): return _BACK_C3 * x * x * x - _BACK_C1 * x * x  # noqa: E704
+def out_back(x): return 1 + _BACK_C3 * (x - 1) * (x - 1) * (x - 1) + _BACK_C1 * (x - 1) * (x - 1)  # noqa: E704
+
+
+def in_out_back(x):
+    if x < 0.5:
+        return (float(2 * x) ** 2 * ((_BACK_C2 + 1) * 2 * x - _BACK_C2)) / 2
+    return (float(2 * x - 2) ** 2 * ((_BACK_C2 + 1) * (x * 2 - 2) + _BACK_C2) + 2) / 2
+
+
+def in_elastic(x):
+    if x == 0:
+        return 0.0
+    if x == 1:
+        return 1.0
+    return -2.0 ** (10 * x - 10) * sin((x * 10 - 10.75) * 2 * pi / 3)
+
+
+def out_elastic(x):
+    if x == 0:
+        return 0.0
+    if x == 1:
+        return 1.0
+    return 2.0 ** (-10 * x) * sin((x * 10 - 0.75) * 2 * pi / 3) + 1
+
+
+def in_out_elastic(x):
+    if x == 0:
+        return 0.0
+    if x == 1:
+        return 1.0
+    if x < 0.5:
+        return -(2.0 ** (20 * x - 10) * sin((20 * x - 11.125) * 2 * pi / 4.5)) / 2
+    return (2.0 ** (-20 * x + 10) * sin((20 * x - 11.125) * 2 * pi / 4.5)) / 2 + 1
+
+
+def out_bounce(x):
+    if x < 1 / _BOUNCE_D1:
+        return _BOUNCE_N1 * x * x
+    elif x < 2 / _BOUNCE_D1:
+        x -= 1.5 / _BOUNCE_D1
+        return _BOUNCE_N1 * x * x + 0.75
+    elif x < 2.5 / _BOUNCE_D1:
+        x -= 2.25 / _BOUNCE_D1
+        return _BOUNCE_N1 * x * x + 0.9375
+
+    x -= 2.625 / _BOUNCE_D1
+    return _BOUNCE_N1 * x * x + 0.984375
+
+
+def in_bounce(x): return 1 - out_bounce(1 - x)  # noqa: E704
+
+
+def in_out_bounce(x):
+    if x < 0.5:
+        return (1 - out_bounce(1 - 2 * x)) / 2
+    return (1 + out_bounce(2 * x - 1)) / 2
+
+
+easings = {f.__name__: f for f in (
+    null,
+    in_sine, out_sine, in_out_sine,
+    in_quad, out_quad, in_out_quad,
+    in_cubic, out_cubic, in_out_cubic,
+    in_quart, out_quart, in_out_quart,
+    in_quint, out_quint, in_out_quint,
+    in_expo, out_expo, in_out_expo,
+    in_circ, out_circ, in_out_circ,
+    in_back, out_back, in_out_back,
+    in_elastic, out_elastic, in_out_elastic,
+    in_bounce, out_bounce, in_out_bounce,
+)}
+easings['bounce_out'] = out_bounce
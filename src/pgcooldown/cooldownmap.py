@@ -0,0 +1,134 @@
+"""KeyedCooldownMap
+
+Cooldowns per key, e.g. per (entity, action), that forget about keys once
+their cooldown went cold.
+"""
+
+from collections import deque
+from typing import Hashable
+
+from pgcooldown import Cooldown
+
+__all__ = ['KeyedCooldownMap']
+
+
+class KeyedCooldownMap:
+    """Cooldowns per key with automatic expiry of cold entries.
+
+    A dict of Cooldowns for per entity or per client timers only grows and
+    needs to be swept for cold entries by hand.  The KeyedCooldownMap drops
+    entries by itself once they are cold, so its size stays proportional to
+    the number of hot keys.
+
+        cooldowns = KeyedCooldownMap()
+
+        def on_fire(player):
+            if cooldowns.try_acquire((player, 'fire'), 0.5):
+                launch_bullet(player)
+
+    Expired entries are cleaned up incrementally with every operation.
+    Entries are queued per duration, and since all entries in such a queue
+    run out in the order they were added, only the heads of the queues need
+    to be checked.  Every entry is queued and dropped once, so cleanup is
+    amortized O(1) per operation, there is no full scan.
+
+    Note: A key that went cold behaves exactly like a key that was never
+    acquired, no matter if it was already dropped or not.
+
+    """
+    def __init__(self) -> None:
+        self._cooldowns: dict[Hashable, Cooldown] = {}
+        self._queues: dict[float, deque[tuple[Hashable, Cooldown]]] = {}
+
+    def __len__(self) -> int:
+        """Number of tracked keys, including cold ones not yet dropped."""
+        return len(self._cooldowns)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Is the cooldown of `key` still hot?"""
+        self._expire_next()
+        cooldown = self._cooldowns.get(key)
+        return cooldown is not None and cooldown.hot()
+
+    def try_acquire(self, key: Hashable, duration: float) -> bool:
+        """Start the cooldown for `key`, if it is cold.
+
+        Checking for cold and starting the cooldown happens in one step.
+
+        Parameters
+        ----------
+        key: Hashable
+            Anything that can be used as a dict key.
+
+        duration: float
+            The cooldown in seconds.
+
+        Returns
+        -------
+        True if the cooldown was cold and has been started, False if it is
+        still hot.
+        """
+        cooldowns = self._cooldowns
+
+        cooldown = cooldowns.get(key)
+        if cooldown is not None and cooldown.hot():
+            self._expire_next()
+            return False
+
+        cooldown = Cooldown(duration)
+        cooldowns[key] = cooldown
+
+        queue = self._queues.get(duration)
+        if queue is None:
+            queue = self._queues[duration] = deque()
+        queue.append((key, cooldown))
+
+        self._expire(duration)
+        self._expire_next()
+
+        return True
+
+    def remaining(self, key: Hashable) -> float:
+        """Time in seconds until the cooldown of `key` is cold, 0 if it is."""
+        self._expire_next()
+        cooldown = self._cooldowns.get(key)
+        return 0.0 if cooldown is None else cooldown.remaining
+
+    def discard(self, key: Hashable) -> None:
+        """Make `key` cold immediately.  Does nothing for unknown keys."""
+        self._cooldowns.pop(key, None)
+        self._expire_next()
+
+    def clear(self) -> None:
+        """Drop all keys."""
+        self._cooldowns.clear()
+        self._queues.clear()
+
+    def _expire(self, duration: float) -> None:
+        """Drop cold and stale entries from the head of a queue."""
+        queue = self._queues[duration]
+        cooldowns = self._cooldowns
+
+        while queue:
+            key, cooldown = queue[0]
+            # The key was discarded or acquired again, the entry is stale.
+            if cooldowns.get(key) is cooldown:
+                if cooldown.hot():
+                    break
+                del cooldowns[key]
+            queue.popleft()
+
+        if not queue:
+            del self._queues[duration]
+
+    def _expire_next(self) -> None:
+        """Expire the next queue in round robin order."""
+        if not self._queues:
+            return
+
+        duration = next(iter(self._queues))
+        self._expire(duration)
+
+        # Move it to the end, so every queue gets its turn
+        if duration in self._queues:
+            self._queues[duration] = self._queues.pop(duration)
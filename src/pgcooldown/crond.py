@@ -0,0 +1,13 @@
+"""CronD & co...
+
+A scheduler for running functions after a cooldown, see the package
+documentation for an overview.
+
+CronD and Cronjob are implemented in C, or in pure python with
+`pgcooldown.PURE_PYTHON`.  This module is kept so existing
+`from pgcooldown.crond import CronD` imports keep working.
+"""
+
+from pgcooldown import Cronjob, CronD
+
+__all__ = ['Cronjob', 'CronD']
@@ -0,0 +1,64 @@
+"""Easing functions in C
+
+Robert Penner's easing functions, with the same names and results as in
+`rpeasings`.  They can be used as plain functions, but `lerp()`,
+`lerp_into()`, LerpThing & co. run them directly in C.
+
+    from pgcooldown.easings import out_quad
+
+    alpha = LerpThing(0, 255, 2, ease=out_quad)
+
+`easings` maps the names to the functions, e.g. to pick one by user input.
+
+With the pure python core, see `pgcooldown.PURE_PYTHON`, these are python
+functions with the same results.
+"""
+
+from pgcooldown import PURE_PYTHON
+
+if PURE_PYTHON:
+    from pgcooldown._pure import easings
+else:
+    from pgcooldown._pgcooldown import easings
+
+__all__ = ['easings', 'null', 'in_sine', 'out_sine', 'in_out_sine', 'in_quad',
+           'out_quad', 'in_out_quad', 'in_cubic', 'out_cubic',
+           'in_out_cubic', 'in_quart', 'out_quart', 'in_out_quart',
+           'in_quint', 'out_quint', 'in_out_quint', 'in_expo', 'out_expo',
+           'in_out_expo', 'in_circ', 'out_circ', 'in_out_circ', 'in_back',
+           'out_back', 'in_out_back', 'in_elastic', 'out_elastic',
+           'in_out_elastic', 'in_bounce', 'out_bounce', 'in_out_bounce',
+           'bounce_out']
+
+null = easings['null']
+in_sine = easings['in_sine']
+out_sine = easings['out_sine']
+in_out_sine = easings['in_out_sine']
+in_quad = easings['in_quad']
+out_quad = easings['out_quad']
+in_out_quad = easings['in_out_quad']
+in_cubic = easings['in_cubic']
+out_cubic = easings['out_cubic']
+in_out_cubic = easings['in_out_cubic']
+in_quart = easings['in_quart']
+out_quart = easings['out_quart']
+in_out_quart = easings['in_out_quart']
+in_quint = easings['in_quint']
+out_quint = easings['out_quint']
+in_out_quint = easings['in_out_quint']
+in_expo = easings['in_expo']
+out_expo = easings['out_expo']
+in_out_expo = easings['in_out_expo']
+in_circ = easings['in_circ']
+out_circ = easings['out_circ']
+in_out_circ = easings['in_out_circ']
+in_back = easings['in_back']
+out_back = easings['out_back']
+in_out_back = easings['in_out_back']
+in_elastic = easings['in_elastic']
+out_elastic = easings['out_elastic']
+in_out_elastic = easings['in_out_elastic']
+in_bounce = easings['in_bounce']
+out_bounce = easings['out_bounce']
+in_out_bounce = easings['in_out_bounce']
+bounce_out = easings['bounce_out']
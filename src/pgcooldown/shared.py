@@ -0,0 +1,93 @@
+"""SharedCooldownTable
+
+A CooldownTable in `multiprocessing.shared_memory`, so worker processes on
+the same host can share global cooldowns.
+"""
+
+import sys
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Self
+
+from pgcooldown._pgcooldown import CooldownTable
+
+__all__ = ['SharedCooldownTable']
+
+
+class SharedCooldownTable(CooldownTable):
+    """A CooldownTable living in a named shared memory block.
+
+    The creating process passes the number of cooldowns, all others attach
+    by name:
+
+        # Main process
+        table = SharedCooldownTable(size=10_000, duration=1.5)
+        start_workers(table.name)
+
+        # Workers
+        table = SharedCooldownTable(name)
+        if table.try_acquire(account_id):
+            ...
+
+    Use it as a context manager or call `close()` when done.  The creating
+    process should `unlink()` the shared memory at the end.
+
+    Parameters
+    ----------
+    name: str | None = None
+        The name of the shared memory block.  When creating a table, a
+        random name is picked if none is given.
+
+    size: int = 0
+        Create a new table with `size` cooldowns.  With 0, attach to an
+        existing table.
+
+    duration: float = 0.0
+        The initial duration of all cooldowns when creating.
+    """
+    def __init__(self, name: str | None = None, size: int = 0, duration: float = 0.0) -> None:
+        create = size > 0
+        if not create and name is None:
+            raise ValueError('name is required to attach to an existing table')
+
+        # Attaching registers the block with the resource tracker, which
+        # then unlinks it when the attaching process exits.
+        untrack = not create and sys.version_info < (3, 13)
+        kwargs: dict[str, bool] = {} if create or untrack else {'track': False}
+
+        self.shm = SharedMemory(name, create=create, size=CooldownTable.nbytes(size), **kwargs)
+        if untrack:
+            resource_tracker.unregister(self.shm._name, 'shared_memory')  # type: ignore[attr-defined]
+
+        try:
+            super().__init__(self.shm.buf, create, duration=duration)
+        except BaseException:
+            self.shm.close()
+            raise
+
+    def __repr__(self) -> str:
+        return f'SharedCooldownTable({self.name!r}, size={len(self)})'
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None,
+                 exc_value: BaseException | None,
+                 traceback: TracebackType | None) -> None:
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block to attach to."""
+        return self.shm.name
+
+    def close(self) -> None:
+        """Detach from the shared memory.  The table can't be used anymore."""
+        self.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Remove the shared memory block, once all processes closed it."""
+        self.shm.unlink()
@@ -0,0 +1,46 @@
+"""throttle, debounce
+
+Decorator versions of the Throttle and Debounce wrappers.
+
+    @throttle(0.25)
+    def fire():
+        launch_bullet()
+
+    @debounce(1.0, crond)
+    def save():
+        write_settings_to_disk()
+"""
+
+from functools import update_wrapper
+from typing import Any, Callable
+
+from pgcooldown._pgcooldown import Throttle, Debounce
+
+__all__ = ['throttle', 'debounce']
+
+
+def throttle(seconds: float, wrap: bool = False, *,
+             leading: bool = True, trailing: bool = False,
+             crond: Any = None) -> Callable[[Callable[..., Any]], Throttle]:
+    """Decorator to let calls through at most once per `seconds`.
+
+    See `Throttle` for the parameters.
+    """
+    def decorator(func: Callable[..., Any]) -> Throttle:
+        wrapper = Throttle(func, seconds, wrap, leading=leading, trailing=trailing, crond=crond)
+        return update_wrapper(wrapper, func)
+
+    return decorator
+
+
+def debounce(seconds: float, crond: Any = None, *,
+             leading: bool = False, trailing: bool = True) -> Callable[[Callable[..., Any]], Debounce]:
+    """Decorator to run a call only after calls stopped for `seconds`.
+
+    See `Debounce` for the parameters.
+    """
+    def decorator(func: Callable[..., Any]) -> Debounce:
+        wrapper = Debounce(func, seconds, crond, leading=leading, trailing=trailing)
+        return update_wrapper(wrapper, func)
+
+    return decorator
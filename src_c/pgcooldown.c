@@ -1,7 +1,13 @@
 #include <math.h>
+#include <stddef.h>
+#include <stdint.h>
 #include <time.h>
 #include <Python.h>
 
+#ifdef _WIN32
+#include <windows.h>
+#endif
+
 
 /*----------------------------------------------------------------------
      ____                 _        _
@@ -14,6 +20,9 @@
 
 #include <docstrings.h>
 
+#define PGCOOLDOWN_MODULE
+#include <pgcooldown_capi.h>
+
 /*----------------------------------------------------------------------
      ____        __ _       _ _   _
     |  _ \  ___ / _(_)_ __ (_) |_(_) ___  _ __  ___
@@ -24,8 +33,12 @@
 ----------------------------------------------------------------------*/
 
 #define MAX(a, b) (((a) > (b)) ? (a) : (b))
+#define MIN(a, b) (((a) < (b)) ? (a) : (b))
 #define T_FRACTION_SCALE 1000000000.0
 
+struct CooldownRegistry;
+struct Cronjob;
+
 typedef struct Cooldown {
     PyObject_HEAD
     struct timespec t0;
@@ -33,6 +46,9 @@ typedef struct Cooldown {
     int wrap;
     int paused;
     double remaining_; /* Save remaining duration when paused */
+    struct CooldownRegistry *registry;  /* Borrowed, the registry owns us */
+    Py_ssize_t registry_index;
+    struct Cronjob *jobs;   /* Borrowed, the CronD heap entries using us */
 } Cooldown;
 
 /* Utilities */
@@ -50,15 +66,25 @@ static double current_delta(struct timespec *t0);
 static double get_temperature(Cooldown *self);
 static void set_temperature(Cooldown *self, double val);
 static double get_remaining(Cooldown *self);
+static double get_normalized(Cooldown *self);
+static double get_normalized_at(Cooldown *self, struct timespec *now);
 static void set_remaining(Cooldown *self, double val);
 static int is_cold(Cooldown *self);
 static void set_cold(Cooldown *self, int val);
 static void set_paused(Cooldown *self, int val);
+static void reset(Cooldown *self, double new_duration, int wrap);
+static void cooldown_rekey(Cooldown *self);
+static void crond_rekey(struct Cronjob *jobs);
+static int reject_pure_cooldown(PyObject *o, const char *what);
 
 /* Module level functions */
 static PyObject * pgcooldown_lerp(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 static PyObject * pgcooldown_invlerp(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 static PyObject * pgcooldown_remap(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * pgcooldown_lerp_into(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * pgcooldown_lerp_keyframes(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static int apply_ease(PyObject *ease, double t, double *eased);
+static int keyframe_item(PyObject *seq, Py_ssize_t i, double *val);
 static PyObject * cooldown_new(PyTypeObject *type, PyObject *args, PyObject *kwargs);
 
 /* Class definition */
@@ -117,6 +143,8 @@ static PyMethodDef pgcooldown_methods[] = {
     {"lerp", (PyCFunction)pgcooldown_lerp, METH_FASTCALL, DOCSTRING_LERP},
     {"invlerp", (PyCFunction)pgcooldown_invlerp, METH_FASTCALL, DOCSTRING_LERP},
     {"remap", (PyCFunction)pgcooldown_remap, METH_FASTCALL, DOCSTRING_LERP},
+    {"lerp_into", (PyCFunction)pgcooldown_lerp_into, METH_FASTCALL, DOCSTRING_LERP_INTO},
+    {"lerp_keyframes", (PyCFunction)pgcooldown_lerp_keyframes, METH_FASTCALL, DOCSTRING_LERP_KEYFRAMES},
     {NULL, NULL, 0, NULL},
 };
 
@@ -207,6 +235,39 @@ static void dump(char *msg, Cooldown *self) {
     printf("    temperature: %f\n", get_temperature(self));
 }
 
+/* The pure python Cooldown of pgcooldown._pure has no C struct, so the
+ * classes working on the struct directly can't use it.  Raise instead of
+ * taking it for a duration.  If the module isn't loaded, there are no pure
+ * Cooldowns, so don't import it just for the check.
+ */
+static int reject_pure_cooldown(PyObject *o, const char *what) {
+    static PyObject *name = NULL;
+    PyObject *module, *type;
+    int rc;
+
+    if (name == NULL && (name = PyUnicode_InternFromString("pgcooldown._pure")) == NULL)
+        return -1;
+
+    module = PyImport_GetModule(name);
+    if (module == NULL)
+        return PyErr_Occurred() ? -1 : 0;
+
+    type = PyObject_GetAttrString(module, "Cooldown");
+    Py_DECREF(module);
+    if (type == NULL)
+        return -1;
+
+    rc = PyObject_IsInstance(o, type);
+    Py_DECREF(type);
+    if (rc > 0) {
+        PyErr_Format(PyExc_TypeError,
+                     "%s needs a C Cooldown, the pure python Cooldown is not supported", what);
+        return -1;
+    }
+
+    return rc;
+}
+
 static double lerp(double a, double b, double t) {
     return t * (b - a) + a;
 }
@@ -265,6 +326,8 @@ static void set_temperature(Cooldown *self, double val) {
         self->t0.tv_sec = now.tv_sec - delta.tv_sec;
         self->t0.tv_nsec = now.tv_nsec - delta.tv_nsec;
     }
+
+    cooldown_rekey(self);
 }
 
 
@@ -274,6 +337,29 @@ static double get_remaining(Cooldown *self) {
 }
 
 
+static double get_normalized(Cooldown *self) {
+    return self->duration
+        ? 1 - get_remaining(self) / self->duration
+        : 0.0;
+}
+
+
+/* get_normalized at a given time, to read the clock only once for many
+ * cooldowns */
+static double get_normalized_at(Cooldown *self, struct timespec *now) {
+    double temperature;
+
+    if (!self->duration)
+        return 0.0;
+
+    temperature = self->paused
+        ? self->remaining_
+        : self->duration - diff_timespec(&self->t0, now);
+
+    return 1 - MAX(temperature, 0.0) / self->duration;
+}
+
+
 static void set_remaining(Cooldown *self, double val) {
     set_temperature(self, MAX(val, 0.0));
 }
@@ -293,11 +379,35 @@ static void set_cold(Cooldown *self, int val) {
 }
 
 
+static void reset(Cooldown *self, double new_duration, int wrap) {
+    /* Note: Initial duration is the base for calculating the overflow, but
+     * final duration must be set before applying the overflow.
+     * See comments further down. */
+
+    double old_temperature, new_temperature;
+
+    if (!wrap) {
+        new_temperature = new_duration;
+    } else {
+        old_temperature = get_temperature(self);
+
+        new_temperature = old_temperature > 0
+            ? new_duration
+            : fmod(old_temperature, new_duration) + new_duration;
+    }
+
+    /* Only now overwrite! */
+    self->duration = new_duration;
+    set_temperature(self, new_temperature);
+}
+
+
 static void set_paused(Cooldown *self, int val) {
     if (val) {
         // Order is important!
         self->remaining_ = get_temperature(self);
         self->paused = 1;
+        cooldown_rekey(self);
     } else {
         self->paused = 0;
         set_temperature(self, self->remaining_);
@@ -318,7 +428,7 @@ static void set_paused(Cooldown *self, int val) {
 static PyObject *pgcooldown_lerp(PyObject *self, PyObject *const *args, Py_ssize_t nargs) {
     double a, b, t;
 
-    if (nargs != 3) goto TYPE_ERROR;
+    if (nargs != 3 && nargs != 4) goto TYPE_ERROR;
 
     a = PyFloat_AsDouble(args[0]);
     if (PyErr_Occurred()) goto TYPE_ERROR;
@@ -327,10 +437,13 @@ static PyObject *pgcooldown_lerp(PyObject *self, PyObject *const *args, Py_ssize
     t = PyFloat_AsDouble(args[2]);
     if (PyErr_Occurred()) goto TYPE_ERROR;
 
+    if (nargs == 4 && apply_ease(args[3], t, &t) < 0)
+        return NULL;
+
     return PyFloat_FromDouble(lerp(a, b, t));
 
 TYPE_ERROR:
-    PyErr_SetString(PyExc_TypeError, "lerp expects 3 floats");
+    PyErr_SetString(PyExc_TypeError, "lerp expects 3 floats and an optional easing function");
     return NULL;
 }
 
@@ -381,6 +494,206 @@ TYPE_ERROR:
     return NULL;
 }
 
+static PyObject *pgcooldown_lerp_into(PyObject *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *out, *a = NULL, *b = NULL;
+    Py_buffer view;
+    Py_ssize_t len;
+    double t, *buf = NULL;
+
+    if (nargs != 4 && nargs != 5) {
+        PyErr_SetString(PyExc_TypeError, "lerp_into expects out, a, b, t and an optional easing function");
+        return NULL;
+    }
+
+    out = args[0];
+    t = PyFloat_AsDouble(args[3]);
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "lerp_into expects t to be a float");
+        return NULL;
+    }
+
+    if (nargs == 5 && apply_ease(args[4], t, &t) < 0)
+        return NULL;
+
+    a = PySequence_Fast(args[1], "lerp_into expects a to be a sequence");
+    if (a == NULL) return NULL;
+    b = PySequence_Fast(args[2], "lerp_into expects b to be a sequence");
+    if (b == NULL) goto ERROR;
+
+    len = PySequence_Fast_GET_SIZE(a);
+    if (PySequence_Fast_GET_SIZE(b) != len) {
+        PyErr_SetString(PyExc_ValueError, "lerp_into expects a and b to be of the same length");
+        goto ERROR;
+    }
+
+    /* Write directly into double buffers, skip the float objects */
+    view.obj = NULL;
+    if (PyObject_CheckBuffer(out)) {
+        if (PyObject_GetBuffer(out, &view, PyBUF_WRITABLE | PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0) {
+            PyErr_Clear();
+            view.obj = NULL;
+        } else if (view.format == NULL || strcmp(view.format, "d") != 0) {
+            PyBuffer_Release(&view);
+            view.obj = NULL;
+        } else {
+            buf = (double *)view.buf;
+        }
+    }
+
+    if (buf != NULL) {
+        if (view.len != len * (Py_ssize_t)sizeof(double)) {
+            PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_ValueError, "lerp_into expects out to be of the same length as a and b");
+            goto ERROR;
+        }
+    } else if (PyObject_Length(out) != len) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_ValueError, "lerp_into expects out to be of the same length as a and b");
+        goto ERROR;
+    }
+
+    for (Py_ssize_t i = 0; i < len; ++i) {
+        double va = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(a, i));
+        double vb = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(b, i));
+        if (PyErr_Occurred()) {
+            if (buf != NULL) PyBuffer_Release(&view);
+            PyErr_SetString(PyExc_TypeError, "lerp_into expects sequences of floats");
+            goto ERROR;
+        }
+
+        if (buf != NULL) {
+            buf[i] = lerp(va, vb, t);
+        } else {
+            PyObject *v = PyFloat_FromDouble(lerp(va, vb, t));
+            if (v == NULL) goto ERROR;
+
+            if (PyList_CheckExact(out)) {
+                /* Steals the reference */
+                PyList_SetItem(out, i, v);
+            } else {
+                int rc = PySequence_SetItem(out, i, v);
+                Py_DECREF(v);
+                if (rc < 0) goto ERROR;
+            }
+        }
+    }
+
+    if (buf != NULL) PyBuffer_Release(&view);
+    Py_DECREF(a);
+    Py_DECREF(b);
+
+    Py_INCREF(out);
+    return out;
+
+ERROR:
+    Py_XDECREF(a);
+    Py_XDECREF(b);
+    return NULL;
+}
+
+static int keyframe_item(PyObject *seq, Py_ssize_t i, double *val) {
+    *val = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(seq, i));
+    if (*val == -1.0 && PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "lerp_keyframes expects sequences of floats");
+        return -1;
+    }
+
+    return 0;
+}
+
+static PyObject *pgcooldown_lerp_keyframes(PyObject *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *times = NULL, *values = NULL, *eases = NULL, *ease = Py_None;
+    PyObject *rc = NULL;
+    Py_ssize_t n, lo, hi;
+    double ts, t, t0, t1, v0, v1;
+
+    if (nargs != 3 && nargs != 4) {
+        PyErr_SetString(PyExc_TypeError, "lerp_keyframes expects times, values, t and optional easing functions");
+        return NULL;
+    }
+
+    ts = PyFloat_AsDouble(args[2]);
+    if (ts == -1.0 && PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "lerp_keyframes expects t to be a float");
+        return NULL;
+    }
+
+    times = PySequence_Fast(args[0], "lerp_keyframes expects times to be a sequence");
+    if (times == NULL) return NULL;
+    values = PySequence_Fast(args[1], "lerp_keyframes expects values to be a sequence");
+    if (values == NULL) goto EXIT;
+
+    n = PySequence_Fast_GET_SIZE(times);
+    if (n == 0 || PySequence_Fast_GET_SIZE(values) != n) {
+        PyErr_SetString(PyExc_ValueError, "lerp_keyframes expects times and values to be non-empty and of the same length");
+        goto EXIT;
+    }
+
+    if (nargs == 4 && args[3] != Py_None) {
+        if (PyCallable_Check(args[3])) {
+            ease = args[3];
+        } else {
+            eases = PySequence_Fast(args[3], "lerp_keyframes expects eases to be a callable or a sequence");
+            if (eases == NULL) goto EXIT;
+            if (PySequence_Fast_GET_SIZE(eases) != n - 1) {
+                PyErr_SetString(PyExc_ValueError, "lerp_keyframes expects one easing function per segment");
+                goto EXIT;
+            }
+        }
+    }
+
+    /* Outside of the track, hold the first/last value */
+    if (keyframe_item(times, 0, &t0) < 0) goto EXIT;
+    if (ts < t0) {
+        if (keyframe_item(values, 0, &v0) < 0) goto EXIT;
+        rc = PyFloat_FromDouble(v0);
+        goto EXIT;
+    }
+
+    if (keyframe_item(times, n - 1, &t1) < 0) goto EXIT;
+    if (n == 1 || ts > t1) {
+        if (keyframe_item(values, n - 1, &v1) < 0) goto EXIT;
+        rc = PyFloat_FromDouble(v1);
+        goto EXIT;
+    }
+
+    /* bisect_right over the inner keyframes, so lo - 1 is always a valid
+     * segment, even for ts on the last keyframe. */
+    lo = 1;
+    hi = n - 1;
+    while (lo < hi) {
+        Py_ssize_t mid = lo + (hi - lo) / 2;
+
+        if (keyframe_item(times, mid, &t) < 0) goto EXIT;
+        if (ts < t)
+            hi = mid;
+        else
+            lo = mid + 1;
+    }
+    --lo;
+
+    if (keyframe_item(times, lo, &t0) < 0
+            || keyframe_item(times, lo + 1, &t1) < 0
+            || keyframe_item(values, lo, &v0) < 0
+            || keyframe_item(values, lo + 1, &v1) < 0)
+        goto EXIT;
+
+    t = t1 > t0 ? (ts - t0) / (t1 - t0) : 1.0;
+
+    if (eases != NULL)
+        ease = PySequence_Fast_GET_ITEM(eases, lo);
+    if (apply_ease(ease, t, &t) < 0)
+        goto EXIT;
+
+    rc = PyFloat_FromDouble(lerp(v0, v1, t));
+
+EXIT:
+    Py_XDECREF(times);
+    Py_XDECREF(values);
+    Py_XDECREF(eases);
+    return rc;
+}
+
 /*----------------------------------------------------------------------
           _                     _       __
       ___| | __ _ ___ ___    __| | ___ / _|
@@ -424,6 +737,7 @@ static int cooldown___init__(Cooldown *self, PyObject *args, PyObject *kwargs) {
         self->wrap = source->wrap;
         self->paused = source->paused;
         self->remaining_ = source->remaining_;
+        cooldown_rekey(self);
     } else {
         self->duration = PyFloat_AsDouble(duration_or_cooldown);
         self->t0.tv_sec = 0;
@@ -440,7 +754,7 @@ static int cooldown___init__(Cooldown *self, PyObject *args, PyObject *kwargs) {
 
 
 static void cooldown_dealloc(Cooldown *self) {
-    /* pass */
+    Py_TYPE(self)->tp_free((PyObject *)self);
 }
 
 
@@ -567,12 +881,7 @@ static PyObject * cooldown_hot(Cooldown *self) {
 
 
 static PyObject * cooldown_reset(Cooldown *self, PyObject *args, PyObject *kwargs) {
-    /* Note: Initial duration is the base for calculating the overflow, but
-     * final duration must be set before applying the overflow.
-     * See comments further down. */
-
     int wrap = self->wrap;
-    double old_temperature, new_temperature;
     double new_duration = self->duration;
 
     static char *kwargslist[] = {"", "wrap", NULL};
@@ -582,19 +891,7 @@ static PyObject * cooldown_reset(Cooldown *self, PyObject *args, PyObject *kwarg
                 &new_duration, &wrap))
         return NULL;
 
-    if (!wrap) {
-        new_temperature = new_duration;
-    } else {
-        old_temperature = get_temperature(self);
-
-        new_temperature = old_temperature > 0
-            ? new_duration
-            : fmod(old_temperature, new_duration) + new_duration;
-    }
-
-    /* Only now overwrite! */
-    self->duration = new_duration;
-    set_temperature(self, new_temperature);
+    reset(self, new_duration, wrap);
 
     Py_INCREF(self);
     return (PyObject *)self;
@@ -669,6 +966,7 @@ static int cooldown_setter_duration(Cooldown *self, PyObject *val, void *closure
     }
 
     self->duration = duration;
+    cooldown_rekey(self);
     return 0;
 }
 
@@ -749,9 +1047,7 @@ static int cooldown_setter_remaining(Cooldown *self, PyObject *val, void *closur
 
 
 static PyObject *cooldown_getter_normalized(Cooldown *self) {
-    return self->duration
-        ? PyFloat_FromDouble(1 - get_remaining(self) / self->duration)
-        : PyFloat_FromDouble(0.0);
+    return PyFloat_FromDouble(get_normalized(self));
 }
 
 
@@ -770,28 +1066,5225 @@ static int cooldown_setter_normalized(Cooldown *self, PyObject *val, void *closu
 
 
 /*----------------------------------------------------------------------
-                         _       _
-     _ __ ___   ___   __| |_   _| | ___
-    | '_ ` _ \ / _ \ / _` | | | | |/ _ \
-    | | | | | | (_) | (_| | |_| | |  __/
-    |_| |_| |_|\___/ \__,_|\__,_|_|\___|
+     _____     _              ____             _        _
+    |_   _|__ | | _____ _ __ | __ ) _   _  ___| | _____| |_
+      | |/ _ \| |/ / _ \ '_ \|  _ \| | | |/ __| |/ / _ \ __|
+      | | (_) |   <  __/ | | | |_) | |_| | (__|   <  __/ |_
+      |_|\___/|_|\_\___|_| |_|____/ \__,_|\___|_|\_\___|\__|
 
 ----------------------------------------------------------------------*/
 
-PyMODINIT_FUNC PyInit__pgcooldown(void) {
-    PyObject *m;
+typedef struct TokenBucket {
+    PyObject_HEAD
+    struct timespec t0; /* Time base, the times below are relative to this */
+    double capacity;
+    double rate;
+    double tokens;
+    double last;        /* Time of the last refill */
+} TokenBucket;
+
+static PyTypeObject token_bucket_type;
+
+#define is_token_bucket(o) (PyType_IsSubtype(Py_TYPE(o), &token_bucket_type))
+
+static void token_bucket_start(TokenBucket *self, double tokens);
+static void token_bucket_refill(TokenBucket *self);
+static int token_bucket_consume(TokenBucket *self, double n);
+static double token_bucket_time_until(TokenBucket *self, double n);
+static int token_bucket_is_idle(TokenBucket *self);
+
+static int token_bucket___init__(TokenBucket *self, PyObject *args, PyObject *kwargs);
+static void token_bucket_dealloc(TokenBucket *self);
+static PyObject * token_bucket_repr(TokenBucket *self);
+static PyObject * token_bucket_try_consume(TokenBucket *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * token_bucket_time_until_available(TokenBucket *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * token_bucket_reset(TokenBucket *self);
+static PyObject * token_bucket_getter_capacity(TokenBucket *self, void *closure);
+static int token_bucket_setter_capacity(TokenBucket *self, PyObject *val, void *closure);
+static PyObject * token_bucket_getter_rate(TokenBucket *self, void *closure);
+static int token_bucket_setter_rate(TokenBucket *self, PyObject *val, void *closure);
+static PyObject * token_bucket_getter_tokens(TokenBucket *self, void *closure);
+static int token_bucket_setter_tokens(TokenBucket *self, PyObject *val, void *closure);
+
+static PyMethodDef token_bucket_methods_[] = {
+    {"try_consume", (PyCFunction)token_bucket_try_consume, METH_FASTCALL, NULL},
+    {"time_until_available", (PyCFunction)token_bucket_time_until_available, METH_FASTCALL, NULL},
+    {"reset", (PyCFunction)token_bucket_reset, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef token_bucket_getset_[] = {
+    {"capacity", (getter)token_bucket_getter_capacity, (setter)token_bucket_setter_capacity, NULL, NULL},
+    {"rate", (getter)token_bucket_getter_rate, (setter)token_bucket_setter_rate, NULL, NULL},
+    {"tokens", (getter)token_bucket_getter_tokens, (setter)token_bucket_setter_tokens, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject token_bucket_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.TokenBucket",
+    .tp_doc = DOCSTRING_TOKENBUCKET,
+    .tp_basicsize = sizeof(TokenBucket),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)token_bucket___init__,
+    .tp_repr = (reprfunc)token_bucket_repr,
+    .tp_dealloc = (destructor)token_bucket_dealloc,
+    .tp_methods = token_bucket_methods_,
+    .tp_getset = token_bucket_getset_,
+};
+
+
+static void token_bucket_start(TokenBucket *self, double tokens) {
+    timespec_get(&self->t0, TIME_UTC);
+    self->last = 0.0;
+    self->tokens = tokens;
+}
+
+
+static void token_bucket_refill(TokenBucket *self) {
+    double now = current_delta(&self->t0);
+
+    self->tokens = MIN(self->capacity, self->tokens + (now - self->last) * self->rate);
+    self->last = now;
+}
+
+
+static int token_bucket_consume(TokenBucket *self, double n) {
+    token_bucket_refill(self);
+
+    if (self->tokens < n)
+        return 0;
+
+    self->tokens -= n;
+    return 1;
+}
+
+
+static double token_bucket_time_until(TokenBucket *self, double n) {
+    token_bucket_refill(self);
+
+    if (self->tokens >= n)
+        return 0.0;
+
+    if (n > self->capacity || self->rate <= 0.0)
+        return Py_HUGE_VAL;
+
+    return (n - self->tokens) / self->rate;
+}
+
+
+static int token_bucket_is_idle(TokenBucket *self) {
+    token_bucket_refill(self);
+
+    return self->tokens >= self->capacity;
+}
+
+
+/* Parse the optional `n` argument of the consume methods */
+static int parse_tokens(PyObject *const *args, Py_ssize_t nargs, double *n) {
+    *n = 1.0;
+
+    if (nargs > 1) {
+        PyErr_SetString(PyExc_TypeError, "expected at most 1 argument");
+        return -1;
+    }
+
+    if (nargs == 1) {
+        *n = PyFloat_AsDouble(args[0]);
+        if (PyErr_Occurred()) {
+            PyErr_SetString(PyExc_TypeError, "n must be a float");
+            return -1;
+        }
+    }
+
+    if (*n < 0) {
+        PyErr_SetString(PyExc_ValueError, "n must not be negative");
+        return -1;
+    }
+
+    return 0;
+}
+
+
+static int token_bucket___init__(TokenBucket *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"capacity", "rate", "tokens", NULL};
+    PyObject *tokens = Py_None;
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "dd|$O", kwargslist,
+                &self->capacity, &self->rate, &tokens))
+        return -1;
+
+    if (self->capacity < 0 || self->rate < 0) {
+        PyErr_SetString(PyExc_ValueError, "capacity and rate must not be negative");
+        return -1;
+    }
+
+    if (tokens == Py_None) {
+        token_bucket_start(self, self->capacity);
+    } else {
+        double val = PyFloat_AsDouble(tokens);
+        if (PyErr_Occurred()) {
+            PyErr_SetString(PyExc_TypeError, "tokens must be a float");
+            return -1;
+        }
+        token_bucket_start(self, MIN(val, self->capacity));
+    }
+
+    return 0;
+}
+
+
+static void token_bucket_dealloc(TokenBucket *self) {
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * token_bucket_repr(TokenBucket *self) {
+    PyObject *capacity, *rate, *repr;
+
+    capacity = PyFloat_FromDouble(self->capacity);
+    rate = PyFloat_FromDouble(self->rate);
+    repr = PyUnicode_FromFormat("TokenBucket(%R, %R) at %p", capacity, rate, self);
+    Py_XDECREF(capacity);
+    Py_XDECREF(rate);
+
+    return repr;
+}
+
+
+static PyObject * token_bucket_try_consume(TokenBucket *self, PyObject *const *args, Py_ssize_t nargs) {
+    double n;
 
-    if (PyType_Ready(&cooldown_type) < 0)
+    if (parse_tokens(args, nargs, &n) < 0)
         return NULL;
 
-    m = PyModule_Create(&cooldown_module);
-    if (m == NULL)
+    return PyBool_FromLong(token_bucket_consume(self, n));
+}
+
+
+static PyObject * token_bucket_time_until_available(TokenBucket *self, PyObject *const *args, Py_ssize_t nargs) {
+    double n;
+
+    if (parse_tokens(args, nargs, &n) < 0)
         return NULL;
 
-    if (PyModule_AddObjectRef(m, "Cooldown", (PyObject *)&cooldown_type) < 0) {
+    return PyFloat_FromDouble(token_bucket_time_until(self, n));
+}
+
+
+static PyObject * token_bucket_reset(TokenBucket *self) {
+    token_bucket_start(self, self->capacity);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * token_bucket_getter_capacity(TokenBucket *self, void *closure) {
+    return PyFloat_FromDouble(self->capacity);
+}
+
+
+static int token_bucket_setter_capacity(TokenBucket *self, PyObject *val, void *closure) {
+    double capacity = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "capacity must be a float");
+        return -1;
+    }
+    if (capacity < 0) {
+        PyErr_SetString(PyExc_ValueError, "capacity must not be negative");
+        return -1;
+    }
+
+    token_bucket_refill(self);
+    self->capacity = capacity;
+    self->tokens = MIN(self->tokens, capacity);
+
+    return 0;
+}
+
+
+static PyObject * token_bucket_getter_rate(TokenBucket *self, void *closure) {
+    return PyFloat_FromDouble(self->rate);
+}
+
+
+static int token_bucket_setter_rate(TokenBucket *self, PyObject *val, void *closure) {
+    double rate = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "rate must be a float");
+        return -1;
+    }
+    if (rate < 0) {
+        PyErr_SetString(PyExc_ValueError, "rate must not be negative");
+        return -1;
+    }
+
+    /* Tokens up to now are still refilled with the old rate */
+    token_bucket_refill(self);
+    self->rate = rate;
+
+    return 0;
+}
+
+
+static PyObject * token_bucket_getter_tokens(TokenBucket *self, void *closure) {
+    token_bucket_refill(self);
+
+    return PyFloat_FromDouble(self->tokens);
+}
+
+
+static int token_bucket_setter_tokens(TokenBucket *self, PyObject *val, void *closure) {
+    double tokens = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "tokens must be a float");
+        return -1;
+    }
+
+    token_bucket_refill(self);
+    self->tokens = MIN(tokens, self->capacity);
+
+    return 0;
+}
+
+
+/*----------------------------------------------------------------------
+     ____  _ _     _ _           __        ___           _               _     _
+    / ___|| (_) __| (_)_ __   __ \ \      / (_)_ __   __| | _____      _| |   (_)
+    \___ \| | |/ _` | | '_ \ / _` \ \ /\ / /| | '_ \ / _` |/ _ \ \ /\ / / |   | |
+     ___) | | | (_| | | | | | (_| |\ V  V / | | | | | (_| | (_) \ V  V /| |___| |
+    |____/|_|_|\__,_|_|_| |_|\__, | \_/\_/  |_|_| |_|\__,_|\___/ \_/\_/ |_____|_|
+                             |___/
+               _ _
+     _ __ ___ (_) |_ ___ _ __
+    | '_ ` _ \| | __/ _ \ '__|
+    | | | | | | | ||  __/ |
+    |_| |_| |_|_|\__\___|_|
+
+----------------------------------------------------------------------*/
+
+typedef struct SlidingWindowLimiter {
+    PyObject_HEAD
+    struct timespec t0; /* Time base, the times below are relative to this */
+    double limit;
+    double window;
+    double start;       /* Start of the current window */
+    double current;     /* Events in the current window */
+    double previous;    /* Events in the previous window */
+} SlidingWindowLimiter;
+
+static PyTypeObject sliding_window_type;
+
+#define is_sliding_window(o) (PyType_IsSubtype(Py_TYPE(o), &sliding_window_type))
+
+static void sliding_window_start(SlidingWindowLimiter *self);
+static double sliding_window_advance(SlidingWindowLimiter *self);
+static double sliding_window_count(SlidingWindowLimiter *self, double now);
+static int sliding_window_consume(SlidingWindowLimiter *self, double n);
+static double sliding_window_time_until(SlidingWindowLimiter *self, double n);
+static int sliding_window_is_idle(SlidingWindowLimiter *self);
+
+static int sliding_window___init__(SlidingWindowLimiter *self, PyObject *args, PyObject *kwargs);
+static void sliding_window_dealloc(SlidingWindowLimiter *self);
+static PyObject * sliding_window_repr(SlidingWindowLimiter *self);
+static PyObject * sliding_window_try_consume(SlidingWindowLimiter *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * sliding_window_time_until_available(SlidingWindowLimiter *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * sliding_window_reset(SlidingWindowLimiter *self);
+static PyObject * sliding_window_getter_limit(SlidingWindowLimiter *self, void *closure);
+static int sliding_window_setter_limit(SlidingWindowLimiter *self, PyObject *val, void *closure);
+static PyObject * sliding_window_getter_window(SlidingWindowLimiter *self, void *closure);
+static PyObject * sliding_window_getter_count(SlidingWindowLimiter *self, void *closure);
+
+static PyMethodDef sliding_window_methods_[] = {
+    {"try_consume", (PyCFunction)sliding_window_try_consume, METH_FASTCALL, NULL},
+    {"time_until_available", (PyCFunction)sliding_window_time_until_available, METH_FASTCALL, NULL},
+    {"reset", (PyCFunction)sliding_window_reset, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef sliding_window_getset_[] = {
+    {"limit", (getter)sliding_window_getter_limit, (setter)sliding_window_setter_limit, NULL, NULL},
+    {"window", (getter)sliding_window_getter_window, NULL, NULL, NULL},
+    {"count", (getter)sliding_window_getter_count, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject sliding_window_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.SlidingWindowLimiter",
+    .tp_doc = DOCSTRING_SLIDINGWINDOWLIMITER,
+    .tp_basicsize = sizeof(SlidingWindowLimiter),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)sliding_window___init__,
+    .tp_repr = (reprfunc)sliding_window_repr,
+    .tp_dealloc = (destructor)sliding_window_dealloc,
+    .tp_methods = sliding_window_methods_,
+    .tp_getset = sliding_window_getset_,
+};
+
+
+static void sliding_window_start(SlidingWindowLimiter *self) {
+    timespec_get(&self->t0, TIME_UTC);
+    self->start = 0.0;
+    self->current = 0.0;
+    self->previous = 0.0;
+}
+
+
+/* Move the window forward to now and return the current time */
+static double sliding_window_advance(SlidingWindowLimiter *self) {
+    double now = current_delta(&self->t0);
+    double windows = floor((now - self->start) / self->window);
+
+    if (windows >= 1.0) {
+        self->previous = windows == 1.0 ? self->current : 0.0;
+        self->current = 0.0;
+        self->start += windows * self->window;
+    }
+
+    return now;
+}
+
+
+/* The previous window is weighted by how much of it still overlaps the
+ * sliding window, which gives an O(1) approximation of the real count. */
+static double sliding_window_count(SlidingWindowLimiter *self, double now) {
+    double overlap = 1.0 - (now - self->start) / self->window;
+
+    return self->previous * overlap + self->current;
+}
+
+
+static int sliding_window_consume(SlidingWindowLimiter *self, double n) {
+    double now = sliding_window_advance(self);
+
+    if (sliding_window_count(self, now) + n > self->limit)
+        return 0;
+
+    self->current += n;
+    return 1;
+}
+
+
+static double sliding_window_time_until(SlidingWindowLimiter *self, double n) {
+    double now, elapsed, wait;
+
+    if (n > self->limit)
+        return Py_HUGE_VAL;
+
+    now = sliding_window_advance(self);
+    if (sliding_window_count(self, now) + n <= self->limit)
+        return 0.0;
+
+    elapsed = now - self->start;
+
+    /* Enough room once the previous window has decayed far enough */
+    if (self->current + n <= self->limit) {
+        wait = self->window * (1.0 - (self->limit - n - self->current) / self->previous) - elapsed;
+        return MAX(wait, 0.0);
+    }
+
+    /* Otherwise the current window must become the previous one first */
+    wait = self->window * (1.0 - (self->limit - n) / self->current);
+    return self->window - elapsed + MAX(wait, 0.0);
+}
+
+
+static int sliding_window_is_idle(SlidingWindowLimiter *self) {
+    sliding_window_advance(self);
+
+    return self->current == 0.0 && self->previous == 0.0;
+}
+
+
+static int sliding_window___init__(SlidingWindowLimiter *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"limit", "window", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "dd", kwargslist,
+                &self->limit, &self->window))
+        return -1;
+
+    if (self->limit < 0 || self->window <= 0) {
+        PyErr_SetString(PyExc_ValueError, "limit must not be negative and window must be positive");
+        return -1;
+    }
+
+    sliding_window_start(self);
+
+    return 0;
+}
+
+
+static void sliding_window_dealloc(SlidingWindowLimiter *self) {
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * sliding_window_repr(SlidingWindowLimiter *self) {
+    PyObject *limit, *window, *repr;
+
+    limit = PyFloat_FromDouble(self->limit);
+    window = PyFloat_FromDouble(self->window);
+    repr = PyUnicode_FromFormat("SlidingWindowLimiter(%R, %R) at %p", limit, window, self);
+    Py_XDECREF(limit);
+    Py_XDECREF(window);
+
+    return repr;
+}
+
+
+static PyObject * sliding_window_try_consume(SlidingWindowLimiter *self, PyObject *const *args, Py_ssize_t nargs) {
+    double n;
+
+    if (parse_tokens(args, nargs, &n) < 0)
+        return NULL;
+
+    return PyBool_FromLong(sliding_window_consume(self, n));
+}
+
+
+static PyObject * sliding_window_time_until_available(SlidingWindowLimiter *self, PyObject *const *args, Py_ssize_t nargs) {
+    double n;
+
+    if (parse_tokens(args, nargs, &n) < 0)
+        return NULL;
+
+    return PyFloat_FromDouble(sliding_window_time_until(self, n));
+}
+
+
+static PyObject * sliding_window_reset(SlidingWindowLimiter *self) {
+    sliding_window_start(self);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * sliding_window_getter_limit(SlidingWindowLimiter *self, void *closure) {
+    return PyFloat_FromDouble(self->limit);
+}
+
+
+static int sliding_window_setter_limit(SlidingWindowLimiter *self, PyObject *val, void *closure) {
+    double limit = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "limit must be a float");
+        return -1;
+    }
+    if (limit < 0) {
+        PyErr_SetString(PyExc_ValueError, "limit must not be negative");
+        return -1;
+    }
+
+    self->limit = limit;
+
+    return 0;
+}
+
+
+static PyObject * sliding_window_getter_window(SlidingWindowLimiter *self, void *closure) {
+    return PyFloat_FromDouble(self->window);
+}
+
+
+static PyObject * sliding_window_getter_count(SlidingWindowLimiter *self, void *closure) {
+    double now = sliding_window_advance(self);
+
+    return PyFloat_FromDouble(sliding_window_count(self, now));
+}
+
+
+/*----------------------------------------------------------------------
+     _  __                   _ ____       _       _     _           _ _
+    | |/ /___ _   _  ___  __| |  _ \ __ _| |_ ___| |   (_)_ __ ___ (_) |_ ___ _ __
+    | ' // _ \ | | |/ _ \/ _` | |_) / _` | __/ _ \ |   | | '_ ` _ \| | __/ _ \ '__|
+    | . \  __/ |_| |  __/ (_| |  _ < (_| | ||  __/ |___| | | | | | | | ||  __/ |
+    |_|\_\___|\__, |\___|\__,_|_| \_\__,_|\__\___|_____|_|_| |_| |_|_|\__\___|_|
+              |___/
+----------------------------------------------------------------------*/
+
+typedef struct KeyedRateLimiter {
+    PyObject_HEAD
+    PyObject *prototype; /* TokenBucket or SlidingWindowLimiter */
+    PyObject *limiters;  /* dict key -> limiter */
+} KeyedRateLimiter;
+
+static PyTypeObject keyed_rate_limiter_type;
+
+static PyObject * limiter_clone(PyObject *prototype);
+static int limiter_consume(PyObject *limiter, double n);
+static double limiter_time_until(PyObject *limiter, double n);
+static int limiter_is_idle(PyObject *limiter);
+static PyObject * keyed_rate_limiter_get(KeyedRateLimiter *self, PyObject *key);
+
+static int keyed_rate_limiter___init__(KeyedRateLimiter *self, PyObject *args, PyObject *kwargs);
+static int keyed_rate_limiter_traverse(KeyedRateLimiter *self, visitproc visit, void *arg);
+static int keyed_rate_limiter_clear(KeyedRateLimiter *self);
+static void keyed_rate_limiter_dealloc(KeyedRateLimiter *self);
+static Py_ssize_t keyed_rate_limiter___len__(KeyedRateLimiter *self);
+static int keyed_rate_limiter___contains__(KeyedRateLimiter *self, PyObject *key);
+static PyObject * keyed_rate_limiter_try_consume(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * keyed_rate_limiter_try_consume_many(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * keyed_rate_limiter_time_until_available(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * keyed_rate_limiter_discard(KeyedRateLimiter *self, PyObject *key);
+static PyObject * keyed_rate_limiter_prune(KeyedRateLimiter *self);
+static PyObject * keyed_rate_limiter_getter_prototype(KeyedRateLimiter *self, void *closure);
+
+static PySequenceMethods keyed_rate_limiter_as_sequence = {
+    .sq_length = (lenfunc)keyed_rate_limiter___len__,
+    .sq_contains = (objobjproc)keyed_rate_limiter___contains__,
+};
+
+static PyMethodDef keyed_rate_limiter_methods_[] = {
+    {"try_consume", (PyCFunction)keyed_rate_limiter_try_consume, METH_FASTCALL, NULL},
+    {"try_consume_many", (PyCFunction)keyed_rate_limiter_try_consume_many, METH_FASTCALL, NULL},
+    {"time_until_available", (PyCFunction)keyed_rate_limiter_time_until_available, METH_FASTCALL, NULL},
+    {"discard", (PyCFunction)keyed_rate_limiter_discard, METH_O, NULL},
+    {"prune", (PyCFunction)keyed_rate_limiter_prune, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef keyed_rate_limiter_getset_[] = {
+    {"prototype", (getter)keyed_rate_limiter_getter_prototype, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject keyed_rate_limiter_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.KeyedRateLimiter",
+    .tp_doc = DOCSTRING_KEYEDRATELIMITER,
+    .tp_basicsize = sizeof(KeyedRateLimiter),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)keyed_rate_limiter___init__,
+    .tp_traverse = (traverseproc)keyed_rate_limiter_traverse,
+    .tp_clear = (inquiry)keyed_rate_limiter_clear,
+    .tp_dealloc = (destructor)keyed_rate_limiter_dealloc,
+    .tp_as_sequence = &keyed_rate_limiter_as_sequence,
+    .tp_methods = keyed_rate_limiter_methods_,
+    .tp_getset = keyed_rate_limiter_getset_,
+};
+
+
+/* A fresh limiter with the configuration of the prototype */
+static PyObject * limiter_clone(PyObject *prototype) {
+    PyTypeObject *type = Py_TYPE(prototype);
+    PyObject *clone = type->tp_alloc(type, 0);
+
+    if (clone == NULL)
+        return NULL;
+
+    if (is_token_bucket(prototype)) {
+        TokenBucket *src = (TokenBucket *)prototype;
+        TokenBucket *dst = (TokenBucket *)clone;
+
+        dst->capacity = src->capacity;
+        dst->rate = src->rate;
+        token_bucket_start(dst, dst->capacity);
+    } else {
+        SlidingWindowLimiter *src = (SlidingWindowLimiter *)prototype;
+        SlidingWindowLimiter *dst = (SlidingWindowLimiter *)clone;
+
+        dst->limit = src->limit;
+        dst->window = src->window;
+        sliding_window_start(dst);
+    }
+
+    return clone;
+}
+
+
+static int limiter_consume(PyObject *limiter, double n) {
+    return is_token_bucket(limiter)
+        ? token_bucket_consume((TokenBucket *)limiter, n)
+        : sliding_window_consume((SlidingWindowLimiter *)limiter, n);
+}
+
+
+static double limiter_time_until(PyObject *limiter, double n) {
+    return is_token_bucket(limiter)
+        ? token_bucket_time_until((TokenBucket *)limiter, n)
+        : sliding_window_time_until((SlidingWindowLimiter *)limiter, n);
+}
+
+
+static int limiter_is_idle(PyObject *limiter) {
+    return is_token_bucket(limiter)
+        ? token_bucket_is_idle((TokenBucket *)limiter)
+        : sliding_window_is_idle((SlidingWindowLimiter *)limiter);
+}
+
+
+/* Borrowed reference to the limiter of `key`, created if missing */
+static PyObject * keyed_rate_limiter_get(KeyedRateLimiter *self, PyObject *key) {
+    PyObject *limiter = PyDict_GetItemWithError(self->limiters, key);
+
+    if (limiter != NULL || PyErr_Occurred())
+        return limiter;
+
+    limiter = limiter_clone(self->prototype);
+    if (limiter == NULL)
+        return NULL;
+
+    if (PyDict_SetItem(self->limiters, key, limiter) < 0) {
+        Py_DECREF(limiter);
+        return NULL;
+    }
+
+    /* The dict holds the reference now */
+    Py_DECREF(limiter);
+    return limiter;
+}
+
+
+static int keyed_rate_limiter___init__(KeyedRateLimiter *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"limiter", NULL};
+    PyObject *prototype;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O", kwargslist, &prototype))
+        return -1;
+
+    if (!is_token_bucket(prototype) && !is_sliding_window(prototype)) {
+        PyErr_SetString(PyExc_TypeError, "limiter must be a TokenBucket or SlidingWindowLimiter");
+        return -1;
+    }
+
+    Py_INCREF(prototype);
+    Py_XSETREF(self->prototype, prototype);
+    Py_XSETREF(self->limiters, PyDict_New());
+    if (self->limiters == NULL)
+        return -1;
+
+    return 0;
+}
+
+
+static int keyed_rate_limiter_traverse(KeyedRateLimiter *self, visitproc visit, void *arg) {
+    Py_VISIT(self->prototype);
+    Py_VISIT(self->limiters);
+    return 0;
+}
+
+
+static int keyed_rate_limiter_clear(KeyedRateLimiter *self) {
+    Py_CLEAR(self->prototype);
+    Py_CLEAR(self->limiters);
+    return 0;
+}
+
+
+static void keyed_rate_limiter_dealloc(KeyedRateLimiter *self) {
+    PyObject_GC_UnTrack(self);
+    keyed_rate_limiter_clear(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static Py_ssize_t keyed_rate_limiter___len__(KeyedRateLimiter *self) {
+    return self->limiters ? PyDict_Size(self->limiters) : 0;
+}
+
+
+static int keyed_rate_limiter___contains__(KeyedRateLimiter *self, PyObject *key) {
+    return self->limiters ? PyDict_Contains(self->limiters, key) : 0;
+}
+
+
+#define CHECK_KEYED_INIT(self) \
+    if ((self)->limiters == NULL) { \
+        PyErr_SetString(PyExc_RuntimeError, "KeyedRateLimiter not initialized"); \
+        return NULL; \
+    }
+
+static PyObject * keyed_rate_limiter_try_consume(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *limiter;
+    double n;
+
+    CHECK_KEYED_INIT(self);
+
+    if (nargs < 1) {
+        PyErr_SetString(PyExc_TypeError, "try_consume expects a key");
+        return NULL;
+    }
+    if (parse_tokens(args + 1, nargs - 1, &n) < 0)
+        return NULL;
+
+    limiter = keyed_rate_limiter_get(self, args[0]);
+    if (limiter == NULL)
+        return NULL;
+
+    return PyBool_FromLong(limiter_consume(limiter, n));
+}
+
+
+static PyObject * keyed_rate_limiter_try_consume_many(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *keys, *result, *key, *limiter;
+    Py_ssize_t len;
+    double n;
+
+    CHECK_KEYED_INIT(self);
+
+    if (nargs < 1) {
+        PyErr_SetString(PyExc_TypeError, "try_consume_many expects an iterable of keys");
+        return NULL;
+    }
+    if (parse_tokens(args + 1, nargs - 1, &n) < 0)
+        return NULL;
+
+    keys = PySequence_Fast(args[0], "try_consume_many expects an iterable of keys");
+    if (keys == NULL)
+        return NULL;
+
+    len = PySequence_Fast_GET_SIZE(keys);
+    result = PyList_New(len);
+    if (result == NULL)
+        goto ERROR;
+
+    for (Py_ssize_t i = 0; i < len; ++i) {
+        key = PySequence_Fast_GET_ITEM(keys, i);
+        limiter = keyed_rate_limiter_get(self, key);
+        if (limiter == NULL)
+            goto ERROR;
+
+        PyList_SET_ITEM(result, i, PyBool_FromLong(limiter_consume(limiter, n)));
+    }
+
+    Py_DECREF(keys);
+    return result;
+
+ERROR:
+    Py_DECREF(keys);
+    Py_XDECREF(result);
+    return NULL;
+}
+
+
+static PyObject * keyed_rate_limiter_time_until_available(KeyedRateLimiter *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *limiter;
+    double n;
+
+    CHECK_KEYED_INIT(self);
+
+    if (nargs < 1) {
+        PyErr_SetString(PyExc_TypeError, "time_until_available expects a key");
+        return NULL;
+    }
+    if (parse_tokens(args + 1, nargs - 1, &n) < 0)
+        return NULL;
+
+    limiter = PyDict_GetItemWithError(self->limiters, args[0]);
+    if (limiter == NULL) {
+        if (PyErr_Occurred())
+            return NULL;
+
+        /* Unknown keys behave like a fresh limiter, no need to create one */
+        limiter = self->prototype;
+        if (is_token_bucket(limiter))
+            return PyFloat_FromDouble(n <= ((TokenBucket *)limiter)->capacity ? 0.0 : Py_HUGE_VAL);
+        else
+            return PyFloat_FromDouble(n <= ((SlidingWindowLimiter *)limiter)->limit ? 0.0 : Py_HUGE_VAL);
+    }
+
+    return PyFloat_FromDouble(limiter_time_until(limiter, n));
+}
+
+
+static PyObject * keyed_rate_limiter_discard(KeyedRateLimiter *self, PyObject *key) {
+    CHECK_KEYED_INIT(self);
+
+    if (PyDict_DelItem(self->limiters, key) < 0) {
+        if (!PyErr_ExceptionMatches(PyExc_KeyError))
+            return NULL;
+        PyErr_Clear();
+    }
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * keyed_rate_limiter_prune(KeyedRateLimiter *self) {
+    PyObject *idle, *key, *limiter;
+    Py_ssize_t pos = 0, removed;
+
+    CHECK_KEYED_INIT(self);
+
+    /* Can't delete while iterating the dict, so collect the keys first */
+    idle = PyList_New(0);
+    if (idle == NULL)
+        return NULL;
+
+    while (PyDict_Next(self->limiters, &pos, &key, &limiter)) {
+        if (limiter_is_idle(limiter) && PyList_Append(idle, key) < 0) {
+            Py_DECREF(idle);
+            return NULL;
+        }
+    }
+
+    removed = PyList_GET_SIZE(idle);
+    for (Py_ssize_t i = 0; i < removed; ++i) {
+        if (PyDict_DelItem(self->limiters, PyList_GET_ITEM(idle, i)) < 0) {
+            Py_DECREF(idle);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(idle);
+    return PyLong_FromSsize_t(removed);
+}
+
+
+static PyObject * keyed_rate_limiter_getter_prototype(KeyedRateLimiter *self, void *closure) {
+    if (self->prototype == NULL)
+        Py_RETURN_NONE;
+
+    Py_INCREF(self->prototype);
+    return self->prototype;
+}
+
+
+/*----------------------------------------------------------------------
+     _____ _               _   _   _
+    |_   _| |__  _ __ ___ | |_| |_| | ___
+      | | | '_ \| '__/ _ \| __| __| |/ _ \
+      | | | | | | | | (_) | |_| |_| |  __/_
+      |_| |_| |_|_|  \___/ \__|\__|_|\___( )
+                                         |/
+     ____       _
+    |  _ \  ___| |__   ___  _   _ _ __   ___ ___
+    | | | |/ _ \ '_ \ / _ \| | | | '_ \ / __/ _ \
+    | |_| |  __/ |_) | (_) | |_| | | | | (_|  __/
+    |____/ \___|_.__/ \___/ \__,_|_| |_|\___\___|
+
+----------------------------------------------------------------------*/
+
+/* Throttle and Debounce share their state and most of the implementation,
+ * they only differ in how a call is handled. */
+typedef struct Throttle {
+    PyObject_HEAD
+    vectorcallfunc vectorcall;
+    PyObject *func;
+    Cooldown *cooldown;
+    PyObject *crond;    /* Runs the trailing call */
+    PyObject *args;     /* Arguments of the pending trailing call */
+    PyObject *kwargs;
+    PyObject *dict;
+    PyObject *name;     /* Attribute name in the class, see __set_name__ */
+    int wrap;
+    int leading;
+    int trailing;
+    int scheduled;      /* A trailing job is waiting in the crond */
+} Throttle;
+
+static PyTypeObject throttle_type;
+static PyTypeObject debounce_type;
+
+static int throttle_store_pending(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames);
+static void throttle_clear_pending(Throttle *self);
+static int throttle_schedule(Throttle *self);
+
+static PyObject * throttle_new(PyTypeObject *type, PyObject *args, PyObject *kwargs);
+static int throttle___init__(Throttle *self, PyObject *args, PyObject *kwargs);
+static int debounce___init__(Throttle *self, PyObject *args, PyObject *kwargs);
+static int throttle_traverse(Throttle *self, visitproc visit, void *arg);
+static int throttle_clear(Throttle *self);
+static void throttle_dealloc(Throttle *self);
+static PyObject * throttle_repr(Throttle *self);
+static PyObject * throttle_vectorcall(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames);
+static PyObject * debounce_vectorcall(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames);
+static PyObject * throttle___get__(PyObject *self, PyObject *obj, PyObject *type);
+static PyObject * throttle___set_name__(Throttle *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * throttle__fire(Throttle *self);
+static PyObject * throttle_flush(Throttle *self);
+static PyObject * throttle_cancel(Throttle *self);
+static PyObject * throttle_getter_cooldown(Throttle *self, void *closure);
+static PyObject * throttle_getter_pending(Throttle *self, void *closure);
+
+static PyMethodDef throttle_methods_[] = {
+    {"__set_name__", (PyCFunction)throttle___set_name__, METH_FASTCALL, NULL},
+    {"_fire", (PyCFunction)throttle__fire, METH_NOARGS, NULL},
+    {"flush", (PyCFunction)throttle_flush, METH_NOARGS, NULL},
+    {"cancel", (PyCFunction)throttle_cancel, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef throttle_getset_[] = {
+    {"cooldown", (getter)throttle_getter_cooldown, NULL, NULL, NULL},
+    {"pending", (getter)throttle_getter_pending, NULL, NULL, NULL},
+    {"__dict__", PyObject_GenericGetDict, PyObject_GenericSetDict, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject throttle_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.Throttle",
+    .tp_doc = DOCSTRING_THROTTLE,
+    .tp_basicsize = sizeof(Throttle),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_VECTORCALL,
+    .tp_new = throttle_new,
+    .tp_init = (initproc)throttle___init__,
+    .tp_traverse = (traverseproc)throttle_traverse,
+    .tp_clear = (inquiry)throttle_clear,
+    .tp_dealloc = (destructor)throttle_dealloc,
+    .tp_repr = (reprfunc)throttle_repr,
+    .tp_call = PyVectorcall_Call,
+    .tp_vectorcall_offset = offsetof(Throttle, vectorcall),
+    .tp_descr_get = throttle___get__,
+    .tp_dictoffset = offsetof(Throttle, dict),
+    .tp_methods = throttle_methods_,
+    .tp_getset = throttle_getset_,
+};
+
+static PyTypeObject debounce_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.Debounce",
+    .tp_doc = DOCSTRING_DEBOUNCE,
+    .tp_basicsize = sizeof(Throttle),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC | Py_TPFLAGS_HAVE_VECTORCALL,
+    .tp_new = throttle_new,
+    .tp_init = (initproc)debounce___init__,
+    .tp_traverse = (traverseproc)throttle_traverse,
+    .tp_clear = (inquiry)throttle_clear,
+    .tp_dealloc = (destructor)throttle_dealloc,
+    .tp_repr = (reprfunc)throttle_repr,
+    .tp_call = PyVectorcall_Call,
+    .tp_vectorcall_offset = offsetof(Throttle, vectorcall),
+    .tp_descr_get = throttle___get__,
+    .tp_dictoffset = offsetof(Throttle, dict),
+    .tp_methods = throttle_methods_,
+    .tp_getset = throttle_getset_,
+};
+
+
+/* Remember the arguments of a suppressed call for the trailing call.  Only
+ * the latest call is kept. */
+static int throttle_store_pending(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames) {
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    Py_ssize_t nkwargs = kwnames ? PyTuple_GET_SIZE(kwnames) : 0;
+    PyObject *pargs, *pkwargs = NULL;
+
+    pargs = PyTuple_New(nargs);
+    if (pargs == NULL)
+        return -1;
+
+    for (Py_ssize_t i = 0; i < nargs; ++i) {
+        Py_INCREF(args[i]);
+        PyTuple_SET_ITEM(pargs, i, args[i]);
+    }
+
+    if (nkwargs) {
+        pkwargs = PyDict_New();
+        if (pkwargs == NULL)
+            goto ERROR;
+
+        for (Py_ssize_t i = 0; i < nkwargs; ++i) {
+            if (PyDict_SetItem(pkwargs, PyTuple_GET_ITEM(kwnames, i), args[nargs + i]) < 0)
+                goto ERROR;
+        }
+    }
+
+    Py_XSETREF(self->args, pargs);
+    Py_XSETREF(self->kwargs, pkwargs);
+
+    return 0;
+
+ERROR:
+    Py_DECREF(pargs);
+    Py_XDECREF(pkwargs);
+    return -1;
+}
+
+
+static void throttle_clear_pending(Throttle *self) {
+    Py_CLEAR(self->args);
+    Py_CLEAR(self->kwargs);
+}
+
+
+/* Ask the crond to call `_fire` once the cooldown is cold */
+static int throttle_schedule(Throttle *self) {
+    PyObject *fire, *rc;
+
+    if (self->scheduled)
+        return 0;
+
+    fire = PyObject_GetAttrString((PyObject *)self, "_fire");
+    if (fire == NULL)
+        return -1;
+
+    rc = PyObject_CallMethod(self->crond, "add", "dO", get_remaining(self->cooldown), fire);
+    Py_DECREF(fire);
+    if (rc == NULL)
+        return -1;
+
+    Py_DECREF(rc);
+    self->scheduled = 1;
+
+    return 0;
+}
+
+
+static PyObject * throttle_new(PyTypeObject *type, PyObject *args, PyObject *kwargs) {
+    Throttle *self = (Throttle *)type->tp_alloc(type, 0);
+
+    if (self != NULL) {
+        self->vectorcall = type == &debounce_type
+            ? (vectorcallfunc)debounce_vectorcall
+            : (vectorcallfunc)throttle_vectorcall;
+    }
+
+    return (PyObject *)self;
+}
+
+
+/* Common part of the constructors */
+static int throttle_setup(Throttle *self, PyObject *func, double seconds, PyObject *crond) {
+    if (!PyCallable_Check(func)) {
+        PyErr_SetString(PyExc_TypeError, "func must be callable");
+        return -1;
+    }
+
+    if (!self->leading && !self->trailing) {
+        PyErr_SetString(PyExc_ValueError, "at least one of leading and trailing must be set");
+        return -1;
+    }
+
+    if (self->trailing && crond == Py_None) {
+        PyErr_SetString(PyExc_ValueError, "trailing calls need a crond");
+        return -1;
+    }
+
+    Py_INCREF(func);
+    Py_XSETREF(self->func, func);
+    Py_INCREF(crond);
+    Py_XSETREF(self->crond, crond);
+
+    Py_XSETREF(self->cooldown, (Cooldown *)PyObject_CallFunction((PyObject *)&cooldown_type, "d", seconds));
+    if (self->cooldown == NULL)
+        return -1;
+
+    /* The first call is always let through */
+    set_cold(self->cooldown, 1);
+    throttle_clear_pending(self);
+    self->scheduled = 0;
+
+    /* Lives in __dict__, so functools.update_wrapper can set it again */
+    return PyObject_SetAttrString((PyObject *)self, "__wrapped__", func);
+}
+
+
+static int throttle___init__(Throttle *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"func", "seconds", "wrap", "leading", "trailing", "crond", NULL};
+    PyObject *func, *crond = Py_None;
+    double seconds;
+
+    self->wrap = 0;
+    self->leading = 1;
+    self->trailing = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "Od|p$ppO", kwargslist,
+                &func, &seconds, &self->wrap, &self->leading, &self->trailing, &crond))
+        return -1;
+
+    return throttle_setup(self, func, seconds, crond);
+}
+
+
+static int debounce___init__(Throttle *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"func", "seconds", "crond", "leading", "trailing", NULL};
+    PyObject *func, *crond = Py_None;
+    double seconds;
+
+    self->wrap = 0;
+    self->leading = 0;
+    self->trailing = 1;
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "Od|O$pp", kwargslist,
+                &func, &seconds, &crond, &self->leading, &self->trailing))
+        return -1;
+
+    return throttle_setup(self, func, seconds, crond);
+}
+
+
+static int throttle_traverse(Throttle *self, visitproc visit, void *arg) {
+    Py_VISIT(self->func);
+    Py_VISIT(self->cooldown);
+    Py_VISIT(self->crond);
+    Py_VISIT(self->args);
+    Py_VISIT(self->kwargs);
+    Py_VISIT(self->dict);
+    Py_VISIT(self->name);
+    return 0;
+}
+
+
+static int throttle_clear(Throttle *self) {
+    Py_CLEAR(self->func);
+    Py_CLEAR(self->cooldown);
+    Py_CLEAR(self->crond);
+    Py_CLEAR(self->args);
+    Py_CLEAR(self->kwargs);
+    Py_CLEAR(self->dict);
+    Py_CLEAR(self->name);
+    return 0;
+}
+
+
+static void throttle_dealloc(Throttle *self) {
+    PyObject_GC_UnTrack(self);
+    throttle_clear(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * throttle_repr(Throttle *self) {
+    const char *name = Py_IS_TYPE(self, &debounce_type) ? "Debounce" : "Throttle";
+    PyObject *seconds, *repr;
+
+    if (self->cooldown == NULL)
+        return PyUnicode_FromFormat("%s() at %p", name, self);
+
+    seconds = PyFloat_FromDouble(self->cooldown->duration);
+    repr = PyUnicode_FromFormat("%s(%R, %R) at %p", name, self->func, seconds, self);
+    Py_XDECREF(seconds);
+
+    return repr;
+}
+
+
+#define CHECK_THROTTLE_INIT(self) \
+    if ((self)->cooldown == NULL) { \
+        PyErr_SetString(PyExc_RuntimeError, "throttle not initialized"); \
+        return NULL; \
+    }
+
+static PyObject * throttle_vectorcall(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames) {
+    CHECK_THROTTLE_INIT(self);
+
+    if (is_cold(self->cooldown)) {
+        reset(self->cooldown, self->cooldown->duration, self->wrap);
+
+        if (self->leading) {
+            /* Supersedes a trailing call that wasn't run yet */
+            throttle_clear_pending(self);
+            return PyObject_Vectorcall(self->func, args, nargsf, kwnames);
+        }
+    } else if (!self->trailing) {
+        /* The fast path, suppressed without any further work */
+        Py_RETURN_NONE;
+    }
+
+    if (throttle_store_pending(self, args, nargsf, kwnames) < 0
+            || throttle_schedule(self) < 0)
+        return NULL;
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * debounce_vectorcall(Throttle *self, PyObject *const *args, size_t nargsf, PyObject *kwnames) {
+    int cold;
+
+    CHECK_THROTTLE_INIT(self);
+
+    /* Every call restarts the quiet period */
+    cold = is_cold(self->cooldown);
+    reset(self->cooldown, self->cooldown->duration, 0);
+
+    if (self->leading && cold) {
+        throttle_clear_pending(self);
+        return PyObject_Vectorcall(self->func, args, nargsf, kwnames);
+    }
+
+    if (!self->trailing)
+        Py_RETURN_NONE;
+
+    if (throttle_store_pending(self, args, nargsf, kwnames) < 0
+            || throttle_schedule(self) < 0)
+        return NULL;
+
+    Py_RETURN_NONE;
+}
+
+
+/* A new throttle with the same settings and wrapper attributes, but its
+ * own cooldown and pending call */
+static PyObject * throttle_copy(Throttle *self) {
+    Throttle *copy;
+    PyObject *dict;
+
+    CHECK_THROTTLE_INIT(self);
+
+    copy = (Throttle *)throttle_new(Py_TYPE(self), NULL, NULL);
+    if (copy == NULL)
+        return NULL;
+
+    copy->wrap = self->wrap;
+    copy->leading = self->leading;
+    copy->trailing = self->trailing;
+    Py_XINCREF(self->name);
+    copy->name = self->name;
+
+    if (throttle_setup(copy, self->func, self->cooldown->duration, self->crond) < 0)
+        goto ERROR;
+
+    if (self->dict != NULL) {
+        if ((dict = PyObject_GenericGetDict((PyObject *)copy, NULL)) == NULL)
+            goto ERROR;
+        if (PyDict_Update(dict, self->dict) < 0) {
+            Py_DECREF(dict);
+            goto ERROR;
+        }
+        Py_DECREF(dict);
+    }
+
+    return (PyObject *)copy;
+
+ERROR:
+    Py_DECREF(copy);
+    return NULL;
+}
+
+
+/* As a method, every instance gets its own throttle, otherwise one call
+ * would suppress the calls of all other instances.  As with
+ * functools.cached_property, it is created on first access and cached in
+ * the instance __dict__, which shadows us from then on. */
+static PyObject * throttle___get__(PyObject *self, PyObject *obj, PyObject *type) {
+    Throttle *throttle = (Throttle *)self;
+    PyObject *dict, *copy, *bound;
+
+    if (obj == NULL || obj == Py_None) {
+        Py_INCREF(self);
+        return self;
+    }
+
+    if (throttle->name == NULL) {
+        PyErr_SetString(PyExc_TypeError,
+                        "throttle/debounce methods must be defined in the class body, __set_name__ wasn't called");
+        return NULL;
+    }
+
+    dict = PyObject_GetAttrString(obj, "__dict__");
+    if (dict == NULL || !PyDict_Check(dict)) {
+        Py_XDECREF(dict);
+        PyErr_Format(PyExc_TypeError, "no __dict__ on %s instance to keep the throttle state of %R",
+                     Py_TYPE(obj)->tp_name, throttle->name);
+        return NULL;
+    }
+
+    bound = PyDict_GetItemWithError(dict, throttle->name);
+    if (bound != NULL || PyErr_Occurred()) {
+        Py_XINCREF(bound);
+        Py_DECREF(dict);
+        return bound;
+    }
+
+    copy = throttle_copy(throttle);
+    if (copy == NULL) {
+        Py_DECREF(dict);
+        return NULL;
+    }
+
+    bound = PyMethod_New(copy, obj);
+    Py_DECREF(copy);
+    if (bound != NULL && PyDict_SetItem(dict, throttle->name, bound) < 0)
+        Py_CLEAR(bound);
+    Py_DECREF(dict);
+
+    return bound;
+}
+
+
+static PyObject * throttle___set_name__(Throttle *self, PyObject *const *args, Py_ssize_t nargs) {
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "__set_name__ expects owner and name");
+        return NULL;
+    }
+
+    Py_INCREF(args[1]);
+    Py_XSETREF(self->name, args[1]);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * throttle__fire(Throttle *self) {
+    CHECK_THROTTLE_INIT(self);
+
+    self->scheduled = 0;
+
+    if (self->args == NULL)
+        Py_RETURN_NONE;
+
+    /* Debounce was called again, or the cooldown was reset from outside */
+    if (!is_cold(self->cooldown)) {
+        if (throttle_schedule(self) < 0)
+            return NULL;
+        Py_RETURN_NONE;
+    }
+
+    /* The trailing call of a throttle starts a new period */
+    if (!Py_IS_TYPE(self, &debounce_type))
+        reset(self->cooldown, self->cooldown->duration, self->wrap);
+
+    return throttle_flush(self);
+}
+
+
+static PyObject * throttle_flush(Throttle *self) {
+    PyObject *args, *kwargs, *rc;
+
+    CHECK_THROTTLE_INIT(self);
+
+    if (self->args == NULL)
+        Py_RETURN_NONE;
+
+    /* Take the pending call first, func might call us again */
+    args = self->args;
+    kwargs = self->kwargs;
+    self->args = NULL;
+    self->kwargs = NULL;
+
+    rc = PyObject_Call(self->func, args, kwargs);
+    Py_DECREF(args);
+    Py_XDECREF(kwargs);
+
+    return rc;
+}
+
+
+static PyObject * throttle_cancel(Throttle *self) {
+    throttle_clear_pending(self);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * throttle_getter_cooldown(Throttle *self, void *closure) {
+    if (self->cooldown == NULL)
+        Py_RETURN_NONE;
+
+    Py_INCREF(self->cooldown);
+    return (PyObject *)self->cooldown;
+}
+
+
+static PyObject * throttle_getter_pending(Throttle *self, void *closure) {
+    if (self->args != NULL)
+        Py_RETURN_TRUE;
+    else
+        Py_RETURN_FALSE;
+}
+
+
+/*----------------------------------------------------------------------
+      ____            _     _                   _____     _     _
+     / ___|___   ___ | | __| | _____      ___ _|_   _|_ _| |__ | | ___
+    | |   / _ \ / _ \| |/ _` |/ _ \ \ /\ / / '_ \| |/ _` | '_ \| |/ _ \
+    | |__| (_) | (_) | | (_| | (_) \ V  V /| | | | | (_| | |_) | |  __/
+     \____\___/ \___/|_|\__,_|\___/ \_/\_/ |_| |_|_|\__,_|_.__/|_|\___|
+
+----------------------------------------------------------------------*/
+
+/* The table is meant to live in shared memory or an mmap'd file, so it is
+ * a plain C layout of a header followed by the slots.  Deadlines are
+ * absolute nanoseconds of the monotonic clock (CLOCK_MONOTONIC,
+ * QueryPerformanceCounter on Windows), which is the same clock for all
+ * processes on a host.  Updates are atomic, so no locks are needed.
+ *
+ * The atomics use compiler intrinsics, C11 <stdatomic.h> needs extra flags
+ * on MSVC.  Where 64 bit atomics are not lock free, they don't work across
+ * processes, and without a monotonic clock the deadlines can't be shared.
+ * The module still builds there, only CooldownTable() raises
+ * NotImplementedError.
+ */
+#define TABLE_MAGIC 0x31424154444347ULL    /* "GCDTAB1" */
+
+#if defined(_MSC_VER)
+#define TABLE_ATOMICS 1
+#define TABLE_ALIGN8 __declspec(align(8))
+#elif (defined(__GNUC__) || defined(__clang__)) && __GCC_ATOMIC_LLONG_LOCK_FREE == 2
+#define TABLE_ATOMICS 1
+#define TABLE_ALIGN8 __attribute__((aligned(8)))
+#else
+#define TABLE_ATOMICS 0
+#define TABLE_ALIGN8
+#endif
+
+#if defined(_WIN32) || defined(CLOCK_MONOTONIC)
+#define TABLE_SUPPORTED TABLE_ATOMICS
+#else
+#define TABLE_SUPPORTED 0
+#endif
+
+typedef struct table_header {
+    uint64_t magic;
+    uint64_t size;
+} table_header;
+
+typedef struct table_slot {
+    TABLE_ALIGN8 volatile int64_t deadline; /* monotonic ns */
+    TABLE_ALIGN8 volatile int64_t duration; /* ns */
+} table_slot;
+
+typedef struct CooldownTable {
+    PyObject_HEAD
+    Py_buffer view;
+    table_slot *slots;          /* NULL after release() */
+    Py_ssize_t size;
+} CooldownTable;
+
+typedef struct CooldownView {
+    PyObject_HEAD
+    CooldownTable *table;
+    Py_ssize_t index;
+} CooldownView;
+
+static PyTypeObject cooldown_table_type;
+static PyTypeObject cooldown_view_type;
+
+static int64_t monotonic_ns(void);
+static int64_t table_load(volatile int64_t *p);
+static void table_store(volatile int64_t *p, int64_t val);
+static int table_cas(volatile int64_t *p, int64_t *expected, int64_t desired);
+static int64_t seconds_to_ns(double seconds);
+static int table_slot_acquire(table_slot *slot, int64_t now, int64_t duration);
+static table_slot * cooldown_table_slot(CooldownTable *self, Py_ssize_t index);
+static int parse_duration(PyObject *o, int64_t *duration);
+static int parse_index_duration(PyObject *const *args, Py_ssize_t nargs, const char *fname,
+                                Py_ssize_t *index, int64_t *duration);
+
+static int cooldown_table___init__(CooldownTable *self, PyObject *args, PyObject *kwargs);
+static void cooldown_table_dealloc(CooldownTable *self);
+static PyObject * cooldown_table_repr(CooldownTable *self);
+static Py_ssize_t cooldown_table___len__(CooldownTable *self);
+static PyObject * cooldown_table___getitem__(CooldownTable *self, Py_ssize_t index);
+static PyObject * cooldown_table_nbytes(PyObject *cls, PyObject *arg);
+static PyObject * cooldown_table_try_acquire(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_table_try_acquire_many(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_table_reset(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_table_set_cold(CooldownTable *self, PyObject *arg);
+static PyObject * cooldown_table_compare_and_set(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_table_deadline(CooldownTable *self, PyObject *arg);
+static PyObject * cooldown_table_remaining(CooldownTable *self, PyObject *arg);
+static PyObject * cooldown_table_remaining_many(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_table_cold_indices(CooldownTable *self);
+static PyObject * cooldown_table_release(CooldownTable *self);
+
+static void cooldown_view_dealloc(CooldownView *self);
+static PyObject * cooldown_view_repr(CooldownView *self);
+static PyObject * cooldown_view___call__(CooldownView *self, PyObject *args, PyObject *kwargs);
+static int cooldown_view___bool__(CooldownView *self);
+static PyObject * cooldown_view___float__(CooldownView *self);
+static PyObject * cooldown_view_cold(CooldownView *self);
+static PyObject * cooldown_view_hot(CooldownView *self);
+static PyObject * cooldown_view_reset(CooldownView *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_view_set_cold(CooldownView *self);
+static PyObject * cooldown_view_try_acquire(CooldownView *self);
+static PyObject * cooldown_view_getter_duration(CooldownView *self, void *closure);
+static int cooldown_view_setter_duration(CooldownView *self, PyObject *val, void *closure);
+static PyObject * cooldown_view_getter_remaining(CooldownView *self, void *closure);
+static int cooldown_view_setter_remaining(CooldownView *self, PyObject *val, void *closure);
+static PyObject * cooldown_view_getter_temperature(CooldownView *self, void *closure);
+static PyObject * cooldown_view_getter_normalized(CooldownView *self, void *closure);
+static PyObject * cooldown_view_getter_deadline(CooldownView *self, void *closure);
+static PyObject * cooldown_view_getter_index(CooldownView *self, void *closure);
+static PyObject * cooldown_view_getter_table(CooldownView *self, void *closure);
+
+static PySequenceMethods cooldown_table_as_sequence = {
+    .sq_length = (lenfunc)cooldown_table___len__,
+    .sq_item = (ssizeargfunc)cooldown_table___getitem__,
+};
+
+static PyMethodDef cooldown_table_methods_[] = {
+    {"nbytes", (PyCFunction)cooldown_table_nbytes, METH_O | METH_STATIC, NULL},
+    {"try_acquire", (PyCFunction)cooldown_table_try_acquire, METH_FASTCALL, NULL},
+    {"try_acquire_many", (PyCFunction)cooldown_table_try_acquire_many, METH_FASTCALL, NULL},
+    {"reset", (PyCFunction)cooldown_table_reset, METH_FASTCALL, NULL},
+    {"set_cold", (PyCFunction)cooldown_table_set_cold, METH_O, NULL},
+    {"compare_and_set", (PyCFunction)cooldown_table_compare_and_set, METH_FASTCALL, NULL},
+    {"deadline", (PyCFunction)cooldown_table_deadline, METH_O, NULL},
+    {"remaining", (PyCFunction)cooldown_table_remaining, METH_O, NULL},
+    {"remaining_many", (PyCFunction)cooldown_table_remaining_many, METH_FASTCALL, NULL},
+    {"cold_indices", (PyCFunction)cooldown_table_cold_indices, METH_NOARGS, NULL},
+    {"release", (PyCFunction)cooldown_table_release, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyTypeObject cooldown_table_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.CooldownTable",
+    .tp_doc = DOCSTRING_COOLDOWNTABLE,
+    .tp_basicsize = sizeof(CooldownTable),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)cooldown_table___init__,
+    .tp_repr = (reprfunc)cooldown_table_repr,
+    .tp_dealloc = (destructor)cooldown_table_dealloc,
+    .tp_as_sequence = &cooldown_table_as_sequence,
+    .tp_methods = cooldown_table_methods_,
+};
+
+static PyNumberMethods cooldown_view_as_number = {
+    .nb_bool = (inquiry)cooldown_view___bool__,
+    .nb_float = (unaryfunc)cooldown_view___float__,
+};
+
+static PyMethodDef cooldown_view_methods_[] = {
+    {"cold", (PyCFunction)cooldown_view_cold, METH_NOARGS, NULL},
+    {"hot", (PyCFunction)cooldown_view_hot, METH_NOARGS, NULL},
+    {"reset", (PyCFunction)cooldown_view_reset, METH_FASTCALL, NULL},
+    {"set_cold", (PyCFunction)cooldown_view_set_cold, METH_NOARGS, NULL},
+    {"try_acquire", (PyCFunction)cooldown_view_try_acquire, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef cooldown_view_getset_[] = {
+    {"duration", (getter)cooldown_view_getter_duration, (setter)cooldown_view_setter_duration, NULL, NULL},
+    {"remaining", (getter)cooldown_view_getter_remaining, (setter)cooldown_view_setter_remaining, NULL, NULL},
+    {"temperature", (getter)cooldown_view_getter_temperature, NULL, NULL, NULL},
+    {"normalized", (getter)cooldown_view_getter_normalized, NULL, NULL, NULL},
+    {"deadline", (getter)cooldown_view_getter_deadline, NULL, NULL, NULL},
+    {"index", (getter)cooldown_view_getter_index, NULL, NULL, NULL},
+    {"table", (getter)cooldown_view_getter_table, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject cooldown_view_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.CooldownView",
+    .tp_doc = DOCSTRING_COOLDOWNVIEW,
+    .tp_basicsize = sizeof(CooldownView),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_repr = (reprfunc)cooldown_view_repr,
+    .tp_call = (ternaryfunc)cooldown_view___call__,
+    .tp_dealloc = (destructor)cooldown_view_dealloc,
+    .tp_as_number = &cooldown_view_as_number,
+    .tp_methods = cooldown_view_methods_,
+    .tp_getset = cooldown_view_getset_,
+};
+
+
+static int64_t monotonic_ns(void) {
+#if defined(_WIN32)
+    static LARGE_INTEGER freq;
+    LARGE_INTEGER count;
+
+    if (freq.QuadPart == 0)
+        QueryPerformanceFrequency(&freq);
+    QueryPerformanceCounter(&count);
+
+    /* Split, count * 1e9 would overflow */
+    return count.QuadPart / freq.QuadPart * 1000000000
+        + count.QuadPart % freq.QuadPart * 1000000000 / freq.QuadPart;
+#elif defined(CLOCK_MONOTONIC)
+    struct timespec t;
+
+    clock_gettime(CLOCK_MONOTONIC, &t);
+
+    return (int64_t)t.tv_sec * 1000000000 + t.tv_nsec;
+#else
+    /* Not TABLE_SUPPORTED, never called */
+    return 0;
+#endif
+}
+
+
+#if defined(_MSC_VER)
+
+static int64_t table_load(volatile int64_t *p) {
+    return InterlockedCompareExchange64(p, 0, 0);
+}
+
+
+static void table_store(volatile int64_t *p, int64_t val) {
+    InterlockedExchange64(p, val);
+}
+
+
+static int table_cas(volatile int64_t *p, int64_t *expected, int64_t desired) {
+    int64_t old = InterlockedCompareExchange64(p, desired, *expected);
+
+    if (old == *expected)
+        return 1;
+
+    *expected = old;
+    return 0;
+}
+
+#elif TABLE_ATOMICS
+
+static int64_t table_load(volatile int64_t *p) {
+    return __atomic_load_n(p, __ATOMIC_SEQ_CST);
+}
+
+
+static void table_store(volatile int64_t *p, int64_t val) {
+    __atomic_store_n(p, val, __ATOMIC_SEQ_CST);
+}
+
+
+static int table_cas(volatile int64_t *p, int64_t *expected, int64_t desired) {
+    return __atomic_compare_exchange_n(p, expected, desired, 0, __ATOMIC_SEQ_CST, __ATOMIC_SEQ_CST);
+}
+
+#else
+
+/* Not TABLE_SUPPORTED, CooldownTable() refuses to work, so these are
+ * never called */
+static int64_t table_load(volatile int64_t *p) {
+    return *p;
+}
+
+
+static void table_store(volatile int64_t *p, int64_t val) {
+    *p = val;
+}
+
+
+static int table_cas(volatile int64_t *p, int64_t *expected, int64_t desired) {
+    if (*p != *expected) {
+        *expected = *p;
+        return 0;
+    }
+
+    *p = desired;
+    return 1;
+}
+
+#endif
+
+
+static int64_t seconds_to_ns(double seconds) {
+    return (int64_t)llround(seconds * 1e9);
+}
+
+
+/* Start the cooldown, if it is cold.  The check and the update are one
+ * compare and set, so only one process can win a cold slot. */
+static int table_slot_acquire(table_slot *slot, int64_t now, int64_t duration) {
+    int64_t deadline = table_load(&slot->deadline);
+
+    do {
+        if (now < deadline)
+            return 0;
+    } while (!table_cas(&slot->deadline, &deadline, now + duration));
+
+    table_store(&slot->duration, duration);
+    return 1;
+}
+
+
+static table_slot * cooldown_table_slot(CooldownTable *self, Py_ssize_t index) {
+    if (self->slots == NULL) {
+        PyErr_SetString(PyExc_ValueError, "CooldownTable is released or not initialized");
+        return NULL;
+    }
+
+    if (index < 0)
+        index += self->size;
+    if (index < 0 || index >= self->size) {
+        PyErr_SetString(PyExc_IndexError, "CooldownTable index out of range");
+        return NULL;
+    }
+
+    return self->slots + index;
+}
+
+
+#define CHECK_TABLE(self) \
+    if ((self)->slots == NULL) { \
+        PyErr_SetString(PyExc_ValueError, "CooldownTable is released or not initialized"); \
+        return NULL; \
+    }
+
+/* Parse an optional duration in seconds, None gives -1 for the stored one */
+static int parse_duration(PyObject *o, int64_t *duration) {
+    double seconds;
+
+    *duration = -1;
+    if (o == Py_None)
+        return 0;
+
+    seconds = PyFloat_AsDouble(o);
+    if (PyErr_Occurred())
+        return -1;
+
+    if (seconds < 0) {
+        PyErr_SetString(PyExc_ValueError, "duration must not be negative");
+        return -1;
+    }
+
+    *duration = seconds_to_ns(seconds);
+    return 0;
+}
+
+
+/* Parse `(index, duration=None)` */
+static int parse_index_duration(PyObject *const *args, Py_ssize_t nargs, const char *fname,
+                                Py_ssize_t *index, int64_t *duration) {
+    if (nargs < 1 || nargs > 2) {
+        PyErr_Format(PyExc_TypeError, "%s expects an index and an optional duration", fname);
+        return -1;
+    }
+
+    *index = PyNumber_AsSsize_t(args[0], PyExc_IndexError);
+    if (*index == -1 && PyErr_Occurred())
+        return -1;
+
+    return parse_duration(nargs == 2 ? args[1] : Py_None, duration);
+}
+
+
+static int cooldown_table___init__(CooldownTable *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"buffer", "create", "duration", NULL};
+    PyObject *buffer;
+    int create = 0;
+    double duration = 0.0;
+    table_header *header;
+    Py_ssize_t size;
+    int64_t now;
+
+    if (!TABLE_SUPPORTED) {
+        PyErr_SetString(PyExc_NotImplementedError,
+                        "CooldownTable needs lock free 64 bit atomics and a monotonic clock");
+        return -1;
+    }
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "O|p$d", kwargslist,
+                &buffer, &create, &duration))
+        return -1;
+
+    if (duration < 0) {
+        PyErr_SetString(PyExc_ValueError, "duration must not be negative");
+        return -1;
+    }
+
+    if (self->slots != NULL) {
+        PyBuffer_Release(&self->view);
+        self->slots = NULL;
+    }
+
+    if (PyObject_GetBuffer(buffer, &self->view, PyBUF_WRITABLE) < 0)
+        return -1;
+
+    if ((uintptr_t)self->view.buf % 8 != 0) {
+        PyErr_SetString(PyExc_ValueError, "buffer is not aligned to 8 bytes");
+        goto ERROR;
+    }
+
+    header = self->view.buf;
+    if ((size_t)self->view.len < sizeof(table_header)) {
+        PyErr_SetString(PyExc_ValueError, "buffer too small for a CooldownTable");
+        goto ERROR;
+    }
+
+    size = (self->view.len - sizeof(table_header)) / sizeof(table_slot);
+    if (create) {
+        table_slot *slots = (table_slot *)(header + 1);
+
+        now = monotonic_ns();
+        for (Py_ssize_t i = 0; i < size; ++i) {
+            table_store(&slots[i].deadline, now);
+            table_store(&slots[i].duration, seconds_to_ns(duration));
+        }
+        header->size = size;
+        header->magic = TABLE_MAGIC;
+    } else if (header->magic != TABLE_MAGIC) {
+        PyErr_SetString(PyExc_ValueError, "buffer does not contain a CooldownTable");
+        goto ERROR;
+    } else if (header->size > (uint64_t)size) {
+        PyErr_SetString(PyExc_ValueError, "buffer is smaller than the CooldownTable in it");
+        goto ERROR;
+    }
+
+    self->size = header->size;
+    self->slots = (table_slot *)(header + 1);
+    return 0;
+
+ERROR:
+    PyBuffer_Release(&self->view);
+    return -1;
+}
+
+
+static void cooldown_table_dealloc(CooldownTable *self) {
+    if (self->slots != NULL)
+        PyBuffer_Release(&self->view);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * cooldown_table_repr(CooldownTable *self) {
+    return PyUnicode_FromFormat("CooldownTable(size=%zd%s) at %p",
+                                self->size, self->slots ? "" : ", released", self);
+}
+
+
+static Py_ssize_t cooldown_table___len__(CooldownTable *self) {
+    return self->size;
+}
+
+
+static PyObject * cooldown_table___getitem__(CooldownTable *self, Py_ssize_t index) {
+    CooldownView *view;
+
+    if (cooldown_table_slot(self, index) == NULL)
+        return NULL;
+
+    view = PyObject_New(CooldownView, &cooldown_view_type);
+    if (view == NULL)
+        return NULL;
+
+    Py_INCREF(self);
+    view->table = self;
+    view->index = index < 0 ? index + self->size : index;
+
+    return (PyObject *)view;
+}
+
+
+static PyObject * cooldown_table_nbytes(PyObject *cls, PyObject *arg) {
+    Py_ssize_t size = PyNumber_AsSsize_t(arg, PyExc_OverflowError);
+
+    if (size == -1 && PyErr_Occurred())
+        return NULL;
+    if (size < 0) {
+        PyErr_SetString(PyExc_ValueError, "size must not be negative");
+        return NULL;
+    }
+
+    return PyLong_FromSsize_t(sizeof(table_header) + size * sizeof(table_slot));
+}
+
+
+static PyObject * cooldown_table_try_acquire(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs) {
+    Py_ssize_t index;
+    int64_t duration;
+    table_slot *slot;
+
+    if (parse_index_duration(args, nargs, "try_acquire", &index, &duration) < 0)
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    if (duration < 0)
+        duration = table_load(&slot->duration);
+
+    return PyBool_FromLong(table_slot_acquire(slot, monotonic_ns(), duration));
+}
+
+
+static PyObject * cooldown_table_try_acquire_many(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *indices, *result;
+    Py_ssize_t len, index;
+    int64_t duration, now;
+    table_slot *slot;
+
+    if (nargs < 1 || nargs > 2) {
+        PyErr_SetString(PyExc_TypeError, "try_acquire_many expects indices and an optional duration");
+        return NULL;
+    }
+
+    if (parse_duration(nargs == 2 ? args[1] : Py_None, &duration) < 0)
+        return NULL;
+
+    indices = PySequence_Fast(args[0], "try_acquire_many expects an iterable of indices");
+    if (indices == NULL)
+        return NULL;
+
+    len = PySequence_Fast_GET_SIZE(indices);
+    result = PyList_New(len);
+    if (result == NULL)
+        goto ERROR;
+
+    now = monotonic_ns();
+    for (Py_ssize_t i = 0; i < len; ++i) {
+        index = PyNumber_AsSsize_t(PySequence_Fast_GET_ITEM(indices, i), PyExc_IndexError);
+        if (index == -1 && PyErr_Occurred())
+            goto ERROR;
+
+        slot = cooldown_table_slot(self, index);
+        if (slot == NULL)
+            goto ERROR;
+
+        PyList_SET_ITEM(result, i, PyBool_FromLong(
+                    table_slot_acquire(slot, now, duration < 0 ? table_load(&slot->duration) : duration)));
+    }
+
+    Py_DECREF(indices);
+    return result;
+
+ERROR:
+    Py_DECREF(indices);
+    Py_XDECREF(result);
+    return NULL;
+}
+
+
+static PyObject * cooldown_table_reset(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs) {
+    Py_ssize_t index;
+    int64_t duration;
+    table_slot *slot;
+
+    if (parse_index_duration(args, nargs, "reset", &index, &duration) < 0)
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    if (duration < 0)
+        duration = table_load(&slot->duration);
+    else
+        table_store(&slot->duration, duration);
+    table_store(&slot->deadline, monotonic_ns() + duration);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * cooldown_table_set_cold(CooldownTable *self, PyObject *arg) {
+    Py_ssize_t index = PyNumber_AsSsize_t(arg, PyExc_IndexError);
+    table_slot *slot;
+
+    if (index == -1 && PyErr_Occurred())
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    table_store(&slot->deadline, monotonic_ns());
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * cooldown_table_compare_and_set(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs) {
+    Py_ssize_t index;
+    long long expected, deadline;
+    table_slot *slot;
+
+    if (nargs != 3) {
+        PyErr_SetString(PyExc_TypeError, "compare_and_set expects index, expected and new deadline");
+        return NULL;
+    }
+
+    index = PyNumber_AsSsize_t(args[0], PyExc_IndexError);
+    if (index == -1 && PyErr_Occurred())
+        return NULL;
+
+    expected = PyLong_AsLongLong(args[1]);
+    if (expected == -1 && PyErr_Occurred())
+        return NULL;
+
+    deadline = PyLong_AsLongLong(args[2]);
+    if (deadline == -1 && PyErr_Occurred())
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    {
+        int64_t current = expected;
+        return PyBool_FromLong(table_cas(&slot->deadline, &current, deadline));
+    }
+}
+
+
+static PyObject * cooldown_table_deadline(CooldownTable *self, PyObject *arg) {
+    Py_ssize_t index = PyNumber_AsSsize_t(arg, PyExc_IndexError);
+    table_slot *slot;
+
+    if (index == -1 && PyErr_Occurred())
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    return PyLong_FromLongLong(table_load(&slot->deadline));
+}
+
+
+static PyObject * cooldown_table_remaining(CooldownTable *self, PyObject *arg) {
+    Py_ssize_t index = PyNumber_AsSsize_t(arg, PyExc_IndexError);
+    table_slot *slot;
+
+    if (index == -1 && PyErr_Occurred())
+        return NULL;
+
+    slot = cooldown_table_slot(self, index);
+    if (slot == NULL)
+        return NULL;
+
+    return PyFloat_FromDouble(MAX(0, table_load(&slot->deadline) - monotonic_ns()) / 1e9);
+}
+
+
+static PyObject * cooldown_table_remaining_many(CooldownTable *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *indices = NULL, *result = NULL;
+    Py_ssize_t len, index;
+    table_slot *slot;
+    int64_t now;
+
+    if (nargs > 1) {
+        PyErr_SetString(PyExc_TypeError, "remaining_many expects an optional iterable of indices");
+        return NULL;
+    }
+
+    CHECK_TABLE(self);
+
+    now = monotonic_ns();
+
+    /* Without indices, return the whole table */
+    if (nargs == 0 || args[0] == Py_None) {
+        result = PyList_New(self->size);
+        if (result == NULL)
+            return NULL;
+
+        for (Py_ssize_t i = 0; i < self->size; ++i) {
+            double remaining = MAX(0, table_load(&self->slots[i].deadline) - now) / 1e9;
+            PyObject *val = PyFloat_FromDouble(remaining);
+            if (val == NULL) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            PyList_SET_ITEM(result, i, val);
+        }
+
+        return result;
+    }
+
+    indices = PySequence_Fast(args[0], "remaining_many expects an iterable of indices");
+    if (indices == NULL)
+        return NULL;
+
+    len = PySequence_Fast_GET_SIZE(indices);
+    result = PyList_New(len);
+    if (result == NULL)
+        goto ERROR;
+
+    for (Py_ssize_t i = 0; i < len; ++i) {
+        PyObject *val;
+
+        index = PyNumber_AsSsize_t(PySequence_Fast_GET_ITEM(indices, i), PyExc_IndexError);
+        if (index == -1 && PyErr_Occurred())
+            goto ERROR;
+
+        slot = cooldown_table_slot(self, index);
+        if (slot == NULL)
+            goto ERROR;
+
+        val = PyFloat_FromDouble(MAX(0, table_load(&slot->deadline) - now) / 1e9);
+        if (val == NULL)
+            goto ERROR;
+        PyList_SET_ITEM(result, i, val);
+    }
+
+    Py_DECREF(indices);
+    return result;
+
+ERROR:
+    Py_DECREF(indices);
+    Py_XDECREF(result);
+    return NULL;
+}
+
+
+static PyObject * cooldown_table_cold_indices(CooldownTable *self) {
+    PyObject *result, *index;
+    int64_t now;
+
+    CHECK_TABLE(self);
+
+    result = PyList_New(0);
+    if (result == NULL)
+        return NULL;
+
+    now = monotonic_ns();
+    for (Py_ssize_t i = 0; i < self->size; ++i) {
+        if (table_load(&self->slots[i].deadline) > now)
+            continue;
+
+        index = PyLong_FromSsize_t(i);
+        if (index == NULL || PyList_Append(result, index) < 0) {
+            Py_XDECREF(index);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(index);
+    }
+
+    return result;
+}
+
+
+static PyObject * cooldown_table_release(CooldownTable *self) {
+    if (self->slots != NULL) {
+        PyBuffer_Release(&self->view);
+        self->slots = NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
+
+static void cooldown_view_dealloc(CooldownView *self) {
+    Py_XDECREF(self->table);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+/* Access the slot of a view, raises if the table has been released */
+#define VIEW_SLOT(self, slot) \
+    table_slot *slot = cooldown_table_slot((self)->table, (self)->index); \
+    if (slot == NULL)
+
+
+static PyObject * cooldown_view_repr(CooldownView *self) {
+    return PyUnicode_FromFormat("CooldownView(%R, %zd) at %p", self->table, self->index, self);
+}
+
+
+static PyObject * cooldown_view___call__(CooldownView *self, PyObject *args, PyObject *kwargs) {
+    return cooldown_view_getter_remaining(self, NULL);
+}
+
+
+static int cooldown_view___bool__(CooldownView *self) {
+    VIEW_SLOT(self, slot)
+        return -1;
+
+    return table_load(&slot->deadline) > monotonic_ns();
+}
+
+
+static PyObject * cooldown_view___float__(CooldownView *self) {
+    return cooldown_view_getter_temperature(self, NULL);
+}
+
+
+static PyObject * cooldown_view_cold(CooldownView *self) {
+    int hot = cooldown_view___bool__(self);
+
+    return hot < 0 ? NULL : PyBool_FromLong(!hot);
+}
+
+
+static PyObject * cooldown_view_hot(CooldownView *self) {
+    int hot = cooldown_view___bool__(self);
+
+    return hot < 0 ? NULL : PyBool_FromLong(hot);
+}
+
+
+static PyObject * cooldown_view_reset(CooldownView *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *index, *rc;
+    PyObject *argv[2];
+
+    if (nargs > 1) {
+        PyErr_SetString(PyExc_TypeError, "reset expects an optional duration");
+        return NULL;
+    }
+
+    index = PyLong_FromSsize_t(self->index);
+    if (index == NULL)
+        return NULL;
+
+    argv[0] = index;
+    argv[1] = nargs ? args[0] : Py_None;
+    rc = cooldown_table_reset(self->table, argv, 2);
+    Py_DECREF(index);
+
+    return rc;
+}
+
+
+static PyObject * cooldown_view_set_cold(CooldownView *self) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    table_store(&slot->deadline, monotonic_ns());
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * cooldown_view_try_acquire(CooldownView *self) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    return PyBool_FromLong(table_slot_acquire(slot, monotonic_ns(), table_load(&slot->duration)));
+}
+
+
+static PyObject * cooldown_view_getter_duration(CooldownView *self, void *closure) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    return PyFloat_FromDouble(table_load(&slot->duration) / 1e9);
+}
+
+
+static int cooldown_view_setter_duration(CooldownView *self, PyObject *val, void *closure) {
+    double duration;
+
+    if (val == NULL) {
+        PyErr_SetString(PyExc_TypeError, "Cannot delete the duration attribute");
+        return -1;
+    }
+
+    duration = PyFloat_AsDouble(val);
+    if (PyErr_Occurred())
+        return -1;
+    if (duration < 0) {
+        PyErr_SetString(PyExc_ValueError, "duration must not be negative");
+        return -1;
+    }
+
+    VIEW_SLOT(self, slot)
+        return -1;
+
+    table_store(&slot->duration, seconds_to_ns(duration));
+    return 0;
+}
+
+
+static PyObject * cooldown_view_getter_remaining(CooldownView *self, void *closure) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    return PyFloat_FromDouble(MAX(0, table_load(&slot->deadline) - monotonic_ns()) / 1e9);
+}
+
+
+static int cooldown_view_setter_remaining(CooldownView *self, PyObject *val, void *closure) {
+    double remaining;
+
+    if (val == NULL) {
+        PyErr_SetString(PyExc_TypeError, "Cannot delete the remaining attribute");
+        return -1;
+    }
+
+    remaining = PyFloat_AsDouble(val);
+    if (PyErr_Occurred())
+        return -1;
+
+    VIEW_SLOT(self, slot)
+        return -1;
+
+    table_store(&slot->deadline, monotonic_ns() + seconds_to_ns(MAX(0, remaining)));
+    return 0;
+}
+
+
+static PyObject * cooldown_view_getter_temperature(CooldownView *self, void *closure) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    return PyFloat_FromDouble((table_load(&slot->deadline) - monotonic_ns()) / 1e9);
+}
+
+
+static PyObject * cooldown_view_getter_normalized(CooldownView *self, void *closure) {
+    int64_t duration, remaining;
+
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    duration = table_load(&slot->duration);
+    remaining = MAX(0, table_load(&slot->deadline) - monotonic_ns());
+    if (duration == 0)
+        return PyFloat_FromDouble(0.0);
+
+    return PyFloat_FromDouble(1.0 - MIN(1.0, (double)remaining / duration));
+}
+
+
+static PyObject * cooldown_view_getter_deadline(CooldownView *self, void *closure) {
+    VIEW_SLOT(self, slot)
+        return NULL;
+
+    return PyLong_FromLongLong(table_load(&slot->deadline));
+}
+
+
+static PyObject * cooldown_view_getter_index(CooldownView *self, void *closure) {
+    return PyLong_FromSsize_t(self->index);
+}
+
+
+static PyObject * cooldown_view_getter_table(CooldownView *self, void *closure) {
+    Py_INCREF(self->table);
+    return (PyObject *)self->table;
+}
+
+
+/*----------------------------------------------------------------------
+     ____            _     _
+    |  _ \ ___  __ _(_)___| |_ _ __ _   _
+    | |_) / _ \/ _` | / __| __| '__| | | |
+    |  _ <  __/ (_| | \__ \ |_| |  | |_| |
+    |_| \_\___|\__, |_|___/\__|_|   \__, |
+               |___/                |___/
+----------------------------------------------------------------------*/
+
+/* Watched cooldowns are kept in a binary heap ordered by deadline.  Every
+ * cooldown knows its registry and heap position, and all functions that
+ * change a cooldown's deadline call cooldown_rekey(), so the heap is always
+ * exact and poll() only needs to look at the top.
+ */
+
+typedef struct registry_entry {
+    double deadline;    /* Relative to the registry's t0, INFINITY if idle */
+    unsigned long long seq;
+    Cooldown *cooldown;
+    PyObject *callback;
+    int fired;          /* Cold and already reported */
+} registry_entry;
+
+typedef struct CooldownRegistry {
+    PyObject_HEAD
+    struct timespec t0;
+    registry_entry *heap;
+    Py_ssize_t len;
+    Py_ssize_t capacity;
+    unsigned long long seq;
+} CooldownRegistry;
+
+static PyTypeObject cooldown_registry_type;
+
+static double registry_deadline(CooldownRegistry *self, Cooldown *cooldown);
+static int registry_less(registry_entry *a, registry_entry *b);
+static void registry_swap(CooldownRegistry *self, Py_ssize_t i, Py_ssize_t j);
+static void registry_sift(CooldownRegistry *self, Py_ssize_t i);
+static void registry_rekey(CooldownRegistry *self, Py_ssize_t i);
+static void registry_remove(CooldownRegistry *self, Py_ssize_t i);
+
+static int cooldown_registry___init__(CooldownRegistry *self, PyObject *args, PyObject *kwargs);
+static int cooldown_registry_traverse(CooldownRegistry *self, visitproc visit, void *arg);
+static int cooldown_registry_clear(CooldownRegistry *self);
+static void cooldown_registry_dealloc(CooldownRegistry *self);
+static PyObject * cooldown_registry_repr(CooldownRegistry *self);
+static Py_ssize_t cooldown_registry___len__(CooldownRegistry *self);
+static int cooldown_registry___contains__(CooldownRegistry *self, PyObject *cooldown);
+static PyObject * cooldown_registry_watch(CooldownRegistry *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * cooldown_registry_unwatch(CooldownRegistry *self, PyObject *cooldown);
+static PyObject * cooldown_registry_poll(CooldownRegistry *self);
+static PyObject * cooldown_registry_time_until_next(CooldownRegistry *self);
+static PyObject * cooldown_registry_py_clear(CooldownRegistry *self);
+
+static PySequenceMethods cooldown_registry_as_sequence = {
+    .sq_length = (lenfunc)cooldown_registry___len__,
+    .sq_contains = (objobjproc)cooldown_registry___contains__,
+};
+
+static PyMethodDef cooldown_registry_methods_[] = {
+    {"watch", (PyCFunction)cooldown_registry_watch, METH_FASTCALL, NULL},
+    {"unwatch", (PyCFunction)cooldown_registry_unwatch, METH_O, NULL},
+    {"poll", (PyCFunction)cooldown_registry_poll, METH_NOARGS, NULL},
+    {"time_until_next", (PyCFunction)cooldown_registry_time_until_next, METH_NOARGS, NULL},
+    {"clear", (PyCFunction)cooldown_registry_py_clear, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyTypeObject cooldown_registry_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.CooldownRegistry",
+    .tp_doc = DOCSTRING_COOLDOWNREGISTRY,
+    .tp_basicsize = sizeof(CooldownRegistry),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)cooldown_registry___init__,
+    .tp_traverse = (traverseproc)cooldown_registry_traverse,
+    .tp_clear = (inquiry)cooldown_registry_clear,
+    .tp_dealloc = (destructor)cooldown_registry_dealloc,
+    .tp_repr = (reprfunc)cooldown_registry_repr,
+    .tp_as_sequence = &cooldown_registry_as_sequence,
+    .tp_methods = cooldown_registry_methods_,
+};
+
+
+static void cooldown_rekey(Cooldown *self) {
+    if (self->registry != NULL)
+        registry_rekey(self->registry, self->registry_index);
+
+    if (self->jobs != NULL)
+        crond_rekey(self->jobs);
+}
+
+
+static double registry_deadline(CooldownRegistry *self, Cooldown *cooldown) {
+    if (cooldown->paused)
+        return Py_HUGE_VAL;
+
+    return diff_timespec(&self->t0, &cooldown->t0) + cooldown->duration;
+}
+
+
+static int registry_less(registry_entry *a, registry_entry *b) {
+    return a->deadline < b->deadline || (a->deadline == b->deadline && a->seq < b->seq);
+}
+
+
+static void registry_swap(CooldownRegistry *self, Py_ssize_t i, Py_ssize_t j) {
+    registry_entry tmp = self->heap[i];
+
+    self->heap[i] = self->heap[j];
+    self->heap[j] = tmp;
+    self->heap[i].cooldown->registry_index = i;
+    self->heap[j].cooldown->registry_index = j;
+}
+
+
+/* Move entry i up or down to its place */
+static void registry_sift(CooldownRegistry *self, Py_ssize_t i) {
+    registry_entry *heap = self->heap;
+    Py_ssize_t parent, child;
+
+    while (i > 0) {
+        parent = (i - 1) / 2;
+        if (!registry_less(&heap[i], &heap[parent]))
+            break;
+        registry_swap(self, i, parent);
+        i = parent;
+    }
+
+    while ((child = 2 * i + 1) < self->len) {
+        if (child + 1 < self->len && registry_less(&heap[child + 1], &heap[child]))
+            ++child;
+        if (!registry_less(&heap[child], &heap[i]))
+            break;
+        registry_swap(self, i, child);
+        i = child;
+    }
+}
+
+
+static void registry_rekey(CooldownRegistry *self, Py_ssize_t i) {
+    registry_entry *entry = &self->heap[i];
+    double deadline = registry_deadline(self, entry->cooldown);
+
+    /* Only a cooldown that is hot again can go cold again */
+    if (entry->fired && deadline <= current_delta(&self->t0))
+        return;
+
+    entry->fired = 0;
+    entry->deadline = deadline;
+    registry_sift(self, i);
+}
+
+
+static void registry_remove(CooldownRegistry *self, Py_ssize_t i) {
+    registry_entry entry = self->heap[i];
+
+    --self->len;
+    if (i != self->len) {
+        self->heap[i] = self->heap[self->len];
+        self->heap[i].cooldown->registry_index = i;
+        registry_sift(self, i);
+    }
+
+    entry.cooldown->registry = NULL;
+    Py_DECREF(entry.cooldown);
+    Py_DECREF(entry.callback);
+}
+
+
+static int cooldown_registry___init__(CooldownRegistry *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "", kwargslist))
+        return -1;
+
+    cooldown_registry_clear(self);
+    timespec_get(&self->t0, TIME_UTC);
+
+    return 0;
+}
+
+
+static int cooldown_registry_traverse(CooldownRegistry *self, visitproc visit, void *arg) {
+    for (Py_ssize_t i = 0; i < self->len; ++i) {
+        Py_VISIT(self->heap[i].cooldown);
+        Py_VISIT(self->heap[i].callback);
+    }
+
+    return 0;
+}
+
+
+static int cooldown_registry_clear(CooldownRegistry *self) {
+    while (self->len)
+        registry_remove(self, self->len - 1);
+
+    return 0;
+}
+
+
+static void cooldown_registry_dealloc(CooldownRegistry *self) {
+    PyObject_GC_UnTrack(self);
+    cooldown_registry_clear(self);
+    PyMem_Free(self->heap);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * cooldown_registry_repr(CooldownRegistry *self) {
+    return PyUnicode_FromFormat("CooldownRegistry(len=%zd) at %p", self->len, self);
+}
+
+
+static Py_ssize_t cooldown_registry___len__(CooldownRegistry *self) {
+    return self->len;
+}
+
+
+static int cooldown_registry___contains__(CooldownRegistry *self, PyObject *cooldown) {
+    return is_cooldown(cooldown) && ((Cooldown *)cooldown)->registry == self;
+}
+
+
+static PyObject * cooldown_registry_watch(CooldownRegistry *self, PyObject *const *args, Py_ssize_t nargs) {
+    registry_entry *entry;
+    Cooldown *cooldown;
+    PyObject *callback;
+
+    if (nargs != 2) {
+        PyErr_SetString(PyExc_TypeError, "watch expects a cooldown and a callback");
+        return NULL;
+    }
+
+    if (!is_cooldown(args[0])) {
+        if (reject_pure_cooldown(args[0], "CooldownRegistry") == 0)
+            PyErr_SetString(PyExc_TypeError, "only Cooldowns can be watched");
+        return NULL;
+    }
+    cooldown = (Cooldown *)args[0];
+
+    callback = args[1];
+    if (!PyCallable_Check(callback)) {
+        PyErr_SetString(PyExc_TypeError, "callback must be callable");
+        return NULL;
+    }
+
+    /* Watching again only replaces the callback */
+    if (cooldown->registry == self) {
+        Py_INCREF(callback);
+        Py_SETREF(self->heap[cooldown->registry_index].callback, callback);
+        Py_RETURN_NONE;
+    }
+
+    if (cooldown->registry != NULL) {
+        PyErr_SetString(PyExc_ValueError, "cooldown is already watched by another registry");
+        return NULL;
+    }
+
+    if (self->len == self->capacity) {
+        Py_ssize_t capacity = self->capacity ? self->capacity * 2 : 16;
+        registry_entry *heap = PyMem_Realloc(self->heap, capacity * sizeof(registry_entry));
+
+        if (heap == NULL)
+            return PyErr_NoMemory();
+
+        self->heap = heap;
+        self->capacity = capacity;
+    }
+
+    entry = &self->heap[self->len];
+    entry->deadline = registry_deadline(self, cooldown);
+    entry->seq = self->seq++;
+    entry->fired = 0;
+    Py_INCREF(cooldown);
+    entry->cooldown = cooldown;
+    Py_INCREF(callback);
+    entry->callback = callback;
+
+    /* A cooldown that is already cold didn't cross zero while watched */
+    if (entry->deadline <= current_delta(&self->t0)) {
+        entry->deadline = Py_HUGE_VAL;
+        entry->fired = 1;
+    }
+
+    cooldown->registry = self;
+    cooldown->registry_index = self->len++;
+    registry_sift(self, cooldown->registry_index);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * cooldown_registry_unwatch(CooldownRegistry *self, PyObject *cooldown) {
+    if (!cooldown_registry___contains__(self, cooldown))
+        Py_RETURN_FALSE;
+
+    registry_remove(self, ((Cooldown *)cooldown)->registry_index);
+    Py_RETURN_TRUE;
+}
+
+
+static PyObject * cooldown_registry_poll(CooldownRegistry *self) {
+    PyObject *fired = NULL;
+    Py_ssize_t count = 0;
+    registry_entry *top;
+    double now;
+
+    now = current_delta(&self->t0);
+
+    /* Collect first, the callbacks may change the heap */
+    while (self->len && self->heap[0].deadline <= now) {
+        PyObject *pair;
+
+        top = &self->heap[0];
+        if (fired == NULL && (fired = PyList_New(0)) == NULL)
+            return NULL;
+
+        pair = PyTuple_Pack(2, top->callback, top->cooldown);
+        if (pair == NULL || PyList_Append(fired, pair) < 0) {
+            Py_XDECREF(pair);
+            Py_DECREF(fired);
+            return NULL;
+        }
+        Py_DECREF(pair);
+
+        top->fired = 1;
+        top->deadline = Py_HUGE_VAL;
+        registry_sift(self, 0);
+    }
+
+    if (fired == NULL)
+        return PyLong_FromLong(0);
+
+    count = PyList_GET_SIZE(fired);
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        PyObject *pair = PyList_GET_ITEM(fired, i);
+        PyObject *rc = PyObject_CallOneArg(PyTuple_GET_ITEM(pair, 0), PyTuple_GET_ITEM(pair, 1));
+
+        if (rc == NULL) {
+            Py_DECREF(fired);
+            return NULL;
+        }
+        Py_DECREF(rc);
+    }
+
+    Py_DECREF(fired);
+    return PyLong_FromSsize_t(count);
+}
+
+
+static PyObject * cooldown_registry_time_until_next(CooldownRegistry *self) {
+    if (self->len == 0)
+        return PyFloat_FromDouble(Py_HUGE_VAL);
+
+    return PyFloat_FromDouble(MAX(0.0, self->heap[0].deadline - current_delta(&self->t0)));
+}
+
+
+static PyObject * cooldown_registry_py_clear(CooldownRegistry *self) {
+    cooldown_registry_clear(self);
+    Py_RETURN_NONE;
+}
+
+
+/*----------------------------------------------------------------------
+      ____                 ____
+     / ___|_ __ ___  _ __ |  _ \
+    | |   | '__/ _ \| '_ \| | | |
+    | |___| | | (_) | | | | |_| |
+     \____|_|  \___/|_| |_|____/
+
+----------------------------------------------------------------------*/
+
+/* Jobs are kept in a binary heap of (deadline, seq, job) entries.  The
+ * deadline is calculated from the job's cooldown, relative to the crond's
+ * t0, so update() only compares doubles and never calls into python for
+ * jobs that are not due.  Like in the CooldownRegistry, a cooldown knows the
+ * jobs in a heap that use it, a list since jobs can share a cooldown, and
+ * cooldown_rekey() updates their deadlines whenever the cooldown changes.
+ *
+ * Every priority lane has its own heap.  update() collects the due jobs
+ * lane by lane, so more important jobs run first.  Once the `max_jobs`
+ * budget of an update is used up, the due jobs of the lanes after the
+ * first are deferred, i.e. left in their heap, or shed.
+ *
+ * Jitter and spread are kept in the job as an offset to its deadline, the
+ * cooldown belongs to the caller and might be shared.  After the delayed
+ * first run, a repeating job restarts its cooldown from there instead of
+ * wrapping, so the offset phase sticks and the period is unchanged.
+ */
+
+typedef struct CronD CronD;
+
+typedef struct Cronjob {
+    PyObject_HEAD
+    Cooldown *cooldown;
+    PyObject *task;
+    int repeat;
+    CronD *crond;           /* Borrowed, set while the job is scheduled */
+    Py_ssize_t lane;
+    Py_ssize_t index;       /* Position in the heap, -1 while running */
+    struct Cronjob *next;   /* Next job in the heap using the same cooldown */
+    double offset;          /* jitter/spread of the first run */
+} Cronjob;
+
+typedef struct crond_entry {
+    double deadline;
+    unsigned long long seq;
+    Cronjob *job;
+} crond_entry;
+
+typedef struct crond_lane {
+    crond_entry *heap;
+    Py_ssize_t len;
+    Py_ssize_t capacity;
+    unsigned long long due; /* Counters for stats */
+    unsigned long long run;
+    unsigned long long deferred;
+    unsigned long long shed;
+} crond_lane;
+
+struct CronD {
+    PyObject_HEAD
+    struct timespec t0;
+    crond_lane *lanes;
+    Py_ssize_t n_lanes;
+    Py_ssize_t len;         /* Jobs in all lanes */
+    unsigned long long seq;
+    Py_ssize_t max_jobs;    /* Per update, -1 for no limit */
+    int shed;
+    double jitter;          /* Default offsets for add() */
+    double spread;
+    unsigned long long rng; /* splitmix64 state */
+    unsigned long long spread_count;
+};
+
+static PyTypeObject cronjob_type;
+static PyTypeObject crond_type;
+
+#define is_cronjob(o) (PyType_IsSubtype(Py_TYPE(o), &cronjob_type))
+
+static int crond_less(crond_entry *a, crond_entry *b);
+static void crond_swap(crond_lane *lane, Py_ssize_t i, Py_ssize_t j);
+static void crond_sift(crond_lane *lane, Py_ssize_t i);
+static int crond_push(CronD *self, Cronjob *job);
+static Cronjob * crond_pop(CronD *self, crond_lane *lane, Py_ssize_t i);
+static double crond_deadline(CronD *self, Cronjob *job);
+static void crond_rearm(Cronjob *job);
+static void crond_unlink(Cronjob *job);
+static Py_ssize_t crond_count_due(crond_lane *lane, Py_ssize_t i, double now);
+static int crond_overload(CronD *self, crond_lane *lane, double now);
+static void crond_free_lanes(CronD *self);
+static double crond_random(CronD *self);
+static void crond_offset(CronD *self, Cronjob *job, double jitter, double spread);
+static int crond_take_kwarg(PyObject *kwargs, const char *name, double *val);
+
+static int cronjob___init__(Cronjob *self, PyObject *args, PyObject *kwargs);
+static int cronjob_traverse(Cronjob *self, visitproc visit, void *arg);
+static int cronjob_clear(Cronjob *self);
+static void cronjob_dealloc(Cronjob *self);
+static PyObject * cronjob_repr(Cronjob *self);
+static PyObject * cronjob___call__(Cronjob *self, PyObject *args, PyObject *kwargs);
+static PyObject * cronjob_getter_cooldown(Cronjob *self, void *closure);
+static PyObject * cronjob_getter_task(Cronjob *self, void *closure);
+static int cronjob_setter_task(Cronjob *self, PyObject *val, void *closure);
+static PyObject * cronjob_getter_repeat(Cronjob *self, void *closure);
+static int cronjob_setter_repeat(Cronjob *self, PyObject *val, void *closure);
+static PyObject * cronjob_getter_scheduled(Cronjob *self, void *closure);
+static PyObject * cronjob_getter_lane(Cronjob *self, void *closure);
+static PyObject * cronjob_getter_offset(Cronjob *self, void *closure);
+
+static int crond___init__(CronD *self, PyObject *args, PyObject *kwargs);
+static int crond_traverse(CronD *self, visitproc visit, void *arg);
+static int crond_clear(CronD *self);
+static void crond_dealloc(CronD *self);
+static PyObject * crond_repr(CronD *self);
+static Py_ssize_t crond___len__(CronD *self);
+static PyObject * crond_add(CronD *self, PyObject *args, PyObject *kwargs);
+static PyObject * crond_remove(CronD *self, PyObject *cid);
+static PyObject * crond_update(CronD *self);
+static PyObject * crond_reset_stats(CronD *self);
+static PyObject * crond_getter_heap(CronD *self, void *closure);
+static PyObject * crond_getter_jitter(CronD *self, void *closure);
+static int crond_setter_jitter(CronD *self, PyObject *val, void *closure);
+static PyObject * crond_getter_spread(CronD *self, void *closure);
+static int crond_setter_spread(CronD *self, PyObject *val, void *closure);
+static PyObject * crond_getter_lanes(CronD *self, void *closure);
+static PyObject * crond_getter_max_jobs(CronD *self, void *closure);
+static int crond_setter_max_jobs(CronD *self, PyObject *val, void *closure);
+static PyObject * crond_getter_shed(CronD *self, void *closure);
+static int crond_setter_shed(CronD *self, PyObject *val, void *closure);
+static PyObject * crond_getter_stats(CronD *self, void *closure);
+
+static PyGetSetDef cronjob_getset_[] = {
+    {"cooldown", (getter)cronjob_getter_cooldown, NULL, NULL, NULL},
+    {"task", (getter)cronjob_getter_task, (setter)cronjob_setter_task, NULL, NULL},
+    {"repeat", (getter)cronjob_getter_repeat, (setter)cronjob_setter_repeat, NULL, NULL},
+    {"scheduled", (getter)cronjob_getter_scheduled, NULL, NULL, NULL},
+    {"lane", (getter)cronjob_getter_lane, NULL, NULL, NULL},
+    {"offset", (getter)cronjob_getter_offset, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject cronjob_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.Cronjob",
+    .tp_doc = DOCSTRING_CRONJOB,
+    .tp_basicsize = sizeof(Cronjob),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)cronjob___init__,
+    .tp_traverse = (traverseproc)cronjob_traverse,
+    .tp_clear = (inquiry)cronjob_clear,
+    .tp_dealloc = (destructor)cronjob_dealloc,
+    .tp_repr = (reprfunc)cronjob_repr,
+    .tp_call = (ternaryfunc)cronjob___call__,
+    .tp_getset = cronjob_getset_,
+};
+
+static PySequenceMethods crond_as_sequence = {
+    .sq_length = (lenfunc)crond___len__,
+};
+
+static PyMethodDef crond_methods_[] = {
+    {"add", (PyCFunction)crond_add, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"remove", (PyCFunction)crond_remove, METH_O, NULL},
+    {"update", (PyCFunction)crond_update, METH_NOARGS, NULL},
+    {"reset_stats", (PyCFunction)crond_reset_stats, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef crond_getset_[] = {
+    {"heap", (getter)crond_getter_heap, NULL, NULL, NULL},
+    {"jitter", (getter)crond_getter_jitter, (setter)crond_setter_jitter, NULL, NULL},
+    {"spread", (getter)crond_getter_spread, (setter)crond_setter_spread, NULL, NULL},
+    {"lanes", (getter)crond_getter_lanes, NULL, NULL, NULL},
+    {"max_jobs", (getter)crond_getter_max_jobs, (setter)crond_setter_max_jobs, NULL, NULL},
+    {"shed", (getter)crond_getter_shed, (setter)crond_setter_shed, NULL, NULL},
+    {"stats", (getter)crond_getter_stats, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject crond_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.CronD",
+    .tp_doc = DOCSTRING_CROND,
+    .tp_basicsize = sizeof(CronD),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)crond___init__,
+    .tp_traverse = (traverseproc)crond_traverse,
+    .tp_clear = (inquiry)crond_clear,
+    .tp_dealloc = (destructor)crond_dealloc,
+    .tp_repr = (reprfunc)crond_repr,
+    .tp_as_sequence = &crond_as_sequence,
+    .tp_methods = crond_methods_,
+    .tp_getset = crond_getset_,
+};
+
+
+static int crond_less(crond_entry *a, crond_entry *b) {
+    return a->deadline < b->deadline || (a->deadline == b->deadline && a->seq < b->seq);
+}
+
+
+static void crond_swap(crond_lane *lane, Py_ssize_t i, Py_ssize_t j) {
+    crond_entry tmp = lane->heap[i];
+
+    lane->heap[i] = lane->heap[j];
+    lane->heap[j] = tmp;
+    lane->heap[i].job->index = i;
+    lane->heap[j].job->index = j;
+}
+
+
+/* Move entry i up or down to its place */
+static void crond_sift(crond_lane *lane, Py_ssize_t i) {
+    crond_entry *heap = lane->heap;
+    Py_ssize_t parent, child;
+
+    while (i > 0) {
+        parent = (i - 1) / 2;
+        if (!crond_less(&heap[i], &heap[parent]))
+            break;
+        crond_swap(lane, i, parent);
+        i = parent;
+    }
+
+    while ((child = 2 * i + 1) < lane->len) {
+        if (child + 1 < lane->len && crond_less(&heap[child + 1], &heap[child]))
+            ++child;
+        if (!crond_less(&heap[child], &heap[i]))
+            break;
+        crond_swap(lane, i, child);
+        i = child;
+    }
+}
+
+
+/* Schedule job in its lane at the time its cooldown goes cold.  Steals no
+ * reference. */
+static int crond_push(CronD *self, Cronjob *job) {
+    crond_lane *lane = &self->lanes[job->lane];
+    crond_entry *entry;
+
+    if (lane->len == lane->capacity) {
+        Py_ssize_t capacity = lane->capacity ? lane->capacity * 2 : 16;
+        crond_entry *heap = PyMem_Realloc(lane->heap, capacity * sizeof(crond_entry));
+
+        if (heap == NULL) {
+            PyErr_NoMemory();
+            return -1;
+        }
+
+        lane->heap = heap;
+        lane->capacity = capacity;
+    }
+
+    entry = &lane->heap[lane->len];
+    entry->deadline = crond_deadline(self, job);
+    entry->seq = self->seq++;
+    Py_INCREF(job);
+    entry->job = job;
+
+    job->next = job->cooldown->jobs;
+    job->cooldown->jobs = job;
+    job->crond = self;
+    job->index = lane->len++;
+    ++self->len;
+    crond_sift(lane, job->index);
+
+    return 0;
+}
+
+
+/* Take entry i out of the lane's heap, returns the reference the heap held */
+static Cronjob * crond_pop(CronD *self, crond_lane *lane, Py_ssize_t i) {
+    Cronjob *job = lane->heap[i].job;
+
+    --self->len;
+    --lane->len;
+    if (i != lane->len) {
+        lane->heap[i] = lane->heap[lane->len];
+        lane->heap[i].job->index = i;
+        crond_sift(lane, i);
+    }
+
+    crond_unlink(job);
+    job->index = -1;
+    return job;
+}
+
+
+static double crond_deadline(CronD *self, Cronjob *job) {
+    Cooldown *cooldown = job->cooldown;
+
+    if (cooldown->paused)
+        return Py_HUGE_VAL;
+
+    return diff_timespec(&self->t0, &cooldown->t0) + cooldown->duration + job->offset;
+}
+
+
+/* Restart the cooldown of a repeating job after its run.  The first run
+ * after a jitter/spread offset restarts from now instead of wrapping, so
+ * the following runs keep the offset phase. */
+static void crond_rearm(Cronjob *job) {
+    Cooldown *cooldown = job->cooldown;
+
+    /* No wrapping for a zero duration, fmod would give NaN */
+    reset(cooldown, cooldown->duration, cooldown->duration > 0 && job->offset == 0);
+    job->offset = 0;
+}
+
+
+/* Take job out of the list of its cooldown */
+static void crond_unlink(Cronjob *job) {
+    Cronjob **link;
+
+    /* Already unlinked by cronjob_clear */
+    if (job->cooldown == NULL)
+        return;
+
+    link = &job->cooldown->jobs;
+
+    while (*link != job)
+        link = &(*link)->next;
+
+    *link = job->next;
+    job->next = NULL;
+}
+
+
+/* The cooldown of these jobs changed, move them to their new place */
+static void crond_rekey(Cronjob *jobs) {
+    for (Cronjob *job = jobs; job != NULL; job = job->next) {
+        crond_lane *lane = &job->crond->lanes[job->lane];
+
+        lane->heap[job->index].deadline = crond_deadline(job->crond, job);
+        crond_sift(lane, job->index);
+    }
+}
+
+
+/* Number of due jobs in the subheap at i, only visits the due ones */
+static Py_ssize_t crond_count_due(crond_lane *lane, Py_ssize_t i, double now) {
+    if (i >= lane->len || lane->heap[i].deadline > now)
+        return 0;
+
+    return 1 + crond_count_due(lane, 2 * i + 1, now) + crond_count_due(lane, 2 * i + 2, now);
+}
+
+
+/* The budget of the update is used up, defer or shed the due jobs of lane */
+static int crond_overload(CronD *self, crond_lane *lane, double now) {
+    Py_ssize_t n = crond_count_due(lane, 0, now);
+
+    lane->due += n;
+    if (!self->shed) {
+        lane->deferred += n;
+        return 0;
+    }
+
+    /* Repeating jobs skip this run.  They are pushed back right away, but
+     * always behind the due ones, so exactly n pops take the due jobs. */
+    lane->shed += n;
+    while (n--) {
+        Cronjob *job = crond_pop(self, lane, 0);
+
+        if (job->repeat) {
+            crond_rearm(job);
+            if (crond_push(self, job) < 0) {
+                job->crond = NULL;
+                Py_DECREF(job);
+                return -1;
+            }
+        } else {
+            job->crond = NULL;
+        }
+        Py_DECREF(job);
+    }
+
+    return 0;
+}
+
+
+static void crond_free_lanes(CronD *self) {
+    for (Py_ssize_t i = 0; i < self->n_lanes; ++i)
+        PyMem_Free(self->lanes[i].heap);
+
+    PyMem_Free(self->lanes);
+    self->lanes = NULL;
+    self->n_lanes = 0;
+}
+
+
+/* splitmix64, uniform in [0, 1) */
+static double crond_random(CronD *self) {
+    unsigned long long z = (self->rng += 0x9e3779b97f4a7c15ULL);
+
+    z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+    z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+    z ^= z >> 31;
+
+    return (z >> 11) * 0x1.0p-53;
+}
+
+
+/* Push back the first deadline of a new job.  Jitter is random, spread
+ * places the repeating jobs on a golden ratio sequence over the window,
+ * which stays evenly distributed no matter how many jobs are added.  The
+ * offset is kept in the job, the cooldown belongs to the caller and might
+ * be shared. */
+static void crond_offset(CronD *self, Cronjob *job, double jitter, double spread) {
+    job->offset = 0.0;
+
+    if (jitter > 0)
+        job->offset += jitter * crond_random(self);
+
+    if (spread > 0 && job->repeat)
+        job->offset += spread * fmod(self->spread_count++ * 0.6180339887498949, 1.0);
+}
+
+
+/* Remove the float `name` from kwargs, if given.  Returns 1 if found, 0 if
+ * not, -1 on error. */
+static int crond_take_kwarg(PyObject *kwargs, const char *name, double *val) {
+    PyObject *o;
+
+    if (kwargs == NULL)
+        return 0;
+
+    o = PyDict_GetItemString(kwargs, name);
+    if (o == NULL || o == Py_None) {
+        if (o != NULL && PyDict_DelItemString(kwargs, name) < 0)
+            return -1;
+        return 0;
+    }
+
+    *val = PyFloat_AsDouble(o);
+    if (PyErr_Occurred()) {
+        PyErr_Format(PyExc_TypeError, "%s must be a float", name);
+        return -1;
+    }
+    if (*val < 0) {
+        PyErr_Format(PyExc_ValueError, "%s must not be negative", name);
+        return -1;
+    }
+
+    if (PyDict_DelItemString(kwargs, name) < 0)
+        return -1;
+
+    return 1;
+}
+
+
+static int cronjob___init__(Cronjob *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"cooldown", "task", "repeat", NULL};
+    PyObject *cooldown, *task;
+    int repeat = 0;
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "OO|p", kwargslist,
+                &cooldown, &task, &repeat))
+        return -1;
+
+    if (self->crond != NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "Cronjob is scheduled");
+        return -1;
+    }
+
+    if (!PyCallable_Check(task)) {
+        PyErr_SetString(PyExc_TypeError, "task must be callable");
+        return -1;
+    }
+
+    if (is_cooldown(cooldown))
+        Py_INCREF(cooldown);
+    else if (reject_pure_cooldown(cooldown, "Cronjob") < 0
+            || (cooldown = PyObject_CallOneArg((PyObject *)&cooldown_type, cooldown)) == NULL)
+        return -1;
+
+    Py_XSETREF(self->cooldown, (Cooldown *)cooldown);
+    Py_INCREF(task);
+    Py_XSETREF(self->task, task);
+    self->repeat = repeat;
+    self->index = -1;
+    self->offset = 0.0;
+
+    return 0;
+}
+
+
+static int cronjob_traverse(Cronjob *self, visitproc visit, void *arg) {
+    Py_VISIT(self->cooldown);
+    Py_VISIT(self->task);
+    return 0;
+}
+
+
+static int cronjob_clear(Cronjob *self) {
+    /* Still in a heap, but the cooldown may outlive us */
+    if (self->index >= 0 && self->cooldown != NULL)
+        crond_unlink(self);
+
+    Py_CLEAR(self->cooldown);
+    Py_CLEAR(self->task);
+    return 0;
+}
+
+
+static void cronjob_dealloc(Cronjob *self) {
+    PyObject_GC_UnTrack(self);
+    cronjob_clear(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * cronjob_repr(Cronjob *self) {
+    return PyUnicode_FromFormat("Cronjob(%R, %R, repeat=%s) at %p",
+                                self->cooldown ? (PyObject *)self->cooldown : Py_None,
+                                self->task ? self->task : Py_None,
+                                self->repeat ? "True" : "False", self);
+}
+
+
+/* Behave like the weakref that `add()` used to return */
+static PyObject * cronjob___call__(Cronjob *self, PyObject *args, PyObject *kwargs) {
+    if (self->crond == NULL)
+        Py_RETURN_NONE;
+
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+
+static PyObject * cronjob_getter_cooldown(Cronjob *self, void *closure) {
+    PyObject *cooldown = self->cooldown ? (PyObject *)self->cooldown : Py_None;
+
+    Py_INCREF(cooldown);
+    return cooldown;
+}
+
+
+static PyObject * cronjob_getter_task(Cronjob *self, void *closure) {
+    PyObject *task = self->task ? self->task : Py_None;
+
+    Py_INCREF(task);
+    return task;
+}
+
+
+static int cronjob_setter_task(Cronjob *self, PyObject *val, void *closure) {
+    if (val == NULL || !PyCallable_Check(val)) {
+        PyErr_SetString(PyExc_TypeError, "task must be callable");
+        return -1;
+    }
+
+    Py_INCREF(val);
+    Py_XSETREF(self->task, val);
+    return 0;
+}
+
+
+static PyObject * cronjob_getter_repeat(Cronjob *self, void *closure) {
+    return PyBool_FromLong(self->repeat);
+}
+
+
+static int cronjob_setter_repeat(Cronjob *self, PyObject *val, void *closure) {
+    int repeat;
+
+    if (val == NULL) {
+        PyErr_SetString(PyExc_TypeError, "Cannot delete the repeat attribute");
+        return -1;
+    }
+
+    if ((repeat = PyObject_IsTrue(val)) < 0)
+        return -1;
+
+    self->repeat = repeat;
+    return 0;
+}
+
+
+static PyObject * cronjob_getter_scheduled(Cronjob *self, void *closure) {
+    return PyBool_FromLong(self->crond != NULL);
+}
+
+
+static PyObject * cronjob_getter_lane(Cronjob *self, void *closure) {
+    return PyLong_FromSsize_t(self->lane);
+}
+
+
+static PyObject * cronjob_getter_offset(Cronjob *self, void *closure) {
+    return PyFloat_FromDouble(self->offset);
+}
+
+
+static int crond___init__(CronD *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"jitter", "spread", "seed", "lanes", "max_jobs", "shed", NULL};
+    double jitter = 0.0, spread = 0.0;
+    PyObject *seed = NULL, *max_jobs = Py_None;
+    Py_ssize_t n_lanes = 1;
+    int shed = 0;
+    crond_lane *lanes;
+
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "|$ddO!nOp", kwargslist,
+                &jitter, &spread, &PyLong_Type, &seed, &n_lanes, &max_jobs, &shed))
+        return -1;
+
+    if (jitter < 0 || spread < 0) {
+        PyErr_SetString(PyExc_ValueError, "jitter and spread must not be negative");
+        return -1;
+    }
+    if (n_lanes < 1) {
+        PyErr_SetString(PyExc_ValueError, "lanes must be at least 1");
+        return -1;
+    }
+    if (crond_setter_max_jobs(self, max_jobs, NULL) < 0)
+        return -1;
+
+    if ((lanes = PyMem_Calloc(n_lanes, sizeof(crond_lane))) == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    crond_clear(self);
+    crond_free_lanes(self);
+    self->lanes = lanes;
+    self->n_lanes = n_lanes;
+    self->shed = shed;
+
+    timespec_get(&self->t0, TIME_UTC);
+    self->jitter = jitter;
+    self->spread = spread;
+    self->rng = seed ? PyLong_AsUnsignedLongLongMask(seed) : 0;
+    self->spread_count = 0;
+
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+
+static int crond_traverse(CronD *self, visitproc visit, void *arg) {
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l)
+        for (Py_ssize_t i = 0; i < self->lanes[l].len; ++i)
+            Py_VISIT(self->lanes[l].heap[i].job);
+
+    return 0;
+}
+
+
+static int crond_clear(CronD *self) {
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l) {
+        crond_lane *lane = &self->lanes[l];
+
+        while (lane->len) {
+            Cronjob *job = crond_pop(self, lane, lane->len - 1);
+
+            job->crond = NULL;
+            Py_DECREF(job);
+        }
+    }
+
+    return 0;
+}
+
+
+static void crond_dealloc(CronD *self) {
+    PyObject_GC_UnTrack(self);
+    crond_clear(self);
+    crond_free_lanes(self);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * crond_repr(CronD *self) {
+    return PyUnicode_FromFormat("CronD(len=%zd) at %p", self->len, self);
+}
+
+
+static Py_ssize_t crond___len__(CronD *self) {
+    return self->len;
+}
+
+
+static PyObject * crond_add(CronD *self, PyObject *args, PyObject *kwargs) {
+    double jitter = self->jitter, spread = self->spread;
+    Py_ssize_t lane = 0;
+    Cronjob *job;
+
+    /* lane, jitter and spread are for the crond, the rest goes to the job */
+    if (kwargs != NULL) {
+        PyObject *o;
+
+        if ((kwargs = PyDict_Copy(kwargs)) == NULL)
+            return NULL;
+
+        if ((o = PyDict_GetItemString(kwargs, "lane")) != NULL) {
+            lane = PyNumber_AsSsize_t(o, PyExc_OverflowError);
+            if ((lane == -1 && PyErr_Occurred()) || PyDict_DelItemString(kwargs, "lane") < 0) {
+                Py_DECREF(kwargs);
+                return NULL;
+            }
+        }
+
+        if (crond_take_kwarg(kwargs, "jitter", &jitter) < 0
+                || crond_take_kwarg(kwargs, "spread", &spread) < 0) {
+            Py_DECREF(kwargs);
+            return NULL;
+        }
+    }
+
+    if (lane < 0 || lane >= self->n_lanes) {
+        Py_XDECREF(kwargs);
+        PyErr_SetString(PyExc_ValueError, "lane must be in range(lanes)");
+        return NULL;
+    }
+
+    job = (Cronjob *)PyObject_Call((PyObject *)&cronjob_type, args, kwargs);
+    Py_XDECREF(kwargs);
+    if (job == NULL)
+        return NULL;
+
+    job->lane = lane;
+    crond_offset(self, job, jitter, spread);
+
+    if (crond_push(self, job) < 0) {
+        Py_DECREF(job);
+        return NULL;
+    }
+
+    return (PyObject *)job;
+}
+
+
+static PyObject * crond_remove(CronD *self, PyObject *cid) {
+    Cronjob *job;
+
+    /* Handles used to be weakrefs, so accept those too */
+    if (PyWeakref_Check(cid))
+        cid = PyWeakref_GetObject(cid);
+
+    if (cid == Py_None)
+        Py_RETURN_NONE;
+
+    if (!is_cronjob(cid)) {
+        PyErr_SetString(PyExc_TypeError, "remove expects the Cronjob returned by add");
+        return NULL;
+    }
+
+    job = (Cronjob *)cid;
+    if (job->crond != self)
+        Py_RETURN_NONE;
+
+    /* A running job is only unlinked, update() drops it */
+    job->crond = NULL;
+    if (job->index >= 0)
+        Py_DECREF(crond_pop(self, &self->lanes[job->lane], job->index));
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * crond_update(CronD *self) {
+    PyObject *due = NULL;
+    Py_ssize_t len, i = 0, budget = self->max_jobs;
+    double now;
+
+    now = current_delta(&self->t0);
+
+    /* Collect first.  The tasks may add or remove jobs, and repeating
+     * jobs are only pushed back after all due jobs ran, so a job with a
+     * zero cooldown runs once per update instead of forever. */
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l) {
+        crond_lane *lane = &self->lanes[l];
+
+        while (lane->len && lane->heap[0].deadline <= now) {
+            Cronjob *job;
+
+            /* The first lane is never held back */
+            if (l > 0 && budget == 0) {
+                if (crond_overload(self, lane, now) < 0)
+                    goto ERROR;
+                break;
+            }
+
+            job = crond_pop(self, lane, 0);
+            ++lane->due;
+            if (budget > 0)
+                --budget;
+
+            if (due == NULL && (due = PyList_New(0)) == NULL) {
+                job->crond = NULL;
+                Py_DECREF(job);
+                return NULL;
+            }
+
+            if (PyList_Append(due, (PyObject *)job) < 0) {
+                job->crond = NULL;
+                Py_DECREF(job);
+                goto ERROR;
+            }
+            Py_DECREF(job);
+        }
+    }
+
+    if (due == NULL)
+        Py_RETURN_NONE;
+
+    len = PyList_GET_SIZE(due);
+    for (i = 0; i < len; ++i) {
+        Cronjob *job = (Cronjob *)PyList_GET_ITEM(due, i);
+        PyObject *rc;
+
+        /* Removed by an earlier task */
+        if (job->crond != self)
+            continue;
+
+        rc = PyObject_CallNoArgs(job->task);
+        if (rc == NULL) {
+            job->crond = NULL;
+            ++i;
+            goto ERROR;
+        }
+        Py_DECREF(rc);
+
+        /* Unless the task called __init__ with fewer lanes */
+        if (job->lane < self->n_lanes)
+            ++self->lanes[job->lane].run;
+
+        /* Still scheduled, unless the task removed itself */
+        if (job->crond != self)
+            continue;
+
+        if (job->repeat) {
+            crond_rearm(job);
+            if (crond_push(self, job) < 0) {
+                job->crond = NULL;
+                ++i;
+                goto ERROR;
+            }
+        } else {
+            job->crond = NULL;
+        }
+    }
+
+    Py_DECREF(due);
+    Py_RETURN_NONE;
+
+ERROR:
+    /* Jobs that didn't run yet stay scheduled */
+    if (due != NULL) {
+        for (; i < PyList_GET_SIZE(due); ++i) {
+            Cronjob *job = (Cronjob *)PyList_GET_ITEM(due, i);
+
+            if (job->crond == self && job->index < 0) {
+                PyObject *type, *value, *traceback;
+
+                PyErr_Fetch(&type, &value, &traceback);
+                if (crond_push(self, job) < 0)
+                    job->crond = NULL;
+                PyErr_Restore(type, value, traceback);
+            }
+        }
+        Py_DECREF(due);
+    }
+
+    return NULL;
+}
+
+
+static PyObject * crond_reset_stats(CronD *self) {
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l) {
+        crond_lane *lane = &self->lanes[l];
+
+        lane->due = lane->run = lane->deferred = lane->shed = 0;
+    }
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * crond_getter_heap(CronD *self, void *closure) {
+    PyObject *heap = PyList_New(self->len);
+    Py_ssize_t n = 0;
+
+    if (heap == NULL)
+        return NULL;
+
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l) {
+        for (Py_ssize_t i = 0; i < self->lanes[l].len; ++i) {
+            Py_INCREF(self->lanes[l].heap[i].job);
+            PyList_SET_ITEM(heap, n++, (PyObject *)self->lanes[l].heap[i].job);
+        }
+    }
+
+    return heap;
+}
+
+
+static PyObject * crond_getter_jitter(CronD *self, void *closure) {
+    return PyFloat_FromDouble(self->jitter);
+}
+
+
+static int crond_setter_jitter(CronD *self, PyObject *val, void *closure) {
+    double jitter = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "jitter must be a float");
+        return -1;
+    }
+    if (jitter < 0) {
+        PyErr_SetString(PyExc_ValueError, "jitter must not be negative");
+        return -1;
+    }
+
+    self->jitter = jitter;
+
+    return 0;
+}
+
+
+static PyObject * crond_getter_spread(CronD *self, void *closure) {
+    return PyFloat_FromDouble(self->spread);
+}
+
+
+static int crond_setter_spread(CronD *self, PyObject *val, void *closure) {
+    double spread = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "spread must be a float");
+        return -1;
+    }
+    if (spread < 0) {
+        PyErr_SetString(PyExc_ValueError, "spread must not be negative");
+        return -1;
+    }
+
+    self->spread = spread;
+
+    return 0;
+}
+
+
+static PyObject * crond_getter_lanes(CronD *self, void *closure) {
+    return PyLong_FromSsize_t(self->n_lanes);
+}
+
+
+static PyObject * crond_getter_max_jobs(CronD *self, void *closure) {
+    if (self->max_jobs < 0)
+        Py_RETURN_NONE;
+
+    return PyLong_FromSsize_t(self->max_jobs);
+}
+
+
+static int crond_setter_max_jobs(CronD *self, PyObject *val, void *closure) {
+    Py_ssize_t max_jobs;
+
+    if (val == NULL || val == Py_None) {
+        self->max_jobs = -1;
+        return 0;
+    }
+
+    max_jobs = PyNumber_AsSsize_t(val, PyExc_OverflowError);
+    if (max_jobs == -1 && PyErr_Occurred())
+        return -1;
+    if (max_jobs < 0) {
+        PyErr_SetString(PyExc_ValueError, "max_jobs must not be negative");
+        return -1;
+    }
+
+    self->max_jobs = max_jobs;
+
+    return 0;
+}
+
+
+static PyObject * crond_getter_shed(CronD *self, void *closure) {
+    return PyBool_FromLong(self->shed);
+}
+
+
+static int crond_setter_shed(CronD *self, PyObject *val, void *closure) {
+    int shed;
+
+    if (val == NULL) {
+        PyErr_SetString(PyExc_TypeError, "Cannot delete the shed attribute");
+        return -1;
+    }
+
+    if ((shed = PyObject_IsTrue(val)) < 0)
+        return -1;
+
+    self->shed = shed;
+    return 0;
+}
+
+
+static PyObject * crond_getter_stats(CronD *self, void *closure) {
+    PyObject *stats = PyList_New(self->n_lanes);
+
+    if (stats == NULL)
+        return NULL;
+
+    for (Py_ssize_t l = 0; l < self->n_lanes; ++l) {
+        crond_lane *lane = &self->lanes[l];
+        PyObject *d = Py_BuildValue("{sKsKsKsK}",
+                                    "due", lane->due, "run", lane->run,
+                                    "deferred", lane->deferred, "shed", lane->shed);
+
+        if (d == NULL) {
+            Py_DECREF(stats);
+            return NULL;
+        }
+        PyList_SET_ITEM(stats, l, d);
+    }
+
+    return stats;
+}
+
+
+/*----------------------------------------------------------------------
+     _____          _
+    | ____|__ _ ___(_)_ __   __ _ ___
+    |  _| / _` / __| | '_ \ / _` / __|
+    | |__| (_| \__ \ | | | | (_| \__ \
+    |_____\__,_|___/_|_| |_|\__, |___/
+                            |___/
+----------------------------------------------------------------------*/
+
+/* Robert Penner's easing functions, following the formulas on
+ * https://easings.net, same as rpeasings.  Powers are written out as
+ * products and constants are inlined in the same order, so the results are
+ * bit identical to rpeasings.  Easing objects are callable from
+ * python, but lerp(), lerp_into() & co. detect them and call the C function
+ * directly.
+ */
+
+typedef double (*easing_func)(double);
+
+typedef struct Easing {
+    PyObject_HEAD
+    vectorcallfunc vectorcall;
+    const char *name;
+    easing_func func;
+} Easing;
+
+static PyTypeObject easing_type;
+
+#define is_easing(o) (Py_IS_TYPE(o, &easing_type))
+
+static PyObject * easing_vectorcall(Easing *self, PyObject *const *args, size_t nargsf, PyObject *kwnames);
+static void easing_dealloc(Easing *self);
+static PyObject * easing_repr(Easing *self);
+static PyObject * easing_getter_name(Easing *self, void *closure);
+static PyObject * easing_getter_module(Easing *self, void *closure);
+static PyObject * easing_reduce(Easing *self, PyObject *unused);
+static PyObject * make_easings(void);
+
+static PyMethodDef easing_methods_[] = {
+    {"__reduce__", (PyCFunction)easing_reduce, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef easing_getset_[] = {
+    {"__name__", (getter)easing_getter_name, NULL, NULL, NULL},
+    {"__qualname__", (getter)easing_getter_name, NULL, NULL, NULL},
+    {"__module__", (getter)easing_getter_module, NULL, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject easing_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.Easing",
+    .tp_doc = DOCSTRING_EASING,
+    .tp_basicsize = sizeof(Easing),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_VECTORCALL,
+    .tp_vectorcall_offset = offsetof(Easing, vectorcall),
+    .tp_call = PyVectorcall_Call,
+    .tp_repr = (reprfunc)easing_repr,
+    .tp_dealloc = (destructor)easing_dealloc,
+    .tp_methods = easing_methods_,
+    .tp_getset = easing_getset_,
+};
+
+
+#define EASE_PI 3.14159265358979323846
+#define BACK_C1 1.70158
+#define BACK_C2 (BACK_C1 * 1.525)
+#define BACK_C3 (BACK_C1 + 1)
+#define BOUNCE_N1 7.5625
+#define BOUNCE_D1 2.75
+
+static double ease_null(double x) { return x; }
+
+static double ease_in_sine(double x) { return 1 - cos((x * EASE_PI) / 2); }
+static double ease_out_sine(double x) { return sin((x * EASE_PI) / 2); }
+static double ease_in_out_sine(double x) { return -(cos(EASE_PI * x) - 1) / 2; }
+
+static double ease_in_quad(double x) { return x * x; }
+static double ease_out_quad(double x) { return 1 - (1 - x) * (1 - x); }
+static double ease_in_out_quad(double x) {
+    return x < 0.5 ? 2 * x * x : 1 - pow(-2 * x + 2, 2) / 2;
+}
+
+static double ease_in_cubic(double x) { return x * x * x; }
+static double ease_out_cubic(double x) { return 1 - (1 - x) * (1 - x) * (1 - x); }
+static double ease_in_out_cubic(double x) {
+    return x < 0.5 ? 4 * x * x * x : 1 - (-2 * x + 2) * (-2 * x + 2) * (-2 * x + 2) / 2;
+}
+
+static double ease_in_quart(double x) { return x * x * x * x; }
+static double ease_out_quart(double x) { return 1 - (1 - x) * (1 - x) * (1 - x) * (1 - x); }
+static double ease_in_out_quart(double x) {
+    double y = -2 * x + 2;
+    return x < 0.5 ? 8 * x * x * x * x : 1 - y * y * y * y / 2;
+}
+
+static double ease_in_quint(double x) { return x * x * x * x * x; }
+static double ease_out_quint(double x) { return 1 - (1 - x) * (1 - x) * (1 - x) * (1 - x) * (1 - x); }
+static double ease_in_out_quint(double x) {
+    double y = -2 * x + 2;
+    return x < 0.5 ? 16 * x * x * x * x * x : 1 - y * y * y * y * y / 2;
+}
+
+static double ease_in_expo(double x) { return x == 0 ? 0 : pow(2, 10 * x - 10); }
+static double ease_out_expo(double x) { return x == 1 ? 1 : 1 - pow(2, -10 * x); }
+static double ease_in_out_expo(double x) {
+    return x == 0 ? 0
+        : x == 1 ? 1
+        : x < 0.5 ? pow(2, 20 * x - 10) / 2
+        : (2 - pow(2, -20 * x + 10)) / 2;
+}
+
+static double ease_in_circ(double x) { return 1 - sqrt(1 - pow(x, 2)); }
+static double ease_out_circ(double x) { return sqrt(1 - pow(x - 1, 2)); }
+static double ease_in_out_circ(double x) {
+    return x < 0.5
+        ? (1 - sqrt(1 - pow(2 * x, 2))) / 2
+        : (sqrt(1 - pow(-2 * x + 2, 2)) + 1) / 2;
+}
+
+static double ease_in_back(double x) { return BACK_C3 * x * x * x - BACK_C1 * x * x; }
+static double ease_out_back(double x) {
+    return 1 + BACK_C3 * (x - 1) * (x - 1) * (x - 1) + BACK_C1 * (x - 1) * (x - 1);
+}
+static double ease_in_out_back(double x) {
+    return x < 0.5
+        ? (pow(2 * x, 2) * ((BACK_C2 + 1) * 2 * x - BACK_C2)) / 2
+        : (pow(2 * x - 2, 2) * ((BACK_C2 + 1) * (x * 2 - 2) + BACK_C2) + 2) / 2;
+}
+
+static double ease_in_elastic(double x) {
+    return x == 0 ? 0
+        : x == 1 ? 1
+        : -pow(2, 10 * x - 10) * sin((x * 10 - 10.75) * 2 * EASE_PI / 3);
+}
+static double ease_out_elastic(double x) {
+    return x == 0 ? 0
+        : x == 1 ? 1
+        : pow(2, -10 * x) * sin((x * 10 - 0.75) * 2 * EASE_PI / 3) + 1;
+}
+static double ease_in_out_elastic(double x) {
+    return x == 0 ? 0
+        : x == 1 ? 1
+        : x < 0.5 ? -(pow(2, 20 * x - 10) * sin((20 * x - 11.125) * 2 * EASE_PI / 4.5)) / 2
+        : (pow(2, -20 * x + 10) * sin((20 * x - 11.125) * 2 * EASE_PI / 4.5)) / 2 + 1;
+}
+
+static double ease_out_bounce(double x) {
+    if (x < 1 / BOUNCE_D1) {
+        return BOUNCE_N1 * x * x;
+    } else if (x < 2 / BOUNCE_D1) {
+        x -= 1.5 / BOUNCE_D1;
+        return BOUNCE_N1 * x * x + 0.75;
+    } else if (x < 2.5 / BOUNCE_D1) {
+        x -= 2.25 / BOUNCE_D1;
+        return BOUNCE_N1 * x * x + 0.9375;
+    }
+
+    x -= 2.625 / BOUNCE_D1;
+    return BOUNCE_N1 * x * x + 0.984375;
+}
+static double ease_in_bounce(double x) { return 1 - ease_out_bounce(1 - x); }
+static double ease_in_out_bounce(double x) {
+    return x < 0.5
+        ? (1 - ease_out_bounce(1 - 2 * x)) / 2
+        : (1 + ease_out_bounce(2 * x - 1)) / 2;
+}
+
+static struct {
+    const char *name;
+    easing_func func;
+} easing_table[] = {
+    {"null", ease_null},
+    {"in_sine", ease_in_sine}, {"out_sine", ease_out_sine}, {"in_out_sine", ease_in_out_sine},
+    {"in_quad", ease_in_quad}, {"out_quad", ease_out_quad}, {"in_out_quad", ease_in_out_quad},
+    {"in_cubic", ease_in_cubic}, {"out_cubic", ease_out_cubic}, {"in_out_cubic", ease_in_out_cubic},
+    {"in_quart", ease_in_quart}, {"out_quart", ease_out_quart}, {"in_out_quart", ease_in_out_quart},
+    {"in_quint", ease_in_quint}, {"out_quint", ease_out_quint}, {"in_out_quint", ease_in_out_quint},
+    {"in_expo", ease_in_expo}, {"out_expo", ease_out_expo}, {"in_out_expo", ease_in_out_expo},
+    {"in_circ", ease_in_circ}, {"out_circ", ease_out_circ}, {"in_out_circ", ease_in_out_circ},
+    {"in_back", ease_in_back}, {"out_back", ease_out_back}, {"in_out_back", ease_in_out_back},
+    {"in_elastic", ease_in_elastic}, {"out_elastic", ease_out_elastic}, {"in_out_elastic", ease_in_out_elastic},
+    {"in_bounce", ease_in_bounce}, {"out_bounce", ease_out_bounce}, {"in_out_bounce", ease_in_out_bounce},
+    {"bounce_out", ease_out_bounce},
+    {NULL, NULL},
+};
+
+
+/* Apply `ease` to t.  None means no easing, Easing objects are inlined,
+ * anything else is called. */
+static int apply_ease(PyObject *ease, double t, double *eased) {
+    PyObject *arg, *rc;
+
+    if (ease == NULL || ease == Py_None) {
+        *eased = t;
+        return 0;
+    }
+
+    if (is_easing(ease)) {
+        *eased = ((Easing *)ease)->func(t);
+        return 0;
+    }
+
+    arg = PyFloat_FromDouble(t);
+    if (arg == NULL)
+        return -1;
+
+    rc = PyObject_CallOneArg(ease, arg);
+    Py_DECREF(arg);
+    if (rc == NULL)
+        return -1;
+
+    *eased = PyFloat_AsDouble(rc);
+    Py_DECREF(rc);
+
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+
+static PyObject * easing_vectorcall(Easing *self, PyObject *const *args, size_t nargsf, PyObject *kwnames) {
+    double t;
+
+    if (PyVectorcall_NARGS(nargsf) != 1 || (kwnames && PyTuple_GET_SIZE(kwnames))) {
+        PyErr_Format(PyExc_TypeError, "%s expects exactly 1 float", self->name);
+        return NULL;
+    }
+
+    t = PyFloat_AsDouble(args[0]);
+    if (t == -1.0 && PyErr_Occurred())
+        return NULL;
+
+    return PyFloat_FromDouble(self->func(t));
+}
+
+
+static void easing_dealloc(Easing *self) {
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * easing_repr(Easing *self) {
+    return PyUnicode_FromFormat("<easing %s>", self->name);
+}
+
+
+static PyObject * easing_getter_name(Easing *self, void *closure) {
+    return PyUnicode_FromString(self->name);
+}
+
+
+static PyObject * easing_getter_module(Easing *self, void *closure) {
+    return PyUnicode_FromString("pgcooldown.easings");
+}
+
+
+/* Pickle by name, easings are singletons in pgcooldown.easings */
+static PyObject * easing_reduce(Easing *self, PyObject *unused) {
+    return PyUnicode_FromString(self->name);
+}
+
+
+/* The dict of all easings, exported as `easings` */
+static PyObject * make_easings(void) {
+    PyObject *easings = PyDict_New();
+
+    if (easings == NULL)
+        return NULL;
+
+    for (int i = 0; easing_table[i].name != NULL; ++i) {
+        Easing *easing = PyObject_New(Easing, &easing_type);
+
+        if (easing == NULL)
+            goto ERROR;
+
+        easing->vectorcall = (vectorcallfunc)easing_vectorcall;
+        easing->name = easing_table[i].name;
+        easing->func = easing_table[i].func;
+
+        if (PyDict_SetItemString(easings, easing->name, (PyObject *)easing) < 0) {
+            Py_DECREF(easing);
+            goto ERROR;
+        }
+        Py_DECREF(easing);
+    }
+
+    return easings;
+
+ERROR:
+    Py_DECREF(easings);
+    return NULL;
+}
+
+
+/*----------------------------------------------------------------------
+        _          _                 _   _
+       / \   _ __ (_)_ __ ___   __ _| |_(_) ___  _ __
+      / _ \ | '_ \| | '_ ` _ \ / _` | __| |/ _ \| '_ \
+     / ___ \| | | | | | | | | | (_| | |_| | (_) | | | |
+    /_/   \_\_| |_|_|_| |_| |_|\__,_|\__|_|\___/|_| |_|
+
+----------------------------------------------------------------------*/
+
+/* The driver keeps an array of (target, attr, tween) bindings.  update()
+ * evaluates LerpThings directly from their attributes and only calls into
+ * python for other tweens and for LerpThings that need to catch up on a
+ * loop.
+ *
+ * Unbinding only clears a slot, the array is compacted at the end of
+ * update().  So setters and tweens can bind and unbind while update() is
+ * running, the loop only ever works with indices.
+ */
+
+typedef struct animation_binding {
+    PyObject *key;          /* (id(target), attr), NULL once unbound */
+    PyObject *target;
+    PyObject *attr;
+    PyObject *tween;
+    PyObject *callback;     /* NULL if none */
+    PyTypeObject *type;     /* Setter cache, see animation_resolve_setter */
+    PyObject *descr;
+    unsigned int version_tag;
+    int finished;
+} animation_binding;
+
+typedef struct AnimationDriver {
+    PyObject_HEAD
+    animation_binding *bindings;
+    Py_ssize_t len;         /* Used slots, including unbound ones */
+    Py_ssize_t capacity;
+    Py_ssize_t count;       /* Bound slots */
+    PyObject *index;        /* key -> slot */
+    int updating;
+} AnimationDriver;
+
+static PyTypeObject animation_driver_type;
+
+/* Looked up on first use, pgcooldown.lerpthing imports this module */
+static PyObject *lerpthing_type = NULL;
+static PyObject *str_vt0, *str_vt1, *str_ease, *str_duration, *str_repeat, *str_loops, *str_finished;
+
+static int animation_setup(void);
+static void animation_release(animation_binding *binding);
+static void animation_resolve_setter(animation_binding *binding);
+static int animation_eval(PyObject *tween, struct timespec *now, PyObject **value, int *finished);
+static int animation_sweep(AnimationDriver *self, PyObject *callbacks);
+
+static int animation_driver___init__(AnimationDriver *self, PyObject *args, PyObject *kwargs);
+static int animation_driver_traverse(AnimationDriver *self, visitproc visit, void *arg);
+static int animation_driver_clear(AnimationDriver *self);
+static void animation_driver_dealloc(AnimationDriver *self);
+static PyObject * animation_driver_repr(AnimationDriver *self);
+static Py_ssize_t animation_driver___len__(AnimationDriver *self);
+static PyObject * animation_driver_bind(AnimationDriver *self, PyObject *args, PyObject *kwargs);
+static PyObject * animation_driver_unbind(AnimationDriver *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * animation_driver_update(AnimationDriver *self);
+static PyObject * animation_driver_py_clear(AnimationDriver *self);
+
+static PySequenceMethods animation_driver_as_sequence = {
+    .sq_length = (lenfunc)animation_driver___len__,
+};
+
+static PyMethodDef animation_driver_methods_[] = {
+    {"bind", (PyCFunction)animation_driver_bind, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"unbind", (PyCFunction)animation_driver_unbind, METH_FASTCALL, NULL},
+    {"update", (PyCFunction)animation_driver_update, METH_NOARGS, NULL},
+    {"clear", (PyCFunction)animation_driver_py_clear, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyTypeObject animation_driver_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.AnimationDriver",
+    .tp_doc = DOCSTRING_ANIMATIONDRIVER,
+    .tp_basicsize = sizeof(AnimationDriver),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_GC,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)animation_driver___init__,
+    .tp_traverse = (traverseproc)animation_driver_traverse,
+    .tp_clear = (inquiry)animation_driver_clear,
+    .tp_dealloc = (destructor)animation_driver_dealloc,
+    .tp_repr = (reprfunc)animation_driver_repr,
+    .tp_as_sequence = &animation_driver_as_sequence,
+    .tp_methods = animation_driver_methods_,
+};
+
+
+static int animation_setup(void) {
+    PyObject *module;
+
+    if (lerpthing_type != NULL)
+        return 0;
+
+    if ((str_vt0 = PyUnicode_InternFromString("vt0")) == NULL
+            || (str_vt1 = PyUnicode_InternFromString("vt1")) == NULL
+            || (str_ease = PyUnicode_InternFromString("ease")) == NULL
+            || (str_duration = PyUnicode_InternFromString("duration")) == NULL
+            || (str_repeat = PyUnicode_InternFromString("repeat")) == NULL
+            || (str_loops = PyUnicode_InternFromString("loops")) == NULL
+            || (str_finished = PyUnicode_InternFromString("finished")) == NULL)
+        return -1;
+
+    module = PyImport_ImportModule("pgcooldown.lerpthing");
+    if (module == NULL)
+        return -1;
+
+    lerpthing_type = PyObject_GetAttrString(module, "LerpThing");
+    Py_DECREF(module);
+
+    return lerpthing_type == NULL ? -1 : 0;
+}
+
+
+static void animation_release(animation_binding *binding) {
+    Py_CLEAR(binding->key);
+    Py_CLEAR(binding->target);
+    Py_CLEAR(binding->attr);
+    Py_CLEAR(binding->tween);
+    Py_CLEAR(binding->callback);
+    Py_CLEAR(binding->type);
+    Py_CLEAR(binding->descr);
+    binding->finished = 0;
+}
+
+
+/* Cache the data descriptor for `attr` on the target's type.
+ *
+ * For types using the generic setattr, a data descriptor found on the type
+ * (property, __slots__ member, getset of C types) always wins, so calling
+ * its setter directly does exactly what setattr would do, without the
+ * lookup.  The cache is valid as long as the type's version tag doesn't
+ * change, i.e. the class wasn't modified.  Everything else goes through
+ * PyObject_SetAttr.
+ */
+static void animation_resolve_setter(animation_binding *binding) {
+    PyTypeObject *type = Py_TYPE(binding->target);
+    PyObject *mro;
+
+    if (binding->type == type && binding->version_tag != 0
+            && binding->version_tag == type->tp_version_tag)
+        return;
+
+    Py_CLEAR(binding->descr);
+    Py_INCREF(type);
+    Py_XSETREF(binding->type, type);
+    binding->version_tag = type->tp_version_tag;
+
+    mro = type->tp_mro;
+    if (type->tp_setattro != PyObject_GenericSetAttr || mro == NULL)
+        return;
+
+    for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(mro); ++i) {
+        PyObject *dict = ((PyTypeObject *)PyTuple_GET_ITEM(mro, i))->tp_dict;
+        PyObject *descr;
+
+        if (dict == NULL) {
+            binding->version_tag = 0;
+            return;
+        }
+
+        descr = PyDict_GetItemWithError(dict, binding->attr);
+        if (descr == NULL) {
+            if (PyErr_Occurred()) {
+                PyErr_Clear();
+                binding->version_tag = 0;
+                return;
+            }
+            continue;
+        }
+
+        if (Py_TYPE(descr)->tp_descr_set != NULL) {
+            Py_INCREF(descr);
+            binding->descr = descr;
+        }
+        return;
+    }
+}
+
+
+/* Evaluate a tween.
+ *
+ * A LerpThing is evaluated like `LerpThing.__call__` from its attributes,
+ * at time `now`.  Only when a repeating LerpThing needs to catch up on its
+ * loops, or for a zero duration, it's called from python.
+ *
+ * For other tweens, `finished()` is checked before the call, so the value
+ * of the final call is the end value.
+ */
+static int animation_eval(PyObject *tween, struct timespec *now, PyObject **value, int *finished) {
+    PyObject *duration, *vt0 = NULL, *vt1 = NULL, *ease = NULL, *o;
+    double t, a, b;
+    int repeat;
+    long loops;
+
+    *value = NULL;
+    *finished = 0;
+
+    if (!Py_IS_TYPE(tween, (PyTypeObject *)lerpthing_type))
+        goto GENERIC;
+
+    duration = PyObject_GetAttr(tween, str_duration);
+    if (duration == NULL)
+        return -1;
+    if (!is_cooldown(duration) || ((Cooldown *)duration)->duration == 0) {
+        Py_DECREF(duration);
+        goto GENERIC;
+    }
+    t = get_normalized_at((Cooldown *)duration, now);
+    Py_DECREF(duration);
+
+    if (t >= 1.0) {
+        if ((o = PyObject_GetAttr(tween, str_repeat)) == NULL)
+            return -1;
+        repeat = PyObject_IsTrue(o);
+        Py_DECREF(o);
+        if (repeat < 0)
+            return -1;
+
+        if (repeat) {
+            if ((o = PyObject_GetAttr(tween, str_loops)) == NULL)
+                return -1;
+            loops = PyLong_AsLong(o);
+            Py_DECREF(o);
+            if (loops == -1 && PyErr_Occurred())
+                return -1;
+
+            /* Catching up on loops stays in python */
+            if (loops != 0) {
+                *value = PyObject_CallNoArgs(tween);
+                return *value == NULL ? -1 : 0;
+            }
+        }
+
+        *value = PyObject_GetAttr(tween, str_vt1);
+        *finished = 1;
+        return *value == NULL ? -1 : 0;
+    }
+
+    if ((vt0 = PyObject_GetAttr(tween, str_vt0)) == NULL
+            || (vt1 = PyObject_GetAttr(tween, str_vt1)) == NULL
+            || (ease = PyObject_GetAttr(tween, str_ease)) == NULL)
+        goto ERROR;
+
+    a = PyFloat_AsDouble(vt0);
+    if (a == -1.0 && PyErr_Occurred())
+        goto ERROR;
+    b = PyFloat_AsDouble(vt1);
+    if (b == -1.0 && PyErr_Occurred())
+        goto ERROR;
+    if (apply_ease(ease, t, &t) < 0)
+        goto ERROR;
+
+    Py_DECREF(vt0);
+    Py_DECREF(vt1);
+    Py_DECREF(ease);
+
+    *value = PyFloat_FromDouble(lerp(a, b, t));
+    return *value == NULL ? -1 : 0;
+
+ERROR:
+    Py_XDECREF(vt0);
+    Py_XDECREF(vt1);
+    Py_XDECREF(ease);
+    return -1;
+
+GENERIC:
+    if ((o = PyObject_CallMethodNoArgs(tween, str_finished)) == NULL)
+        return -1;
+    *finished = PyObject_IsTrue(o);
+    Py_DECREF(o);
+    if (*finished < 0)
+        return -1;
+
+    *value = PyObject_CallNoArgs(tween);
+    return *value == NULL ? -1 : 0;
+}
+
+
+/* Compact the bindings, dropping unbound slots.
+ *
+ * With `callbacks`, finished bindings are dropped too and (callback, target)
+ * pairs are appended to it.  Without, they stay bound and are evaluated
+ * again next time.
+ */
+static int animation_sweep(AnimationDriver *self, PyObject *callbacks) {
+    Py_ssize_t j = 0;
+    int rc = 0;
+
+    for (Py_ssize_t i = 0; i < self->len; ++i) {
+        animation_binding *binding = &self->bindings[i];
+
+        if (binding->key != NULL && binding->finished && callbacks != NULL) {
+            if (binding->callback != NULL && rc == 0) {
+                PyObject *pair = PyTuple_Pack(2, binding->callback, binding->target);
+
+                if (pair == NULL || PyList_Append(callbacks, pair) < 0)
+                    rc = -1;
+                Py_XDECREF(pair);
+            }
+
+            if (PyDict_DelItem(self->index, binding->key) < 0)
+                rc = -1;
+            animation_release(binding);
+            --self->count;
+        }
+
+        binding->finished = 0;
+        if (binding->key == NULL)
+            continue;
+
+        if (i != j) {
+            PyObject *slot = PyLong_FromSsize_t(j);
+
+            if (slot == NULL || PyDict_SetItem(self->index, binding->key, slot) < 0)
+                rc = -1;
+            Py_XDECREF(slot);
+
+            self->bindings[j] = *binding;
+            memset(binding, 0, sizeof(*binding));
+        }
+        ++j;
+    }
+
+    self->len = j;
+    return rc;
+}
+
+
+static int animation_driver___init__(AnimationDriver *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "", kwargslist))
+        return -1;
+
+    if (animation_setup() < 0)
+        return -1;
+
+    animation_driver_clear(self);
+    self->index = PyDict_New();
+
+    return self->index == NULL ? -1 : 0;
+}
+
+
+static int animation_driver_traverse(AnimationDriver *self, visitproc visit, void *arg) {
+    for (Py_ssize_t i = 0; i < self->len; ++i) {
+        Py_VISIT(self->bindings[i].target);
+        Py_VISIT(self->bindings[i].tween);
+        Py_VISIT(self->bindings[i].callback);
+        Py_VISIT(self->bindings[i].type);
+        Py_VISIT(self->bindings[i].descr);
+    }
+    Py_VISIT(self->index);
+
+    return 0;
+}
+
+
+static int animation_driver_clear(AnimationDriver *self) {
+    for (Py_ssize_t i = 0; i < self->len; ++i)
+        animation_release(&self->bindings[i]);
+
+    /* While updating, the loop still indexes the array */
+    if (!self->updating)
+        self->len = 0;
+    self->count = 0;
+
+    if (self->index != NULL)
+        PyDict_Clear(self->index);
+
+    return 0;
+}
+
+
+static void animation_driver_dealloc(AnimationDriver *self) {
+    PyObject_GC_UnTrack(self);
+    animation_driver_clear(self);
+    Py_CLEAR(self->index);
+    PyMem_Free(self->bindings);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * animation_driver_repr(AnimationDriver *self) {
+    return PyUnicode_FromFormat("AnimationDriver(len=%zd) at %p", self->count, self);
+}
+
+
+static Py_ssize_t animation_driver___len__(AnimationDriver *self) {
+    return self->count;
+}
+
+
+static PyObject * animation_driver_bind(AnimationDriver *self, PyObject *args, PyObject *kwargs) {
+    PyObject *target, *attr, *tween, *callback = Py_None, *key, *id, *slot;
+    animation_binding *binding;
+    Py_ssize_t i;
+
+    static char *kwargslist[] = {"target", "attr", "tween", "callback", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OUO|O", kwargslist,
+                                     &target, &attr, &tween, &callback))
+        return NULL;
+
+    if (!PyCallable_Check(tween)) {
+        PyErr_SetString(PyExc_TypeError, "tween must be callable");
+        return NULL;
+    }
+
+    if (callback != Py_None && !PyCallable_Check(callback)) {
+        PyErr_SetString(PyExc_TypeError, "callback must be callable or None");
+        return NULL;
+    }
+
+    if (self->index == NULL) {
+        PyErr_SetString(PyExc_RuntimeError, "AnimationDriver is not initialized");
+        return NULL;
+    }
+
+    id = PyLong_FromVoidPtr(target);
+    if (id == NULL)
+        return NULL;
+    Py_INCREF(attr);
+    PyUnicode_InternInPlace(&attr);
+    key = PyTuple_Pack(2, id, attr);
+    Py_DECREF(id);
+    if (key == NULL) {
+        Py_DECREF(attr);
+        return NULL;
+    }
+
+    /* Binding the same attribute again replaces the tween */
+    slot = PyDict_GetItemWithError(self->index, key);
+    if (slot != NULL) {
+        i = PyLong_AsSsize_t(slot);
+        binding = &self->bindings[i];
+        Py_DECREF(key);
+        Py_DECREF(attr);
+
+        Py_INCREF(tween);
+        Py_SETREF(binding->tween, tween);
+        Py_CLEAR(binding->callback);
+        if (callback != Py_None) {
+            Py_INCREF(callback);
+            binding->callback = callback;
+        }
+        binding->finished = 0;
+
+        Py_RETURN_NONE;
+    }
+
+    if (PyErr_Occurred())
+        goto ERROR;
+
+    if (self->len == self->capacity) {
+        Py_ssize_t capacity = self->capacity ? self->capacity * 2 : 16;
+        animation_binding *bindings = PyMem_Realloc(self->bindings, capacity * sizeof(animation_binding));
+
+        if (bindings == NULL) {
+            PyErr_NoMemory();
+            goto ERROR;
+        }
+
+        self->bindings = bindings;
+        self->capacity = capacity;
+    }
+
+    i = self->len;
+    slot = PyLong_FromSsize_t(i);
+    if (slot == NULL || PyDict_SetItem(self->index, key, slot) < 0) {
+        Py_XDECREF(slot);
+        goto ERROR;
+    }
+    Py_DECREF(slot);
+
+    binding = &self->bindings[i];
+    memset(binding, 0, sizeof(*binding));
+    binding->key = key;
+    Py_INCREF(target);
+    binding->target = target;
+    binding->attr = attr;
+    Py_INCREF(tween);
+    binding->tween = tween;
+    if (callback != Py_None) {
+        Py_INCREF(callback);
+        binding->callback = callback;
+    }
+
+    ++self->len;
+    ++self->count;
+
+    Py_RETURN_NONE;
+
+ERROR:
+    Py_DECREF(key);
+    Py_DECREF(attr);
+    return NULL;
+}
+
+
+static PyObject * animation_driver_unbind(AnimationDriver *self, PyObject *const *args, Py_ssize_t nargs) {
+    PyObject *id, *key, *slot;
+    Py_ssize_t removed = 0;
+
+    if (nargs < 1 || nargs > 2 || (nargs == 2 && args[1] != Py_None && !PyUnicode_Check(args[1]))) {
+        PyErr_SetString(PyExc_TypeError, "unbind expects a target and an optional attribute name");
+        return NULL;
+    }
+
+    /* All attributes of the target */
+    if (nargs == 1 || args[1] == Py_None) {
+        for (Py_ssize_t i = 0; i < self->len; ++i) {
+            animation_binding *binding = &self->bindings[i];
+
+            if (binding->key == NULL || binding->target != args[0])
+                continue;
+
+            if (PyDict_DelItem(self->index, binding->key) < 0)
+                return NULL;
+            animation_release(binding);
+            --self->count;
+            ++removed;
+        }
+
+        return PyLong_FromSsize_t(removed);
+    }
+
+    if (self->index == NULL)
+        return PyLong_FromLong(0);
+
+    id = PyLong_FromVoidPtr(args[0]);
+    if (id == NULL)
+        return NULL;
+    key = PyTuple_Pack(2, id, args[1]);
+    Py_DECREF(id);
+    if (key == NULL)
+        return NULL;
+
+    slot = PyDict_GetItemWithError(self->index, key);
+    if (slot != NULL) {
+        /* `slot` is borrowed from the dict, look up the binding first */
+        animation_binding *binding = &self->bindings[PyLong_AsSsize_t(slot)];
+
+        if (PyDict_DelItem(self->index, key) < 0) {
+            Py_DECREF(key);
+            return NULL;
+        }
+        animation_release(binding);
+        --self->count;
+        ++removed;
+    }
+    Py_DECREF(key);
+
+    if (PyErr_Occurred())
+        return NULL;
+
+    return PyLong_FromSsize_t(removed);
+}
+
+
+static PyObject * animation_driver_update(AnimationDriver *self) {
+    PyObject *callbacks;
+    struct timespec now;
+    Py_ssize_t count;
+
+    if (self->updating) {
+        PyErr_SetString(PyExc_RuntimeError, "update() is already running");
+        return NULL;
+    }
+
+    /* All LerpThings are evaluated at the same time */
+    timespec_get(&now, TIME_UTC);
+    self->updating = 1;
+
+    /* self->len is checked every round, setters might bind new tweens */
+    for (Py_ssize_t i = 0; i < self->len; ++i) {
+        animation_binding *binding = &self->bindings[i];
+        PyObject *target, *attr, *tween, *descr, *value;
+        int finished, rc;
+
+        if (binding->key == NULL || binding->finished)
+            continue;
+
+        animation_resolve_setter(binding);
+
+        target = binding->target;
+        attr = binding->attr;
+        tween = binding->tween;
+        descr = binding->descr;
+        Py_INCREF(target);
+        Py_INCREF(attr);
+        Py_INCREF(tween);
+        Py_XINCREF(descr);
+
+        rc = animation_eval(tween, &now, &value, &finished);
+        if (rc == 0) {
+            rc = descr != NULL
+                ? Py_TYPE(descr)->tp_descr_set(descr, target, value)
+                : PyObject_SetAttr(target, attr, value);
+            Py_DECREF(value);
+        }
+
+        /* The binding might have been replaced or unbound meanwhile */
+        if (rc == 0 && finished && self->bindings[i].tween == tween)
+            self->bindings[i].finished = 1;
+
+        Py_DECREF(target);
+        Py_DECREF(attr);
+        Py_DECREF(tween);
+        Py_XDECREF(descr);
+
+        if (rc < 0) {
+            PyObject *type, *exc, *tb;
+
+            PyErr_Fetch(&type, &exc, &tb);
+            self->updating = 0;
+            animation_sweep(self, NULL);
+            PyErr_Restore(type, exc, tb);
+            return NULL;
+        }
+    }
+
+    self->updating = 0;
+
+    callbacks = PyList_New(0);
+    if (callbacks == NULL)
+        return NULL;
+
+    count = self->count;
+    if (animation_sweep(self, callbacks) < 0) {
+        Py_DECREF(callbacks);
+        return NULL;
+    }
+    count -= self->count;
+
+    /* Only now, the callbacks may bind and unbind as they like */
+    for (Py_ssize_t i = 0; i < PyList_GET_SIZE(callbacks); ++i) {
+        PyObject *pair = PyList_GET_ITEM(callbacks, i);
+        PyObject *rc = PyObject_CallOneArg(PyTuple_GET_ITEM(pair, 0), PyTuple_GET_ITEM(pair, 1));
+
+        if (rc == NULL) {
+            Py_DECREF(callbacks);
+            return NULL;
+        }
+        Py_DECREF(rc);
+    }
+
+    Py_DECREF(callbacks);
+    return PyLong_FromSsize_t(count);
+}
+
+
+static PyObject * animation_driver_py_clear(AnimationDriver *self) {
+    animation_driver_clear(self);
+    Py_RETURN_NONE;
+}
+
+
+/*----------------------------------------------------------------------
+     _____ _              _ ____  _
+    |  ___(_)_  _____  __| / ___|| |_ ___ _ __
+    | |_  | \ \/ / _ \/ _` \___ \| __/ _ \ '_ \
+    |  _| | |>  <  __/ (_| |___) | ||  __/ |_) |
+    |_|   |_/_/\_\___|\__,_|____/ \__\___| .__/
+                                         |_|
+----------------------------------------------------------------------*/
+
+/* The accumulator works like a Cooldown with wrap=True, the time left over
+ * after the due steps is carried into the next frame.  Only the steps above
+ * max_steps are dropped, the remainder of the current step is kept, so
+ * alpha stays continuous.
+ */
+
+typedef struct FixedStep {
+    PyObject_HEAD
+    struct timespec t0; /* Time base, the times below are relative to this */
+    double dt;
+    Py_ssize_t max_steps;
+    double last;        /* Time of the last update */
+    double acc;         /* Time not yet consumed by steps */
+    double dropped;
+} FixedStep;
+
+static PyTypeObject fixed_step_type;
+
+static void fixed_step_start(FixedStep *self);
+static Py_ssize_t fixed_step_advance(FixedStep *self);
+
+static int fixed_step___init__(FixedStep *self, PyObject *args, PyObject *kwargs);
+static void fixed_step_dealloc(FixedStep *self);
+static PyObject * fixed_step_repr(FixedStep *self);
+static PyObject * fixed_step_update(FixedStep *self, PyObject *unused);
+static PyObject * fixed_step_reset(FixedStep *self, PyObject *unused);
+static PyObject * fixed_step_getter_dt(FixedStep *self, void *closure);
+static int fixed_step_setter_dt(FixedStep *self, PyObject *val, void *closure);
+static PyObject * fixed_step_getter_max_steps(FixedStep *self, void *closure);
+static int fixed_step_setter_max_steps(FixedStep *self, PyObject *val, void *closure);
+static PyObject * fixed_step_getter_alpha(FixedStep *self, void *closure);
+static PyObject * fixed_step_getter_dropped(FixedStep *self, void *closure);
+static int fixed_step_setter_dropped(FixedStep *self, PyObject *val, void *closure);
+
+static PyMethodDef fixed_step_methods_[] = {
+    {"update", (PyCFunction)fixed_step_update, METH_NOARGS, NULL},
+    {"reset", (PyCFunction)fixed_step_reset, METH_NOARGS, NULL},
+    {NULL},
+};
+
+static PyGetSetDef fixed_step_getset_[] = {
+    {"dt", (getter)fixed_step_getter_dt, (setter)fixed_step_setter_dt, NULL, NULL},
+    {"max_steps", (getter)fixed_step_getter_max_steps, (setter)fixed_step_setter_max_steps, NULL, NULL},
+    {"alpha", (getter)fixed_step_getter_alpha, NULL, NULL, NULL},
+    {"dropped", (getter)fixed_step_getter_dropped, (setter)fixed_step_setter_dropped, NULL, NULL},
+    {NULL},
+};
+
+static PyTypeObject fixed_step_type = {
+    .ob_base = PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_pgcooldown.FixedStep",
+    .tp_doc = DOCSTRING_FIXEDSTEP,
+    .tp_basicsize = sizeof(FixedStep),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)fixed_step___init__,
+    .tp_repr = (reprfunc)fixed_step_repr,
+    .tp_dealloc = (destructor)fixed_step_dealloc,
+    .tp_methods = fixed_step_methods_,
+    .tp_getset = fixed_step_getset_,
+};
+
+
+static void fixed_step_start(FixedStep *self) {
+    timespec_get(&self->t0, TIME_UTC);
+    self->last = 0.0;
+    self->acc = 0.0;
+    self->dropped = 0.0;
+}
+
+
+/* Add the time since the last update and consume the due steps */
+static Py_ssize_t fixed_step_advance(FixedStep *self) {
+    double now = current_delta(&self->t0);
+    double steps;
+
+    self->acc += now - self->last;
+    self->last = now;
+
+    steps = floor(self->acc / self->dt);
+    if (steps > self->max_steps) {
+        double excess = (steps - self->max_steps) * self->dt;
+
+        self->dropped += excess;
+        self->acc -= excess;
+        steps = self->max_steps;
+    }
+
+    self->acc = MAX(self->acc - steps * self->dt, 0.0);
+
+    return (Py_ssize_t)steps;
+}
+
+
+static int fixed_step___init__(FixedStep *self, PyObject *args, PyObject *kwargs) {
+    static char *kwargslist[] = {"dt", "max_steps", NULL};
+
+    self->max_steps = 8;
+    if (!PyArg_ParseTupleAndKeywords(
+                args, kwargs, "d|$n", kwargslist,
+                &self->dt, &self->max_steps))
+        return -1;
+
+    if (self->dt <= 0) {
+        PyErr_SetString(PyExc_ValueError, "dt must be positive");
+        return -1;
+    }
+    if (self->max_steps < 1) {
+        PyErr_SetString(PyExc_ValueError, "max_steps must be at least 1");
+        return -1;
+    }
+
+    fixed_step_start(self);
+
+    return 0;
+}
+
+
+static void fixed_step_dealloc(FixedStep *self) {
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static PyObject * fixed_step_repr(FixedStep *self) {
+    PyObject *dt, *repr;
+
+    dt = PyFloat_FromDouble(self->dt);
+    repr = PyUnicode_FromFormat("FixedStep(%R, max_steps=%zd) at %p", dt, self->max_steps, self);
+    Py_XDECREF(dt);
+
+    return repr;
+}
+
+
+static PyObject * fixed_step_update(FixedStep *self, PyObject *unused) {
+    Py_ssize_t steps = fixed_step_advance(self);
+
+    return Py_BuildValue("(nd)", steps, MIN(self->acc / self->dt, 1.0));
+}
+
+
+static PyObject * fixed_step_reset(FixedStep *self, PyObject *unused) {
+    fixed_step_start(self);
+
+    Py_RETURN_NONE;
+}
+
+
+static PyObject * fixed_step_getter_dt(FixedStep *self, void *closure) {
+    return PyFloat_FromDouble(self->dt);
+}
+
+
+static int fixed_step_setter_dt(FixedStep *self, PyObject *val, void *closure) {
+    double dt = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "dt must be a float");
+        return -1;
+    }
+    if (dt <= 0) {
+        PyErr_SetString(PyExc_ValueError, "dt must be positive");
+        return -1;
+    }
+
+    self->dt = dt;
+
+    return 0;
+}
+
+
+static PyObject * fixed_step_getter_max_steps(FixedStep *self, void *closure) {
+    return PyLong_FromSsize_t(self->max_steps);
+}
+
+
+static int fixed_step_setter_max_steps(FixedStep *self, PyObject *val, void *closure) {
+    Py_ssize_t max_steps = PyNumber_AsSsize_t(val, PyExc_OverflowError);
+
+    if (max_steps == -1 && PyErr_Occurred())
+        return -1;
+    if (max_steps < 1) {
+        PyErr_SetString(PyExc_ValueError, "max_steps must be at least 1");
+        return -1;
+    }
+
+    self->max_steps = max_steps;
+
+    return 0;
+}
+
+
+static PyObject * fixed_step_getter_alpha(FixedStep *self, void *closure) {
+    return PyFloat_FromDouble(MIN(self->acc / self->dt, 1.0));
+}
+
+
+static PyObject * fixed_step_getter_dropped(FixedStep *self, void *closure) {
+    return PyFloat_FromDouble(self->dropped);
+}
+
+
+static int fixed_step_setter_dropped(FixedStep *self, PyObject *val, void *closure) {
+    double dropped = PyFloat_AsDouble(val);
+
+    if (PyErr_Occurred()) {
+        PyErr_SetString(PyExc_TypeError, "dropped must be a float");
+        return -1;
+    }
+
+    self->dropped = dropped;
+
+    return 0;
+}
+
+
+/*----------------------------------------------------------------------
+      ____      _    ____ ___
+     / ___|    / \  |  _ \_ _|
+    | |       / _ \ | |_) | |
+    | |___   / ___ \|  __/| |
+     \____| /_/   \_\_|  |___|
+
+----------------------------------------------------------------------*/
+
+/* The functions exported through the `_C_API` capsule, see
+ * include/pgcooldown_capi.h for the documentation. */
+
+static int capi_check_cooldown(PyObject *o) {
+    if (o == NULL || !is_cooldown(o)) {
+        PyErr_Format(PyExc_TypeError, "expected a Cooldown, got %s",
+                     o == NULL ? "NULL" : Py_TYPE(o)->tp_name);
+        return -1;
+    }
+
+    return 0;
+}
+
+
+static int capi_check(PyObject *o) {
+    return o != NULL && is_cooldown(o);
+}
+
+
+static int capi_is_cold(PyObject *cooldown) {
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1;
+
+    return is_cold((Cooldown *)cooldown);
+}
+
+
+static double capi_get_temperature(PyObject *cooldown) {
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1.0;
+
+    return get_temperature((Cooldown *)cooldown);
+}
+
+
+static double capi_get_remaining(PyObject *cooldown) {
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1.0;
+
+    return get_remaining((Cooldown *)cooldown);
+}
+
+
+static double capi_get_normalized(PyObject *cooldown) {
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1.0;
+
+    return get_normalized((Cooldown *)cooldown);
+}
+
+
+static int capi_reset(PyObject *cooldown, double duration, int wrap) {
+    Cooldown *cd = (Cooldown *)cooldown;
+
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1;
+
+    reset(cd, duration < 0 ? cd->duration : duration, wrap < 0 ? cd->wrap : wrap);
+
+    return 0;
+}
+
+
+static int capi_set_cold(PyObject *cooldown) {
+    if (capi_check_cooldown(cooldown) < 0)
+        return -1;
+
+    set_cold((Cooldown *)cooldown, 1);
+
+    return 0;
+}
+
+
+static Py_ssize_t capi_is_cold_many(PyObject *const *cooldowns, Py_ssize_t n, char *out) {
+    Py_ssize_t count = 0;
+
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (capi_check_cooldown(cooldowns[i]) < 0)
+            return -1;
+
+        out[i] = (char)is_cold((Cooldown *)cooldowns[i]);
+        count += out[i];
+    }
+
+    return count;
+}
+
+
+static int capi_get_remaining_many(PyObject *const *cooldowns, Py_ssize_t n, double *out) {
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (capi_check_cooldown(cooldowns[i]) < 0)
+            return -1;
+
+        out[i] = get_remaining((Cooldown *)cooldowns[i]);
+    }
+
+    return 0;
+}
+
+
+static int capi_get_normalized_many(PyObject *const *cooldowns, Py_ssize_t n, double *out) {
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (capi_check_cooldown(cooldowns[i]) < 0)
+            return -1;
+
+        out[i] = get_normalized((Cooldown *)cooldowns[i]);
+    }
+
+    return 0;
+}
+
+
+static int capi_reset_many(PyObject *const *cooldowns, Py_ssize_t n, double duration, int wrap) {
+    /* Check all first, so an error doesn't leave the batch half reset */
+    for (Py_ssize_t i = 0; i < n; ++i)
+        if (capi_check_cooldown(cooldowns[i]) < 0)
+            return -1;
+
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        Cooldown *cd = (Cooldown *)cooldowns[i];
+
+        reset(cd, duration < 0 ? cd->duration : duration, wrap < 0 ? cd->wrap : wrap);
+    }
+
+    return 0;
+}
+
+
+static int capi_ease(PyObject *ease, double t, double *out) {
+    return apply_ease(ease, t, out);
+}
+
+
+static int capi_lerp_many(const double *a, const double *b, const double *t, Py_ssize_t n,
+                          PyObject *ease, double *out) {
+    double eased;
+
+    if (ease == NULL || ease == Py_None) {
+        for (Py_ssize_t i = 0; i < n; ++i)
+            out[i] = lerp(a[i], b[i], t[i]);
+    } else {
+        for (Py_ssize_t i = 0; i < n; ++i) {
+            if (apply_ease(ease, t[i], &eased) < 0)
+                return -1;
+
+            out[i] = lerp(a[i], b[i], eased);
+        }
+    }
+
+    return 0;
+}
+
+
+static void capi_remap_many(double a0, double a1, double b0, double b1,
+                            const double *v, Py_ssize_t n, double *out) {
+    for (Py_ssize_t i = 0; i < n; ++i)
+        out[i] = remap(a0, a1, b0, b1, v[i]);
+}
+
+
+static PgCooldown_CAPI capi = {
+    .version = PGCOOLDOWN_CAPI_VERSION,
+    .CooldownType = &cooldown_type,
+
+    .Check = capi_check,
+    .IsCold = capi_is_cold,
+    .GetTemperature = capi_get_temperature,
+    .GetRemaining = capi_get_remaining,
+    .GetNormalized = capi_get_normalized,
+    .Reset = capi_reset,
+    .SetCold = capi_set_cold,
+
+    .IsColdMany = capi_is_cold_many,
+    .GetRemainingMany = capi_get_remaining_many,
+    .GetNormalizedMany = capi_get_normalized_many,
+    .ResetMany = capi_reset_many,
+
+    .Lerp = lerp,
+    .InvLerp = invlerp,
+    .Remap = remap,
+    .Ease = capi_ease,
+    .LerpMany = capi_lerp_many,
+    .RemapMany = capi_remap_many,
+};
+
+
+/*----------------------------------------------------------------------
+                         _       _
+     _ __ ___   ___   __| |_   _| | ___
+    | '_ ` _ \ / _ \ / _` | | | | |/ _ \
+    | | | | | | (_) | (_| | |_| | |  __/
+    |_| |_| |_|\___/ \__,_|\__,_|_|\___|
+
+----------------------------------------------------------------------*/
+
+PyMODINIT_FUNC PyInit__pgcooldown(void) {
+    PyObject *m, *easings, *c_api;
+
+    if (PyType_Ready(&cooldown_type) < 0
+            || PyType_Ready(&token_bucket_type) < 0
+            || PyType_Ready(&sliding_window_type) < 0
+            || PyType_Ready(&keyed_rate_limiter_type) < 0
+            || PyType_Ready(&throttle_type) < 0
+            || PyType_Ready(&debounce_type) < 0
+            || PyType_Ready(&cooldown_table_type) < 0
+            || PyType_Ready(&cooldown_view_type) < 0
+            || PyType_Ready(&cooldown_registry_type) < 0
+            || PyType_Ready(&cronjob_type) < 0
+            || PyType_Ready(&crond_type) < 0
+            || PyType_Ready(&easing_type) < 0
+            || PyType_Ready(&animation_driver_type) < 0
+            || PyType_Ready(&fixed_step_type) < 0)
+        return NULL;
+
+    m = PyModule_Create(&cooldown_module);
+    if (m == NULL)
+        return NULL;
+
+    easings = make_easings();
+    if (easings == NULL) {
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    c_api = PyCapsule_New(&capi, PGCOOLDOWN_CAPSULE_NAME, NULL);
+    if (c_api == NULL) {
+        Py_DECREF(easings);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    if (PyModule_AddObjectRef(m, "Cooldown", (PyObject *)&cooldown_type) < 0
+            || PyModule_AddObjectRef(m, "TokenBucket", (PyObject *)&token_bucket_type) < 0
+            || PyModule_AddObjectRef(m, "SlidingWindowLimiter", (PyObject *)&sliding_window_type) < 0
+            || PyModule_AddObjectRef(m, "KeyedRateLimiter", (PyObject *)&keyed_rate_limiter_type) < 0
+            || PyModule_AddObjectRef(m, "Throttle", (PyObject *)&throttle_type) < 0
+            || PyModule_AddObjectRef(m, "Debounce", (PyObject *)&debounce_type) < 0
+            || PyModule_AddObjectRef(m, "CooldownTable", (PyObject *)&cooldown_table_type) < 0
+            || PyModule_AddObjectRef(m, "CooldownView", (PyObject *)&cooldown_view_type) < 0
+            || PyModule_AddObjectRef(m, "CooldownRegistry", (PyObject *)&cooldown_registry_type) < 0
+            || PyModule_AddObjectRef(m, "Cronjob", (PyObject *)&cronjob_type) < 0
+            || PyModule_AddObjectRef(m, "CronD", (PyObject *)&crond_type) < 0
+            || PyModule_AddObjectRef(m, "Easing", (PyObject *)&easing_type) < 0
+            || PyModule_AddObjectRef(m, "AnimationDriver", (PyObject *)&animation_driver_type) < 0
+            || PyModule_AddObjectRef(m, "FixedStep", (PyObject *)&fixed_step_type) < 0
+            || PyModule_AddObjectRef(m, "easings", easings) < 0
+            || PyModule_AddObjectRef(m, "_C_API", c_api) < 0) {
+        Py_DECREF(c_api);
+        Py_DECREF(easings);
         Py_DECREF(m);
         return NULL;
     }
+    Py_DECREF(c_api);
+    Py_DECREF(easings);
 
     return m;
 }
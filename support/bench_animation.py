@@ -0,0 +1,107 @@
+"""Compare AnimationDriver with animating attributes from python.
+
+    python support/bench_animation.py [N ...]
+
+Runs with 10k and 50k sprites by default, each with an alpha and an angle
+tween.
+"""
+
+import sys
+
+from time import perf_counter
+
+from pgcooldown import AnimationDriver, AutoLerpThing, LerpThing
+from pgcooldown.easings import out_quad
+
+FRAMES = 20
+
+
+class Sprite:
+    def __init__(self):
+        self.alpha = 255.0
+        self.angle = 0.0
+
+
+class SlotSprite:
+    __slots__ = ('alpha', 'angle')
+
+
+class AutoSprite:
+    alpha = AutoLerpThing()
+    angle = AutoLerpThing()
+
+
+def tweens():
+    return LerpThing(255, 0, 100, ease=out_quad), LerpThing(0, 360, 100, repeat=1)
+
+
+def python_loop(n):
+    bindings = []
+    for _ in range(n):
+        sprite = Sprite()
+        alpha, angle = tweens()
+        bindings.append((sprite, 'alpha', alpha))
+        bindings.append((sprite, 'angle', angle))
+
+    def frame():
+        for target, attr, tween in bindings:
+            setattr(target, attr, tween())
+
+    return frame
+
+
+def auto_lerpthing(n):
+    sprites = []
+    for _ in range(n):
+        sprite = AutoSprite()
+        sprite.alpha, sprite.angle = tweens()
+        sprites.append(sprite)
+
+    def frame():
+        # Reading is what evaluates an AutoLerpThing
+        for sprite in sprites:
+            sprite.alpha
+            sprite.angle
+
+    return frame
+
+
+def driver(cls):
+    def setup(n):
+        driver = AnimationDriver()
+        for _ in range(n):
+            sprite = cls()
+            alpha, angle = tweens()
+            driver.bind(sprite, 'alpha', alpha)
+            driver.bind(sprite, 'angle', angle)
+
+        return driver.update
+
+    return setup
+
+
+def bench(setup, n):
+    frame = setup(n)
+    frame()
+
+    t0 = perf_counter()
+    for _ in range(FRAMES):
+        frame()
+
+    return (perf_counter() - t0) / FRAMES
+
+
+def main(sizes):
+    impls = (('python setattr loop', python_loop),
+             ('AutoLerpThing', auto_lerpthing),
+             ('AnimationDriver', driver(Sprite)),
+             ('AnimationDriver, slots', driver(SlotSprite)))
+
+    print(f'{"sprites":>8} {"impl":>24} {"per frame":>10}')
+    for n in sizes:
+        for name, setup in impls:
+            print(f'{n:>8} {name:>24} {bench(setup, n) * 1e3:>8.2f}ms')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 50_000])
@@ -0,0 +1,93 @@
+"""Compare the C CronD with the former pure python implementation.
+
+    python support/bench_crond.py [N ...]
+
+Runs with 10k and 100k jobs by default.
+"""
+
+import heapq
+import random
+import sys
+import weakref
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable
+
+from pgcooldown import Cooldown, CronD
+
+
+@dataclass(order=True)
+class PyCronjob:
+    cooldown: Cooldown | float
+    task: Callable = field(compare=False)
+    repeat: bool = field(compare=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.cooldown, Cooldown):
+            self.cooldown = Cooldown(self.cooldown)
+
+
+class PyCronD:
+    """The python CronD as of v0.3.14"""
+    def __init__(self) -> None:
+        self.heap = []
+
+    def add(self, cooldown, task, repeat=False):
+        cj = PyCronjob(cooldown, task, repeat)
+        heapq.heappush(self.heap, cj)
+        return weakref.ref(cj)
+
+    def update(self):
+        while self.heap and self.heap[0].cooldown.cold():
+            cronjob = heapq.heappop(self.heap)
+            cronjob.task()
+            if cronjob.repeat:
+                cronjob.cooldown.reset(wrap=True)
+                heapq.heappush(self.heap, cronjob)
+
+
+def noop():
+    pass
+
+
+def timeit(func):
+    t0 = perf_counter()
+    func()
+    return perf_counter() - t0
+
+
+def bench(cls, n):
+    rnd = random.Random(42)
+
+    # Jobs far in the future, so updates find nothing to do
+    crond = cls()
+    add = timeit(lambda: [crond.add(100 + rnd.random(), noop) for _ in range(n)])
+    idle = timeit(lambda: [crond.update() for _ in range(1000)]) / 1000
+
+    # All jobs are due in the first update
+    crond = cls()
+    for _ in range(n):
+        crond.add(0, noop)
+    run = timeit(crond.update)
+
+    # Repeating jobs, all due and rescheduled
+    crond = cls()
+    for _ in range(n):
+        crond.add(Cooldown(1, cold=True), noop, repeat=True)
+    repeat = timeit(crond.update)
+
+    return add, idle, run, repeat
+
+
+def main(sizes):
+    print(f'{"jobs":>8} {"impl":>6} {"add":>10} {"idle update":>12} {"run all":>10} {"repeat all":>11}')
+    for n in sizes:
+        for name, cls in (('python', PyCronD), ('C', CronD)):
+            add, idle, run, repeat = bench(cls, n)
+            print(f'{n:>8} {name:>6} {add * 1e3:>8.2f}ms {idle * 1e6:>10.2f}us '
+                  f'{run * 1e3:>8.2f}ms {repeat * 1e3:>9.2f}ms')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
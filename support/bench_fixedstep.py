@@ -0,0 +1,61 @@
+"""Compare FixedStep with a Cooldown(dt, wrap=True) loop.
+
+    python support/bench_fixedstep.py [K ...]
+
+Measures the time to find out that K steps are due in a frame, 1, 4 and
+16 steps by default.  The simulation itself is not part of the timing.
+"""
+
+import sys
+
+from time import perf_counter
+
+from pgcooldown import Cooldown, FixedStep
+
+DT = 1e-4
+FRAMES = 2000
+
+
+def wait(k):
+    t0 = perf_counter()
+    while perf_counter() - t0 < k * DT:
+        pass
+
+
+def cooldown_loop(k):
+    cd = Cooldown(DT, wrap=True)
+    total = steps = 0
+    for _ in range(FRAMES):
+        wait(k)
+        t0 = perf_counter()
+        while cd.cold():
+            cd.reset()
+            steps += 1
+        total += perf_counter() - t0
+
+    return total, steps
+
+
+def fixed_step(k):
+    fs = FixedStep(DT, max_steps=1_000_000)
+    total = steps = 0
+    for _ in range(FRAMES):
+        wait(k)
+        t0 = perf_counter()
+        n, alpha = fs.update()
+        steps += n
+        total += perf_counter() - t0
+
+    return total, steps
+
+
+def main(ks):
+    print(f'{"k":>4} {"impl":>16} {"per frame":>10} {"steps/frame":>12}')
+    for k in ks:
+        for name, f in (('Cooldown, wrap', cooldown_loop), ('FixedStep', fixed_step)):
+            total, steps = f(k)
+            print(f'{k:>4} {name:>16} {total / FRAMES * 1e9:>8.0f}ns {steps / FRAMES:>12.1f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1, 4, 16])
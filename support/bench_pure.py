@@ -0,0 +1,53 @@
+"""Compare the pure python core with the C core on this interpreter.
+
+    python support/bench_pure.py [N ...]
+    pypy3 support/bench_pure.py [N ...]
+
+Runs 100k calls of each operation by default.  On CPython the C core wins by
+far, the pure python core is meant for PyPy, where calling into C goes
+through the slow cpyext layer.
+"""
+
+import sys
+
+from array import array
+from time import perf_counter
+
+import pgcooldown._pgcooldown as c
+import pgcooldown._pure as pure
+
+
+def cases(core):
+    cd = core.Cooldown(10)
+    ease = core.easings['out_quad']
+    a, b = array('d', range(100)), array('d', range(100, 200))
+    out = array('d', a)
+    lerp, lerp_into, Cooldown = core.lerp, core.lerp_into, core.Cooldown
+
+    return (('Cooldown()', lambda: Cooldown(10)),
+            ('cd.cold()', cd.cold),
+            ('cd.normalized', lambda: cd.normalized),
+            ('lerp', lambda: lerp(0, 10, 0.5)),
+            ('lerp, eased', lambda: lerp(0, 10, 0.5, ease)),
+            ('lerp_into 100', lambda: lerp_into(out, a, b, 0.5, ease)))
+
+
+def bench(f, n):
+    t0 = perf_counter()
+    for _ in range(n):
+        f()
+
+    return (perf_counter() - t0) / n
+
+
+def main(sizes):
+    print(sys.implementation.name, sys.version.split()[0])
+    print(f'{"calls":>8} {"operation":>16} {"C":>10} {"pure":>10} {"ratio":>7}')
+    for n in sizes:
+        for (name, f_c), (_, f_pure) in zip(cases(c), cases(pure)):
+            t_c, t_pure = bench(f_c, n), bench(f_pure, n)
+            print(f'{n:>8} {name:>16} {t_c * 1e9:>8.0f}ns {t_pure * 1e9:>8.0f}ns {t_pure / t_c:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000])
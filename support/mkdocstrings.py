@@ -9,14 +9,15 @@ Exported for convenience, since these are internally used in the LerpThing.
 
 These are your normal lerp functions.
 
-    lerp(a: float, b:float, t) -> float
-        Returns interpolation from a to b at point in time t
+    lerp(a: float, b:float, t, ease=None) -> float
+        Returns interpolation from a to b at point in time t, optionally
+        eased by `ease(t)`
 
     invlerp(a: float, b: float, v: float) -> float
         Returns t for interpolation from a to b at point v.
 
-    remap(a0: float, b0: float, a1: float, b1: float, v0: float) -> float
-        Maps point v0 in range a0/b0 onto range a1/b1.
+    remap(a0: float, a1: float, b0: float, b1: float, v0: float) -> float
+        Maps point v0 in range a0/a1 onto range b0/b1.
 
 "point in time" in this context means between 0 and 1.
 
@@ -24,6 +25,44 @@ These are your normal lerp functions.
     invlerp(0, 10, 5) --> 0.5
     remap(0, 10, 0, 100, 5) --> 50
 
+The easing functions in `pgcooldown.easings` are run directly in C, any
+other callable is called as usual.
+
+""",
+
+    'LERP_INTO': """lerp_into(out, a, b, t, ease=None) -> out
+Lerp the sequences a and b element-wise at point in time t into `out`.
+If given, `ease(t)` is used instead of `t`.
+
+`a` and `b` must be sequences of numbers with the same length as `out`.
+`out` can be any mutable sequence, e.g. a list or a pygame Vector2.  If
+`out` supports the buffer protocol with doubles (e.g. `array('d')`), the
+results are written directly into the buffer without creating float
+objects.
+
+The output buffer is returned for convenience.
+
+    out = [0, 0]
+    lerp_into(out, (0, 0), (10, 100), 0.5) --> [5.0, 50.0]
+
+""",
+
+    'LERP_KEYFRAMES': """lerp_keyframes(times, values, t, eases=None) -> float
+Lerp between keyframes at time t.
+
+`times` are the ascending points in time of the keyframes, `values` the
+values at these points.  The segment around `t` is found by binary search,
+and lerped, optionally eased by `eases`, which is either one easing
+function for all segments, or a sequence of one easing function or `None`
+per segment.
+
+Before the first and after the last keyframe, the first/last value is
+returned.
+
+    lerp_keyframes((0, 1, 3), (0, 10, 0), 2) --> 5.0
+
+This is what the KeyframeTrack uses internally.
+
 """,
 
     'COOLDOWN': """Track a cooldown over a period of time.
@@ -188,6 +227,678 @@ set_to(val):
 set_cold():
     Same as `cooldown.temperature = 0`.
 
+""",
+
+    'TOKENBUCKET': """Rate limit with bursts.
+
+    bucket = TokenBucket(capacity=10, rate=2)
+
+    while True:
+        if fire_pressed and bucket.try_consume():
+            launch_bullet()
+
+The bucket holds up to `capacity` tokens and refills with `rate` tokens
+per second.  Every event consumes tokens, so bursts up to `capacity`
+events are possible, while the long term rate is limited to `rate`.
+
+The refill is calculated from the same clock as the Cooldown when the
+bucket is accessed, there is no background timer.
+
+
+Arguments
+---------
+capacity: float
+    Maximum number of tokens in the bucket
+
+rate: float
+    Tokens refilled per second
+
+tokens: float = capacity
+    Initial number of tokens, keyword only.  Starts full by default.
+
+
+Attributes
+----------
+capacity: float
+    Maximum number of tokens.  Shrinking it drops surplus tokens.
+
+rate: float
+    Tokens refilled per second.
+
+tokens: float
+    Tokens currently in the bucket.
+
+
+Methods
+-------
+try_consume(n=1): bool
+    Take `n` tokens if available.  Returns False and takes nothing
+    otherwise.
+
+time_until_available(n=1): float
+    Seconds until `n` tokens are available, 0 if they already are,
+    `inf` if they never will be (`n > capacity` or `rate == 0`).
+
+reset():
+    Refill the bucket.
+""",
+
+    'SLIDINGWINDOWLIMITER': """Limit events per time window.
+
+    limiter = SlidingWindowLimiter(limit=100, window=60)
+
+    if not limiter.try_consume():
+        reject_request()
+
+At most `limit` events are allowed within any `window` seconds.
+
+Instead of storing a timestamp per event, the window is approximated with
+the counts of the current and the previous fixed window, with the previous
+window weighted by how much it still overlaps.  This is O(1) in time and
+memory, no matter how many events there are.
+
+
+Arguments
+---------
+limit: float
+    Maximum number of events per window
+
+window: float
+    Length of the window in seconds
+
+
+Attributes
+----------
+limit: float
+    Maximum number of events per window, read/write.
+
+window: float
+    Length of the window in seconds, read only.
+
+count: float
+    The approximated number of events in the sliding window, read only.
+
+
+Methods
+-------
+try_consume(n=1): bool
+    Count `n` events if they fit into the limit.  Returns False and counts
+    nothing otherwise.
+
+time_until_available(n=1): float
+    Seconds until `n` events fit into the limit, 0 if they already do,
+    `inf` if they never will (`n > limit`).
+
+reset():
+    Forget all events.
+""",
+
+    'KEYEDRATELIMITER': """One rate limiter per key, checked in bulk.
+
+    limiter = KeyedRateLimiter(TokenBucket(capacity=5, rate=1))
+
+    # Once per tick for all clients that sent a request
+    allowed = limiter.try_consume_many(client_ids)
+
+    # Now and then
+    limiter.prune()
+
+The given TokenBucket or SlidingWindowLimiter serves as prototype.  Every
+new key gets a fresh limiter with its configuration, i.e. a full bucket or
+an empty window.  Changing the prototype later doesn't affect existing
+keys.
+
+`try_consume_many` checks thousands of keys in one call without going
+through python per key.
+
+
+Arguments
+---------
+limiter: TokenBucket | SlidingWindowLimiter
+    The prototype for all keys
+
+
+Attributes
+----------
+prototype: TokenBucket | SlidingWindowLimiter
+    The limiter given at creation, read only.
+
+
+Methods
+-------
+KeyedRateLimiter supports `len()` and `key in limiter`.
+
+try_consume(key, n=1): bool
+    `try_consume` on the limiter of `key`.
+
+try_consume_many(keys, n=1): list[bool]
+    `try_consume` on the limiters of all keys in order.
+
+time_until_available(key, n=1): float
+    `time_until_available` on the limiter of `key`.
+
+discard(key):
+    Forget `key`.  Does nothing for unknown keys.
+
+prune(): int
+    Forget all keys whose limiter is back in its initial state (full
+    bucket, empty window), since they are identical to a new one.
+    Returns the number of removed keys.
+""",
+
+    'THROTTLE': """Let calls through at most once per cooldown.
+
+    on_mouse_move = Throttle(handle_mouse_move, 0.1)
+
+    # or as decorator
+    @throttle(0.1)
+    def on_mouse_move(event):
+        ...
+
+This is the `if cd.cold(): cd.reset(); do_thing()` pattern in one C call.
+A suppressed call returns None without calling into python.
+
+With `trailing=True`, the last suppressed call is run once the cooldown
+is cold, through the `crond` that must be given then.  The crond needs to
+be updated in the game loop as usual.
+
+When used as a method decorator, every instance gets its own throttle on
+first access, stored in the instance `__dict__` as with
+`functools.cached_property`.
+
+
+Arguments
+---------
+func: callable
+    The function to throttle
+
+seconds: float
+    The cooldown between two calls
+
+wrap: bool = False
+    Reset the cooldown in wrap mode, see Cooldown.
+
+leading: bool = True
+    Run the call that finds the cooldown cold immediately.  Keyword only.
+
+trailing: bool = False
+    Run the last suppressed call at the end of the cooldown.  Keyword only.
+
+crond: CronD = None
+    The crond that runs trailing calls.  Keyword only.
+
+
+Attributes
+----------
+cooldown: Cooldown
+    The underlying cooldown, read only.
+
+pending: bool
+    Is a trailing call waiting?
+
+__wrapped__: callable
+    The throttled function.
+
+
+Methods
+-------
+flush():
+    Run the pending trailing call now.
+
+cancel():
+    Drop the pending trailing call.
+""",
+
+    'DEBOUNCE': """Run a call only after the calls stopped for a while.
+
+    crond = CronD()
+    save_settings = Debounce(write_settings_to_disk, 1.0, crond)
+
+Every call restarts the cooldown.  The last call is run through the
+crond, once no further call came in for `seconds`.  The crond needs to be
+updated in the game loop as usual.
+
+The crond job is only rescheduled when it runs while the cooldown is still
+hot, so a call costs one C call, independent of how often it is repeated.
+
+When used as a method decorator, every instance gets its own debounce on
+first access, stored in the instance `__dict__` as with
+`functools.cached_property`.
+
+
+Arguments
+---------
+func: callable
+    The function to debounce
+
+seconds: float
+    The quiet period before the call is run
+
+crond: CronD = None
+    The crond that runs trailing calls.  Only optional with
+    `trailing=False`.
+
+leading: bool = False
+    Run the first call of a burst immediately.  Keyword only.
+
+trailing: bool = True
+    Run the last call of a burst after the quiet period.  Keyword only.
+
+
+Attributes, Methods
+-------------------
+Same as Throttle.
+""",
+
+    'COOLDOWNTABLE': """A table of cooldowns in a buffer shared between processes.
+
+    shm = SharedMemory(create=True, size=CooldownTable.nbytes(1000))
+    table = CooldownTable(shm.buf, create=True, duration=1.5)
+
+    # in the other processes
+    shm = SharedMemory(name)
+    table = CooldownTable(shm.buf)
+
+    if table.try_acquire(account_id):
+        do_rate_limited_thing()
+
+The cooldowns are stored as deadlines in monotonic nanoseconds directly in
+the buffer, which can be a `multiprocessing.shared_memory` buffer, an mmap'd
+file or anything else writable that supports the buffer protocol.  All
+processes on the same host see the same timers, without copies or IPC.
+
+All updates are atomic.  `try_acquire` checks for cold and starts the
+cooldown in one compare and set, so only one process wins a cold slot.
+On platforms without lock free 64 bit atomics or a monotonic clock,
+`CooldownTable()` raises `NotImplementedError`.
+
+The table is indexed by int, mapping keys to slots is up to the
+application.  There is no pause in shared cooldowns.
+
+See `SharedCooldownTable` for a wrapper that manages the shared memory.
+
+
+Arguments
+---------
+buffer: Buffer
+    A writable, 8 byte aligned buffer of at least `nbytes(size)` bytes.
+
+create: bool = False
+    Initialize a new table in the buffer with all cooldowns cold.
+    Otherwise, the buffer must already contain a table.
+
+duration: float = 0.0
+    The initial duration of all cooldowns when creating.  Keyword only.
+
+
+Methods
+-------
+nbytes(size) -> int:
+    Static method, the buffer size needed for `size` cooldowns.
+
+try_acquire(index, duration=None) -> bool:
+    Start the cooldown if it is cold.  Without `duration`, the stored one
+    is used.
+
+try_acquire_many(indices, duration=None) -> list[bool]:
+    `try_acquire` for many indices in one call.
+
+reset(index, duration=None):
+    Restart the cooldown unconditionally.
+
+set_cold(index):
+    Make the cooldown cold.
+
+compare_and_set(index, expected, new) -> bool:
+    Set the deadline to `new` if it is `expected`.  Deadlines are
+    nanoseconds of `CLOCK_MONOTONIC`, `QueryPerformanceCounter` on Windows.
+
+deadline(index) -> int:
+    The deadline in monotonic nanoseconds.
+
+remaining(index) -> float:
+    Time until the cooldown is cold.
+
+remaining_many(indices=None) -> list[float]:
+    `remaining` for many indices or the whole table.
+
+cold_indices() -> list[int]:
+    The indices of all cold cooldowns.
+
+release():
+    Release the buffer, so e.g. the shared memory can be closed.
+
+The table also is a sequence, `table[i]` returns a CooldownView.
+""",
+
+    'COOLDOWNVIEW': """A Cooldown-like view on a slot of a CooldownTable.
+
+    cd = table[account_id]
+    if cd.cold():
+        cd.reset()
+
+Supports `cold()`, `hot()`, `reset(duration=None)`, `set_cold()`,
+`try_acquire()`, `bool()`, `float()`, calling it and the `duration`,
+`remaining`, `temperature` and `normalized` attributes like Cooldown.
+
+Additionally, `deadline` is the deadline in monotonic nanoseconds, `table`
+and `index` tell which slot this is a view on.
+
+There is no pause in shared cooldowns.
+""",
+
+    'COOLDOWNREGISTRY': """Call back when watched cooldowns go cold, instead of polling them.
+
+    registry = CooldownRegistry()
+    registry.watch(enemy.reload_cooldown, lambda cd: enemy.reload())
+
+    while True:
+        ...
+        registry.poll()
+
+Polling `cold()` on thousands of cooldowns per frame costs time for every
+cooldown, even if only a few of them go cold.  The registry keeps the
+watched cooldowns ordered by deadline, so `poll()` only looks at the ones
+that actually went cold since the last poll.
+
+A callback is called with the cooldown as argument, once every time the
+cooldown goes from hot to cold.  Cooldowns stay watched until `unwatch()`,
+so after a `reset()` the callback fires again.  A cooldown that is already
+cold when it is watched, fires only after it was reset and ran out again.
+
+`reset()`, `pause()`, `set_cold()`, changes of `duration`, `remaining`,
+... are all tracked, the deadline in the registry is updated right away.
+
+A cooldown can only be watched by one registry at a time.  Watching it
+again in the same registry replaces the callback.
+
+
+Methods
+-------
+watch(cooldown, callback):
+    Call `callback(cooldown)` whenever the cooldown goes cold.
+
+unwatch(cooldown) -> bool:
+    Stop watching the cooldown.  Returns if it was watched.
+
+poll() -> int:
+    Run the callbacks of all cooldowns that went cold.  Returns their
+    number.
+
+time_until_next() -> float:
+    Seconds until the next watched cooldown goes cold, inf if none.
+
+clear():
+    Stop watching all cooldowns.
+
+`len()` and `in` are supported as well.
+""",
+
+    'CRONJOB': """A job scheduled in a CronD.
+
+There is no need to instantiate this class yourself, it is returned by
+`CronD.add`.
+
+Calling the job returns the job itself while it is scheduled and None
+once it is finished or removed, just like the weakref that was returned
+by `add` in earlier versions.
+
+
+Arguments
+---------
+cooldown: Cooldown | float
+    Cooldown in seconds before the task runs
+
+task: callable
+    A zero parameter callback
+    If you want to provide parameters to the called function, either
+    provide a wrapper to it, or use a `functools.partial`.
+
+repeat: bool = False
+    Run the task again after each cooldown until removed.
+
+
+Attributes
+----------
+cooldown: Cooldown
+    The cooldown of the job, read only.
+
+task: callable
+
+repeat: bool
+
+scheduled: bool
+    Is the job still waiting in a CronD?
+
+lane: int
+    The priority lane of the job in its CronD, read only.
+
+offset: float
+    How much `jitter` and `spread` push back the first run, 0 after it ran,
+    read only.
+""",
+
+    'CROND': """A job manager class named after the unix scheduling daemon.
+
+In the spirit of unix's crond, this class can be used to run functions
+after a cooldown once or repeatedly.
+
+    crond = CronD()
+
+    # `run_after_ten_seconds()` will be run after 10s.
+    cid = crond.add(10, run_after_ten_seconds, False)
+
+    # Remove the job with the id `cid` if it has not yet run or repeats.
+    crond.remove(cid)
+
+    while True:
+        ...
+        crond.update()
+
+Jobs are kept in a heap ordered by the time they are due, so `update()`
+only looks at the jobs that are due.  Changes to the cooldown of a job,
+e.g. `set_cold()`, `reset()` or `start()`, move the job to its new place
+in the heap.  A job with a paused cooldown doesn't run until the cooldown
+is started.
+
+Many repeating jobs with the same period added at once stay aligned and
+all run in the same frame.  `jitter` and `spread` push back the first run
+of a job by its `offset`.  The cooldown itself is not changed, it might be
+shared.  After the delayed first run, a repeating job restarts its cooldown
+from there, so the offset is kept and the period is unchanged.
+
+Jobs can be put into priority lanes.  Lane 0 is the most important, each
+lane has its own heap and `update()` runs the due jobs lane by lane.
+With `max_jobs` set, the due jobs of lane 1 and up that don't fit into
+the budget of an update are deferred to a later update, or shed.  Lane 0
+always runs completely.
+
+
+Arguments
+---------
+jitter: float = 0
+    Add a random offset in `[0, jitter)` seconds to every new job,
+    keyword only.
+
+spread: float = 0
+    Distribute new repeating jobs evenly over a window of `spread`
+    seconds, usually their period, keyword only.
+
+seed: int = 0
+    Seed of the random generator used for `jitter`, keyword only.  The
+    same seed and the same sequence of `add()` calls give the same
+    offsets.
+
+lanes: int = 1
+    Number of priority lanes, keyword only.
+
+max_jobs: int | None = None
+    Jobs to run per update before lanes after the first are held back,
+    keyword only.  None for no limit.
+
+shed: bool = False
+    Shed the jobs that are held back instead of deferring them, keyword
+    only.  Shed one shot jobs are removed, shed repeating jobs skip this
+    run.
+
+
+Methods
+-------
+add(cooldown, task, repeat=False, *, lane=0, jitter=None, spread=None) -> Cronjob:
+    Schedule a new task.  `cooldown` is the time to wait, either a float
+    or a Cooldown.  With `repeat=True`, the job repeats until removed, the
+    cooldown is reset in wrap mode after every run.  `lane` is the
+    priority lane of the job, `jitter` and `spread` override the defaults
+    of the crond for this job.  Returns the job, use it to remove a
+    pending or repeating job.
+
+remove(cid):
+    Remove a pending or repeating job.  Does nothing if the job already
+    finished.
+
+update():
+    Run all jobs that are due and reschedule repeating ones, lane by
+    lane.  A repeating job runs at most once per update.
+
+reset_stats():
+    Set the counters in `stats` to 0.
+
+
+Attributes
+----------
+heap: list[Cronjob]
+    The scheduled jobs, as a new list.  Use `len(crond)` for their
+    number.
+
+jitter: float, spread: float
+    The defaults for jobs added from now on.
+
+lanes: int
+    Number of priority lanes, read only.
+
+max_jobs: int | None, shed: bool
+    See above.
+
+stats: list[dict[str, int]]
+    Counters per lane: `due` jobs seen by `update()`, deferred jobs are
+    counted again on every update, and how many of them were `run`,
+    `deferred` or `shed`.
+""",
+
+    'EASING': """An easing function implemented in C.
+
+    from pgcooldown.easings import out_quad
+
+    out_quad(0.5)
+    --> 0.75
+
+All easings from rpeasings are available in `pgcooldown.easings`, with the
+same names and results.
+
+Easing objects can be called like any other function, but `lerp()`,
+`lerp_into()`, LerpThing & co. detect them and run the easing directly in
+C, without a python call.
+""",
+
+    'ANIMATIONDRIVER': """Push lerped values into attributes, many at once.
+
+    driver = AnimationDriver()
+
+    for sprite in sprites:
+        driver.bind(sprite, 'alpha', LerpThing(255, 0, 2), callback=kill_sprite)
+
+    while True:
+        ...
+        driver.update()
+
+Every bound tween is evaluated once per `update()` and the result assigned
+to `target.attr`.  LerpThings are evaluated in C, straight from their
+attributes, any other tween (VectorLerpThing, KeyframeTrack, ...) is
+called.  The setter for the attribute is looked up once per target type,
+not on every assignment.
+
+Once a tween is finished, its final value is assigned, the binding is
+removed and the optional callback is called with the target.
+
+Tweens must be callable and have a `finished()` method like the
+LerpThing.
+
+
+Methods
+-------
+bind(target, attr, tween, callback=None):
+    Assign `tween()` to `target.attr` on every update.  Binding the same
+    attribute of the same target again replaces the tween.
+
+unbind(target, attr=None) -> int:
+    Remove the binding of `attr`, or of all attributes of the target.
+    Returns the number of removed bindings.  Unbinding all attributes of a
+    target has to scan all bindings.
+
+update() -> int:
+    Assign the current values of all tweens.  Returns the number of
+    finished bindings.
+
+clear():
+    Remove all bindings.
+
+`len()` is supported as well.
+""",
+    'FIXEDSTEP': """Fixed timestep accumulator for a variable rate loop.
+
+    physics = FixedStep(1 / 120)
+
+    while True:
+        steps, alpha = physics.update()
+        for _ in range(steps):
+            world.step(physics.dt)
+
+        world.render(interpolate=alpha)
+
+`update()` adds the time since the last call and returns the number of
+steps of `dt` that are due, plus `alpha`, the fraction of the next step
+that has already passed, to interpolate between the last two states.
+The time left over is carried into the next frame, like a Cooldown with
+`wrap=True`, but in one call per frame.
+
+If the loop falls too far behind, e.g. because the steps take longer than
+`dt`, catching up would only make it worse.  At most `max_steps` are
+returned per update, the time of the steps above that is dropped and
+added to `dropped`.
+
+
+Arguments
+---------
+dt: float
+    Length of a step in seconds
+
+max_steps: int = 8
+    Maximum number of steps per update, keyword only.
+
+
+Attributes
+----------
+dt: float
+    Length of a step.  Changing it applies from the next update.
+
+max_steps: int
+    Maximum number of steps per update.
+
+alpha: float
+    Fraction of the next step that has passed at the last update.
+
+dropped: float
+    Total seconds dropped because of `max_steps`.  Can be set, e.g. to 0
+    after logging it.
+
+
+Methods
+-------
+update() -> tuple[int, float]:
+    Returns the number of due steps and `alpha`.
+
+reset():
+    Restart from now, discard the accumulated time and `dropped`.
 """,
 }
 
@@ -0,0 +1,17 @@
+import pytest
+
+import pgcooldown
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'c_only: needs the C core, skipped with the pure python one')
+
+
+def pytest_collection_modifyitems(config, items):
+    if not pgcooldown.PURE_PYTHON:
+        return
+
+    skip = pytest.mark.skip(reason='needs the C core')
+    for item in items:
+        if 'c_only' in item.keywords:
+            item.add_marker(skip)
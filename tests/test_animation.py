@@ -0,0 +1,240 @@
+import gc
+import time
+import weakref
+
+import pytest
+
+from pgcooldown import AnimationDriver, Cooldown, KeyframeTrack, LerpThing, LTRepeat
+from pgcooldown.easings import out_quad
+from pytest import approx
+
+
+class Sprite:
+    pass
+
+
+class SlotSprite:
+    __slots__ = ('alpha', '__weakref__')
+
+
+class PropertySprite:
+    def __init__(self):
+        self.log = []
+
+    @property
+    def alpha(self):
+        return self.log[-1]
+
+    @alpha.setter
+    def alpha(self, value):
+        self.log.append(value)
+
+
+def test_animation_driver():
+    driver = AnimationDriver()
+    done = []
+
+    sprite = Sprite()
+    driver.bind(sprite, 'alpha', LerpThing(0, 100, 0.1), done.append)
+    driver.bind(sprite, 'angle', LerpThing(0, 360, 10, ease=out_quad))
+    assert len(driver) == 2
+
+    assert driver.update() == 0
+    assert approx(sprite.alpha, abs=5) == 0
+    assert approx(sprite.angle, abs=1) == 0
+
+    time.sleep(0.05)
+    driver.update()
+    assert approx(sprite.alpha, abs=10) == 50
+
+    # The final value is exactly vt1, then the binding is gone
+    time.sleep(0.06)
+    assert driver.update() == 1
+    assert sprite.alpha == 100
+    assert done == [sprite]
+    assert len(driver) == 1
+
+    sprite.alpha = 42
+    assert driver.update() == 0
+    assert sprite.alpha == 42
+
+
+def test_animation_driver_matches_lerpthing():
+    driver = AnimationDriver()
+    sprite = Sprite()
+
+    lt = LerpThing(10, 20, Cooldown(4), ease=out_quad)
+    lt.duration.pause()
+    lt.duration.remaining = 1.5
+    driver.bind(sprite, 'v', lt)
+    driver.update()
+
+    assert sprite.v == lt()
+
+
+def test_animation_driver_setters():
+    driver = AnimationDriver()
+
+    slot, prop = SlotSprite(), PropertySprite()
+    driver.bind(slot, 'alpha', LerpThing(1, 1, 10))
+    driver.bind(prop, 'alpha', LerpThing(1, 1, 10))
+    driver.update()
+    assert slot.alpha == 1
+    assert prop.log == [1]
+
+    # Changing the class invalidates the cached setter
+    def alpha_x2(self, value):
+        self.log.append(value * 2)
+
+    PropertySprite.alpha = PropertySprite.alpha.setter(alpha_x2)
+    driver.update()
+    assert prop.log == [1, 2]
+
+    del PropertySprite.alpha
+    driver.update()
+    assert prop.alpha == 1
+    assert prop.log == [1, 2]
+
+
+def test_animation_driver_repeat():
+    driver = AnimationDriver()
+    sprite = Sprite()
+
+    lt = LerpThing(0, 10, 0.01, repeat=LTRepeat.LOOP, loops=3)
+    driver.bind(sprite, 'v', lt)
+
+    # Two periods passed, the LerpThing catches up to its last loop
+    time.sleep(0.025)
+    assert driver.update() == 0
+    assert lt.loops == 0
+    assert len(driver) == 1
+
+    time.sleep(0.01)
+    assert driver.update() == 1
+    assert sprite.v == 10
+    assert len(driver) == 0
+
+
+def test_animation_driver_generic_tween():
+    driver = AnimationDriver()
+    sprite = Sprite()
+
+    track = KeyframeTrack(times=(0, 0.02, 0.04), values=(0, 10, 0))
+    driver.bind(sprite, 'v', track)
+    driver.update()
+    assert len(driver) == 1
+
+    time.sleep(0.05)
+    assert driver.update() == 1
+    assert sprite.v == 0
+
+    with pytest.raises(TypeError):
+        driver.bind(sprite, 'v', 42)
+
+    with pytest.raises(TypeError):
+        driver.bind(sprite, 'v', track, callback=42)
+
+
+def test_animation_driver_bind_unbind():
+    driver = AnimationDriver()
+    s0, s1 = Sprite(), Sprite()
+
+    driver.bind(s0, 'a', LerpThing(0, 0, 10))
+    driver.bind(s0, 'b', LerpThing(0, 0, 10))
+    driver.bind(s1, 'a', LerpThing(0, 0, 10))
+
+    # Binding again replaces the tween
+    driver.bind(s0, 'a', LerpThing(5, 5, 10))
+    assert len(driver) == 3
+    driver.update()
+    assert s0.a == 5
+
+    assert driver.unbind(s1, 'a') == 1
+    assert driver.unbind(s1, 'a') == 0
+    assert driver.unbind(s0) == 2
+    assert len(driver) == 0
+
+    driver.bind(s0, 'a', LerpThing(7, 7, 10))
+    driver.update()
+    assert s0.a == 7
+
+    driver.clear()
+    assert len(driver) == 0
+
+
+def test_animation_driver_changes_during_update():
+    driver = AnimationDriver()
+    victim, other = Sprite(), Sprite()
+
+    class Meddler:
+        @property
+        def v(self):
+            return None
+
+        @v.setter
+        def v(self, value):
+            driver.unbind(victim)
+            driver.bind(other, 'v', LerpThing(3, 3, 10))
+
+    driver.bind(Meddler(), 'v', LerpThing(1, 1, 10))
+    driver.bind(victim, 'v', LerpThing(2, 2, 10))
+    driver.update()
+
+    assert not hasattr(victim, 'v')
+    assert other.v == 3
+    assert len(driver) == 2
+
+    # Callbacks run after the update and may rebind
+    sprite = Sprite()
+
+    def again(target):
+        driver.bind(target, 'v', LerpThing(9, 9, 10))
+
+    driver.bind(sprite, 'v', LerpThing(8, 8, 0), callback=again)
+    driver.update()
+    assert sprite.v == 8
+    driver.update()
+    assert sprite.v == 9
+
+
+def test_animation_driver_errors():
+    driver = AnimationDriver()
+    done = []
+
+    class Broken:
+        fail = True
+
+        @property
+        def v(self):
+            return None
+
+        @v.setter
+        def v(self, value):
+            if self.fail:
+                raise ValueError('nope')
+
+    finished = Sprite()
+    broken = Broken()
+    driver.bind(finished, 'v', LerpThing(1, 1, 0), done.append)
+    driver.bind(broken, 'v', LerpThing(1, 1, 10))
+
+    with pytest.raises(ValueError):
+        driver.update()
+    assert len(driver) == 2
+    assert done == []
+
+    broken.fail = False
+    assert driver.update() == 1
+    assert done == [finished]
+
+
+def test_animation_driver_gc():
+    driver = AnimationDriver()
+    sprite = SlotSprite()
+    ref = weakref.ref(sprite)
+
+    driver.bind(sprite, 'alpha', LerpThing(0, 1, 10), callback=lambda s, driver=driver: driver)
+    del sprite, driver
+    gc.collect()
+
+    assert ref() is None
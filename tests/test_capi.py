@@ -0,0 +1,152 @@
+import ctypes
+
+import pytest
+
+import pgcooldown._pgcooldown as _pgcooldown
+
+from pgcooldown import Cooldown
+from pgcooldown.easings import out_quad
+from pytest import approx
+
+# The capsule works on the C Cooldown
+pytestmark = pytest.mark.c_only
+
+# The capsule is meant for C extensions.  Mirror the struct from
+# include/pgcooldown_capi.h with ctypes, PYFUNCTYPE keeps the GIL and raises
+# the exceptions set by the C functions.
+OBJ = ctypes.py_object
+SSIZE = ctypes.c_ssize_t
+DOUBLE = ctypes.c_double
+DOUBLE_P = ctypes.POINTER(ctypes.c_double)
+OBJ_P = ctypes.POINTER(ctypes.py_object)
+
+
+class CAPI(ctypes.Structure):
+    _fields_ = [
+        ('version', ctypes.c_int),
+        ('CooldownType', ctypes.c_void_p),
+
+        ('Check', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ)),
+        ('IsCold', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ)),
+        ('GetTemperature', ctypes.PYFUNCTYPE(DOUBLE, OBJ)),
+        ('GetRemaining', ctypes.PYFUNCTYPE(DOUBLE, OBJ)),
+        ('GetNormalized', ctypes.PYFUNCTYPE(DOUBLE, OBJ)),
+        ('Reset', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ, DOUBLE, ctypes.c_int)),
+        ('SetCold', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ)),
+
+        ('IsColdMany', ctypes.PYFUNCTYPE(SSIZE, OBJ_P, SSIZE, ctypes.c_char_p)),
+        ('GetRemainingMany', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ_P, SSIZE, DOUBLE_P)),
+        ('GetNormalizedMany', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ_P, SSIZE, DOUBLE_P)),
+        ('ResetMany', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ_P, SSIZE, DOUBLE, ctypes.c_int)),
+
+        ('Lerp', ctypes.PYFUNCTYPE(DOUBLE, DOUBLE, DOUBLE, DOUBLE)),
+        ('InvLerp', ctypes.PYFUNCTYPE(DOUBLE, DOUBLE, DOUBLE, DOUBLE)),
+        ('Remap', ctypes.PYFUNCTYPE(DOUBLE, DOUBLE, DOUBLE, DOUBLE, DOUBLE, DOUBLE)),
+        ('Ease', ctypes.PYFUNCTYPE(ctypes.c_int, OBJ, DOUBLE, DOUBLE_P)),
+        ('LerpMany', ctypes.PYFUNCTYPE(ctypes.c_int, DOUBLE_P, DOUBLE_P, DOUBLE_P, SSIZE, OBJ, DOUBLE_P)),
+        ('RemapMany', ctypes.PYFUNCTYPE(None, DOUBLE, DOUBLE, DOUBLE, DOUBLE, DOUBLE_P, SSIZE, DOUBLE_P)),
+    ]
+
+
+@pytest.fixture
+def capi():
+    get_pointer = ctypes.pythonapi.PyCapsule_GetPointer
+    get_pointer.restype = ctypes.c_void_p
+    get_pointer.argtypes = [ctypes.py_object, ctypes.c_char_p]
+
+    ptr = get_pointer(_pgcooldown._C_API, b'pgcooldown._pgcooldown._C_API')
+    return CAPI.from_address(ptr)
+
+
+def doubles(*values):
+    return (DOUBLE * len(values))(*values)
+
+
+def test_capi_version(capi):
+    assert capi.version == 1
+    assert capi.CooldownType == id(Cooldown)
+
+
+def test_capi_cooldown(capi):
+    cd = Cooldown(10)
+
+    assert capi.Check(cd) == 1
+    assert capi.Check(42) == 0
+
+    assert capi.IsCold(cd) == 0
+    assert approx(capi.GetTemperature(cd), abs=0.01) == 10
+    assert approx(capi.GetRemaining(cd), abs=0.01) == 10
+    assert approx(capi.GetNormalized(cd), abs=0.01) == 0
+
+    cd.remaining = 2.5
+    assert approx(capi.GetNormalized(cd), abs=0.01) == 0.75
+
+    assert capi.SetCold(cd) == 0
+    assert capi.IsCold(cd) == 1
+    assert capi.GetNormalized(cd) == 1
+
+    # Negative arguments keep the cooldown's own settings
+    assert capi.Reset(cd, -1, -1) == 0
+    assert cd.duration == 10
+    assert approx(cd.remaining, abs=0.01) == 10
+
+    assert capi.Reset(cd, 5, 0) == 0
+    assert cd.duration == 5
+
+
+def test_capi_type_error(capi):
+    with pytest.raises(TypeError, match='expected a Cooldown'):
+        capi.IsCold(42)
+
+    with pytest.raises(TypeError):
+        capi.GetRemaining('hot')
+
+
+def test_capi_many(capi):
+    cooldowns = [Cooldown(10), Cooldown(10, cold=True), Cooldown(0)]
+    arr = (OBJ * 3)(*cooldowns)
+
+    out = ctypes.create_string_buffer(3)
+    assert capi.IsColdMany(arr, 3, out) == 2
+    assert list(out.raw) == [0, 1, 1]
+
+    remaining = (DOUBLE * 3)()
+    assert capi.GetRemainingMany(arr, 3, remaining) == 0
+    assert approx(list(remaining), abs=0.01) == [10, 0, 0]
+
+    normalized = (DOUBLE * 3)()
+    assert capi.GetNormalizedMany(arr, 3, normalized) == 0
+    assert approx(list(normalized), abs=0.01) == [0, 1, 0]
+
+    assert capi.ResetMany(arr, 2, 3, -1) == 0
+    assert [cd.duration for cd in cooldowns] == [3, 3, 0]
+    assert capi.IsColdMany(arr, 3, out) == 1
+
+    # A bad entry fails the whole batch before anything is reset
+    bad = (OBJ * 2)(cooldowns[0], 42)
+    with pytest.raises(TypeError):
+        capi.ResetMany(bad, 2, 7, -1)
+    assert cooldowns[0].duration == 3
+
+
+def test_capi_lerp(capi):
+    assert capi.Lerp(0, 10, 0.5) == 5
+    assert capi.InvLerp(0, 10, 5) == 0.5
+    assert capi.Remap(0, 10, 0, 100, 5) == 50
+
+    eased = DOUBLE()
+    assert capi.Ease(out_quad, 0.5, ctypes.byref(eased)) == 0
+    assert eased.value == out_quad(0.5)
+    assert capi.Ease(lambda t: t * t, 0.5, ctypes.byref(eased)) == 0
+    assert eased.value == 0.25
+
+    out = (DOUBLE * 3)()
+    a, b, t = doubles(0, 0, 10), doubles(10, 100, 20), doubles(0.5, 0.25, 1)
+    assert capi.LerpMany(a, b, t, 3, None, out) == 0
+    assert list(out) == [5, 25, 20]
+
+    assert capi.LerpMany(a, b, t, 3, out_quad, out) == 0
+    assert list(out) == [7.5, 100 * out_quad(0.25), 20]
+
+    capi.RemapMany(0, 10, 0, 100, doubles(0, 5, 10), 3, out)
+    assert list(out) == [0, 50, 100]
@@ -0,0 +1,50 @@
+from time import sleep
+
+from pgcooldown import KeyedCooldownMap
+from pytest import approx
+
+
+def test_try_acquire():
+    cm = KeyedCooldownMap()
+    assert cm.try_acquire('a', 1)
+    assert not cm.try_acquire('a', 1)
+    assert cm.try_acquire('b', 1)
+    assert 'a' in cm
+    assert 'c' not in cm
+    assert approx(cm.remaining('a'), abs=0.01) == 1
+    assert cm.remaining('c') == 0
+
+    cm.discard('a')
+    assert 'a' not in cm
+    assert cm.try_acquire('a', 1)
+
+
+def test_expiry():
+    cm = KeyedCooldownMap()
+    for i in range(100):
+        cm.try_acquire(i, 0.1)
+    cm.try_acquire('long', 10)
+    assert len(cm) == 101
+
+    sleep(0.2)
+    assert cm.remaining(0) == 0
+    assert cm.try_acquire(0, 0.1)
+    assert len(cm) == 2
+    assert 'long' in cm
+
+
+def test_stale_entries():
+    cm = KeyedCooldownMap()
+    cm.try_acquire('a', 0.1)
+    cm.discard('a')
+    assert cm.try_acquire('a', 0.3)
+    sleep(0.2)
+    # The entry of the first acquire must not drop the second one
+    assert cm.try_acquire('b', 0.1)
+    assert 'a' in cm
+
+    cm.try_acquire('c', 0)
+    assert 'c' not in cm
+
+    cm.clear()
+    assert len(cm) == 0
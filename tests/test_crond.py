@@ -1,10 +1,12 @@
-import pytest  # noqa: F401
+import gc
+import pytest
 
 from functools import partial
-from time import sleep
+from time import perf_counter, sleep
 from types import SimpleNamespace
 
-from pgcooldown import CronD
+from pgcooldown import Cooldown, CronD
+from pytest import approx
 
 
 def slupdate(slp, crond):
@@ -49,3 +51,283 @@ def test_repeated():
 
     slupdate(1, crond)
     assert x.value == 39
+
+
+def test_handle():
+    crond = CronD()
+    cid = crond.add(0, lambda: None)
+    assert cid() is cid
+    assert cid.scheduled
+    assert len(crond) == 1
+
+    crond.update()
+    assert cid() is None
+    assert not cid.scheduled
+    crond.remove(cid)
+    crond.remove(None)
+
+
+def test_order_and_zero_repeat():
+    crond = CronD()
+    ran = []
+
+    crond.add(0.02, partial(ran.append, 'b'))
+    crond.add(0.01, partial(ran.append, 'a'))
+    cid = crond.add(0, partial(ran.append, 'r'), repeat=True)
+
+    crond.update()
+    assert ran == ['r']
+    sleep(0.03)
+    crond.update()
+    assert ran == ['r', 'r', 'a', 'b']
+
+    crond.remove(cid)
+    crond.update()
+    assert len(crond) == 0
+
+
+def test_remove_while_running():
+    crond = CronD()
+    ran = []
+
+    def first():
+        ran.append(1)
+        crond.remove(second)
+        crond.remove(this)
+
+    this = crond.add(0, first, repeat=True)
+    second = crond.add(0, partial(ran.append, 2))
+    crond.update()
+    crond.update()
+    assert ran == [1]
+    assert len(crond) == 0
+
+
+def test_failing_task():
+    crond = CronD()
+    ran = []
+
+    def fail():
+        raise RuntimeError
+
+    crond.add(0, fail)
+    crond.add(0, partial(ran.append, 1))
+    with pytest.raises(RuntimeError):
+        crond.update()
+    assert len(crond) == 1
+
+    crond.update()
+    assert ran == [1]
+
+
+def test_jitter():
+    def offsets(crond, n, **kwargs):
+        jobs = [crond.add(Cooldown(1, paused=True), lambda: None, **kwargs) for _ in range(n)]
+        return [job.offset for job in jobs]
+
+    jittered = offsets(CronD(jitter=0.5, seed=42), 100)
+    assert all(0 <= o < 0.5 for o in jittered)
+    assert len(set(jittered)) == 100
+
+    # Deterministic for the same seed
+    assert offsets(CronD(jitter=0.5, seed=42), 100) == jittered
+    assert offsets(CronD(jitter=0.5, seed=43), 100) != jittered
+
+    # Per job arguments override the defaults
+    crond = CronD(jitter=0.5)
+    assert offsets(crond, 3, jitter=0) == [0, 0, 0]
+    assert offsets(crond, 3, jitter=None) != [0, 0, 0]
+    crond.jitter = 0
+    assert offsets(crond, 3) == [0, 0, 0]
+
+    with pytest.raises(ValueError):
+        CronD(jitter=-1)
+
+    with pytest.raises(ValueError):
+        crond.add(1, lambda: None, jitter=-1)
+
+    with pytest.raises(TypeError):
+        crond.add(1, lambda: None, spread='xyzzy')
+
+
+def test_spread():
+    crond = CronD(spread=1)
+
+    # Only repeating jobs are spread, evenly over the window
+    assert crond.add(Cooldown(1, paused=True), lambda: None).offset == 0
+    spread = sorted(crond.add(Cooldown(1, paused=True), lambda: None, repeat=True).offset
+                    for _ in range(100))
+    assert spread[0] == 0
+    assert max(b - a for a, b in zip(spread, spread[1:])) < 0.02
+
+
+def test_offset_keeps_cooldown():
+    # The cooldown belongs to the caller and might be shared, the offsets
+    # are kept in the jobs instead of stacking up on it.
+    crond = CronD(jitter=5, seed=42)
+    cooldown = Cooldown(10, paused=True)
+
+    first = crond.add(cooldown, lambda: None, jitter=5)
+    second = crond.add(cooldown, lambda: None, jitter=5, repeat=True)
+    assert (cooldown.duration, cooldown.temperature) == (10, 10)
+    assert 0 < first.offset < 5 and 0 < second.offset < 5
+
+    # The job runs `offset` after the cooldown went cold
+    crond = CronD(spread=0.05)
+    cooldown = Cooldown(0)
+    ran = []
+    crond.add(cooldown, lambda: None, repeat=True)
+    job = crond.add(cooldown, partial(ran.append, 1), repeat=True)
+    assert cooldown.cold() and 0 < job.offset < 0.05
+
+    crond.update()
+    assert ran == []
+    sleep(0.05)
+    crond.update()
+    assert ran == [1]
+    assert job.offset == 0
+
+
+def test_spread_keeps_rate():
+    crond = CronD()
+    ran = []
+
+    t0 = perf_counter()
+    for i in range(20):
+        crond.add(0.05, partial(ran.append, i), repeat=True, spread=0.05)
+
+    # Aligned jobs would all run in the same update, spread ones are
+    # distributed over the period, and keep running once per period.
+    per_update = []
+    while perf_counter() - t0 < 0.3:
+        sleep(0.005)
+        before = len(ran)
+        crond.update()
+        per_update.append(len(ran) - before)
+
+    # First run after 0.05s plus the offset, on average 0.025s
+    expected = 20 * ((perf_counter() - t0 - 0.075) / 0.05 + 0.5)
+    assert max(per_update) <= 8
+    assert approx(len(ran), abs=15) == expected
+
+
+def test_lanes():
+    crond = CronD(lanes=3)
+    ran = []
+
+    crond.add(0, partial(ran.append, 'cosmetic'), lane=2)
+    crond.add(0, partial(ran.append, 'normal'), lane=1)
+    job = crond.add(0, partial(ran.append, 'critical'))
+    assert job.lane == 0
+    assert crond.lanes == 3
+    assert len(crond) == 3
+    assert [job.lane for job in crond.heap] == [0, 1, 2]
+
+    crond.update()
+    assert ran == ['critical', 'normal', 'cosmetic']
+    assert [lane['run'] for lane in crond.stats] == [1, 1, 1]
+
+    with pytest.raises(ValueError):
+        crond.add(0, lambda: None, lane=3)
+
+    with pytest.raises(ValueError):
+        CronD(lanes=0)
+
+
+def test_lanes_defer():
+    crond = CronD(lanes=2, max_jobs=2)
+    ran = []
+
+    for i in range(3):
+        crond.add(0, partial(ran.append, f'critical {i}'))
+        crond.add(0, partial(ran.append, f'cosmetic {i}'), lane=1)
+
+    # The first lane always runs completely, the others only within budget
+    crond.update()
+    assert ran == ['critical 0', 'critical 1', 'critical 2']
+    assert crond.stats == [{'due': 3, 'run': 3, 'deferred': 0, 'shed': 0},
+                           {'due': 3, 'run': 0, 'deferred': 3, 'shed': 0}]
+
+    ran.clear()
+    crond.update()
+    assert ran == ['cosmetic 0', 'cosmetic 1']
+    crond.update()
+    assert ran == ['cosmetic 0', 'cosmetic 1', 'cosmetic 2']
+    assert crond.stats[1] == {'due': 7, 'run': 3, 'deferred': 4, 'shed': 0}
+
+    crond.reset_stats()
+    assert crond.stats[1] == {'due': 0, 'run': 0, 'deferred': 0, 'shed': 0}
+
+    crond.max_jobs = None
+    assert crond.max_jobs is None
+    with pytest.raises(ValueError):
+        crond.max_jobs = -1
+
+
+def test_lanes_shed():
+    crond = CronD(lanes=2, max_jobs=1, shed=True)
+    ran = []
+
+    crond.add(0, partial(ran.append, 'critical'))
+    crond.add(0, partial(ran.append, 'once'), lane=1)
+    repeating = crond.add(Cooldown(0.05, cold=True), partial(ran.append, 'repeat'), repeat=True, lane=1)
+
+    # Nothing left of the budget, one shots are dropped, repeating jobs
+    # skip a period
+    crond.update()
+    assert ran == ['critical']
+    assert crond.stats[1] == {'due': 2, 'run': 0, 'deferred': 0, 'shed': 2}
+    assert len(crond) == 1
+    assert repeating.scheduled
+    assert approx(repeating.cooldown.remaining, abs=0.01) == 0.05
+
+    sleep(0.06)
+    crond.update()
+    assert ran == ['critical', 'repeat']
+
+
+def test_cooldown_changes():
+    crond = CronD()
+    ran = []
+
+    # Changes to the cooldown of a scheduled job move its deadline
+    job = crond.add(10, partial(ran.append, 'cold'))
+    job.cooldown.set_cold()
+    crond.update()
+    assert ran == ['cold']
+
+    paused = crond.add(Cooldown(0, paused=True), partial(ran.append, 'started'))
+    crond.update()
+    assert ran == ['cold']
+    paused.cooldown.start()
+    crond.update()
+    assert ran == ['cold', 'started']
+
+    job = crond.add(0, partial(ran.append, 'later'))
+    job.cooldown.reset(10)
+    crond.update()
+    assert ran == ['cold', 'started']
+    crond.remove(job)
+
+    # Jobs can share a cooldown
+    cooldown = Cooldown(10)
+    crond.add(cooldown, partial(ran.append, 'a'))
+    crond.add(cooldown, partial(ran.append, 'b'), repeat=True)
+    cooldown.set_cold()
+    crond.update()
+    assert ran == ['cold', 'started', 'a', 'b']
+
+    cooldown.set_cold()
+    crond.update()
+    assert ran == ['cold', 'started', 'a', 'b', 'b']
+
+
+def test_cooldown_outlives_crond():
+    cooldown = Cooldown(10)
+    crond = CronD()
+    crond.add(cooldown, lambda crond=crond: crond, repeat=True)
+    del crond
+    gc.collect()
+
+    cooldown.set_cold()
+    assert cooldown.cold()
@@ -0,0 +1,62 @@
+import math
+import pickle
+import random
+
+import pytest
+import rpeasings
+
+from array import array
+from pgcooldown import Cooldown, LerpThing, lerp, lerp_into
+from pgcooldown import easings
+from pytest import approx
+
+
+def test_parity():
+    rnd = random.Random(42)
+    ts = [i / 1000 for i in range(1001)] + [rnd.random() for _ in range(1000)]
+
+    assert set(easings.easings) == set(rpeasings.easings)
+    for name, ease in easings.easings.items():
+        reference = rpeasings.easings[name]
+        for t in ts:
+            assert ease(t) == reference(t), (name, t)
+
+
+@pytest.mark.c_only
+def test_easing_repr():
+    assert repr(easings.out_quad) == '<easing out_quad>'
+
+
+def test_easing():
+    ease = easings.out_quad
+    assert ease.__name__ == 'out_quad'
+    assert pickle.loads(pickle.dumps(ease)) is ease
+    assert easings.easings['out_quad'] is ease
+
+    with pytest.raises(TypeError):
+        ease()
+    with pytest.raises(TypeError):
+        ease('x')
+
+
+def test_lerp_ease():
+    assert lerp(0, 10, 0.5, easings.in_quad) == 2.5
+    assert lerp(0, 10, 0.5, lambda t: t * t) == 2.5
+    assert lerp(0, 10, 0.5, None) == 5
+
+    with pytest.raises(ZeroDivisionError):
+        lerp(0, 10, 0.5, lambda t: 1 / 0)
+
+    out = array('d', [0, 0])
+    assert list(lerp_into(out, (0, 0), (10, 100), 0.5, easings.in_quad)) == [2.5, 25]
+
+
+def test_lerpthing_native_ease():
+    lt = LerpThing(0, 10, Cooldown(1, paused=True))
+    assert lt.ease is easings.null
+
+    lt.duration.temperature = 0.5
+    lt.ease = easings.in_quad
+    assert approx(lt()) == 2.5
+    assert list(lt.sample(3)) == [0, 2.5, 10]
+    assert math.isclose(lt(), rpeasings.in_quad(0.5) * 10)
@@ -0,0 +1,117 @@
+import pytest
+
+from pgcooldown import FixedStep
+from time import perf_counter, sleep
+
+# Slack for the FixedStep clock vs. perf_counter
+EPS = 0.002
+
+
+class Bracket:
+    """Run FixedStep calls between two perf_counter readings.
+
+    The exact step counts after a `sleep()` depend on the scheduler, so the
+    tests check that no time is lost or invented instead: everything the
+    FixedStep saw since its start is split into the steps, the remainder in
+    `alpha` and `dropped`, and it must lie between the shortest and longest
+    possible elapsed time around the calls.
+    """
+    def __init__(self, dt, **kwargs):
+        t0 = perf_counter()
+        self.fs = FixedStep(dt, **kwargs)
+        t1 = perf_counter()
+        self.start = (t0, t1)
+        self.steps = 0
+
+    def reset(self):
+        t0 = perf_counter()
+        self.fs.reset()
+        t1 = perf_counter()
+        self.start = (t0, t1)
+        self.steps = 0
+
+    def update(self):
+        dropped = self.fs.dropped
+
+        t0 = perf_counter()
+        steps, alpha = self.fs.update()
+        t1 = perf_counter()
+
+        assert 0 <= steps <= self.fs.max_steps
+        assert 0 <= alpha < 1
+        assert alpha == self.fs.alpha
+
+        # Steps are only dropped above max_steps
+        assert self.fs.dropped == dropped or steps == self.fs.max_steps
+
+        self.steps += steps
+        seen = (self.steps + alpha) * self.fs.dt + self.fs.dropped
+        assert t0 - self.start[1] - EPS <= seen <= t1 - self.start[0] + EPS
+
+        return steps, alpha
+
+
+def test_fixed_step():
+    clock = Bracket(0.02)
+    fs = clock.fs
+    assert repr(fs).startswith('FixedStep(0.02, max_steps=8)')
+    assert fs.max_steps == 8
+
+    # No catch-up limit here, even if the scheduler stalls us
+    fs.max_steps = 1000
+    clock.update()
+
+    # A sleep is at least as long as asked for, so these steps are due
+    sleep(0.05)
+    clock.update()
+    assert clock.steps >= 2
+
+    # The remainder is carried over
+    sleep(0.02)
+    clock.update()
+    assert clock.steps >= 3
+    assert fs.dropped == 0
+
+
+def test_fixed_step_catch_up():
+    clock = Bracket(0.01, max_steps=3)
+    fs = clock.fs
+
+    # At least 7 steps are due, only 3 are run, the rest is dropped
+    sleep(0.075)
+    assert clock.update()[0] == 3
+    assert fs.dropped >= 4 * fs.dt - 1e-9
+
+    # Only what passed since the last update is due now
+    clock.update()
+
+    dropped = fs.dropped
+    fs.max_steps = 100
+    sleep(0.075)
+    assert clock.update()[0] >= 7
+    assert fs.dropped == dropped
+
+    clock.reset()
+    assert fs.dropped == 0
+    clock.update()
+
+
+def test_fixed_step_errors():
+    with pytest.raises(ValueError):
+        FixedStep(0)
+
+    with pytest.raises(ValueError):
+        FixedStep(1, max_steps=0)
+
+    with pytest.raises(TypeError):
+        FixedStep(1, 8)
+
+    fs = FixedStep(1)
+    with pytest.raises(ValueError):
+        fs.dt = -1
+
+    with pytest.raises(TypeError):
+        fs.dt = 'xyzzy'
+
+    with pytest.raises(ValueError):
+        fs.max_steps = 0
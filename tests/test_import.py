@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pgcooldown
+
+
+def imported_modules(code):
+    script = ('import sys\n'
+              'before = set(sys.modules)\n'
+              f'{code}\n'
+              'print(*sorted(set(sys.modules) - before))\n')
+    proc = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    return set(proc.stdout.split())
+
+
+def test_slim_import():
+    # Importing the package must only load the core, the python level
+    # classes and their dependencies are imported lazily.
+    if pgcooldown.PURE_PYTHON:
+        core = {'pgcooldown._pure', 'math'}
+    else:
+        core = {'pgcooldown._pgcooldown'}
+    assert imported_modules('import pgcooldown') <= {'pgcooldown'} | core
+
+
+def test_lazy_import():
+    modules = imported_modules('from pgcooldown import LerpThing')
+    assert 'pgcooldown.lerpthing' in modules
+    assert 'pgcooldown.cooldownmap' not in modules
+
+    modules = imported_modules('from pgcooldown import KeyedCooldownMap')
+    assert 'pgcooldown.cooldownmap' in modules
+    assert 'pgcooldown.lerpthing' not in modules
+
+
+def test_all():
+    for name in pgcooldown.__all__:
+        assert getattr(pgcooldown, name) is not None
+        assert name in dir(pgcooldown)
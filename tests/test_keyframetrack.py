@@ -0,0 +1,94 @@
+import pytest
+
+from time import sleep
+from pgcooldown import Cooldown, LTRepeat, KeyframeTrack
+from pytest import approx
+
+
+def make_track(**kwargs):
+    kt = KeyframeTrack(times=(0, 1, 2, 4), values=(0, 10, 10, 0), **kwargs)
+    kt.duration.pause()
+    return kt
+
+
+def test_init():
+    kt = KeyframeTrack((0, 1), (0, 1))
+    assert isinstance(kt.duration, Cooldown)
+    assert kt.duration.duration == 1
+
+    kt = KeyframeTrack((5,), (42,))
+    assert kt() == 42
+
+    with pytest.raises(ValueError):
+        KeyframeTrack((0, 1), (0, 1, 2))
+
+    with pytest.raises(ValueError):
+        KeyframeTrack((1, 0), (0, 1))
+
+    with pytest.raises(ValueError):
+        KeyframeTrack((0, 1, 2), (0, 1, 2), ease=[None])
+
+
+def test_segments():
+    kt = make_track()
+    assert kt.duration.duration == 4
+
+    for elapsed, expected in ((0, 0), (0.5, 5), (1, 10), (1.5, 10), (3, 5)):
+        kt.duration.temperature = 4 - elapsed
+        assert approx(kt(), abs=0.001) == expected
+
+    kt.duration.temperature = 0
+    assert kt() == 0
+    assert kt.finished()
+
+
+def test_ease():
+    kt = make_track(ease=(lambda t: t * t, None, lambda t: 1 - t))
+    kt.duration.temperature = 3.5
+    assert approx(kt(), abs=0.001) == 2.5
+    kt.duration.temperature = 1
+    assert approx(kt(), abs=0.001) == 5
+
+
+def test_repeat_loop():
+    kt = make_track(repeat=LTRepeat.LOOP)
+    kt.duration.temperature = -8.5
+    assert approx(kt(), abs=0.001) == 5
+    assert not kt.finished()
+
+
+def test_repeat_bounce():
+    kt = make_track(repeat=LTRepeat.BOUNCE, loops=2)
+    kt.duration.temperature = -0.5
+    # On the way back, 0.5s before the end of the forward track
+    assert approx(kt(), abs=0.001) == 2.5
+    kt.duration.temperature = -1
+    assert kt() == 0
+    assert kt.finished()
+
+    kt.reset()
+    assert not kt.finished()
+    assert kt() == 0
+
+
+def test_iterator():
+    values = list(KeyframeTrack((0, 0.2), (0, 1)))
+    assert values[-1] == 1
+
+    kt = KeyframeTrack((0, 0.1), (0, 1))
+    sleep(0.2)
+    assert kt.finished()
+    assert next(kt) == 1
+
+
+def test_sample():
+    kt = KeyframeTrack((0, 1, 2, 4), (0, 10, 10, 0), repeat=LTRepeat.BOUNCE, loops=2)
+    assert list(kt.sample(9)) == [0, 10, 10, 5, 0, 5, 10, 10, 0]
+    assert kt.sample_at((0.5, 3.5), out=[None, None]) == [5, 2.5]
+
+    for elapsed in (0.5, 3.5, 5.5, 9):
+        expected = next(kt.sample_at([elapsed]))
+        kt.reset()
+        kt.duration.pause()
+        kt.duration.temperature = 4 - elapsed
+        assert approx(kt(), abs=1e-6) == expected
@@ -1,7 +1,9 @@
 import pytest
 
 # from pytest import approx
-from pgcooldown import lerp, invlerp, remap
+from array import array
+
+from pgcooldown import lerp, invlerp, remap, lerp_into, lerp_keyframes
 
 
 def test_lerp():
@@ -81,3 +83,71 @@ def test_remap():
     with pytest.raises(TypeError) as e:
         remap(0.0, 1.0, 0.0, 10.0, 'xyzzy')
     assert e.type is TypeError
+
+
+def test_lerp_into():
+    out = [0, 0]
+    assert lerp_into(out, (0, 0), (10, 100), 0.5) is out
+    assert out == [5.0, 50.0]
+
+    out = array('d', [0, 0])
+    lerp_into(out, [0, 0], [10, 100], 0.5)
+    assert out.tolist() == [5.0, 50.0]
+
+    with pytest.raises(ValueError) as e:
+        lerp_into([0], (0, 0), (1, 1), 0.5)
+    assert e.type is ValueError
+
+    with pytest.raises(ValueError) as e:
+        lerp_into(array('d', [0]), (0, 0), (1, 1), 0.5)
+    assert e.type is ValueError
+
+    with pytest.raises(ValueError) as e:
+        lerp_into([0, 0], (0, 0), (1,), 0.5)
+    assert e.type is ValueError
+
+    with pytest.raises(TypeError) as e:
+        lerp_into([0, 0], (0, 'xyzzy'), (1, 1), 0.5)
+    assert e.type is TypeError
+
+    with pytest.raises(TypeError) as e:
+        lerp_into([0, 0], (0, 0), (1, 1), 'xyzzy')
+    assert e.type is TypeError
+
+
+def test_lerp_keyframes():
+    times, values = (0, 1, 3, 3, 4), (0, 10, 0, 20, 20)
+
+    for t, expected in ((-1, 0), (0, 0), (0.5, 5), (1, 10), (2, 5),
+                        (3, 20), (3.5, 20), (4, 20), (5, 20)):
+        assert lerp_keyframes(times, values, t) == expected
+
+    assert lerp_keyframes((5,), (42,), 0) == 42
+    assert lerp_keyframes((5,), (42,), 10) == 42
+
+    def double(t):
+        return 2 * t
+
+    assert lerp_keyframes(times, values, 0.25, double) == 5
+    assert lerp_keyframes(times, values, 0.25, [double, None, None, None]) == 5
+    assert lerp_keyframes(times, values, 1.5, [double, None, None, None]) == 7.5
+
+    with pytest.raises(ValueError) as e:
+        lerp_keyframes((0, 1), (0,), 0.5)
+    assert e.type is ValueError
+
+    with pytest.raises(ValueError) as e:
+        lerp_keyframes((), (), 0.5)
+    assert e.type is ValueError
+
+    with pytest.raises(ValueError) as e:
+        lerp_keyframes(times, values, 0.5, [None])
+    assert e.type is ValueError
+
+    with pytest.raises(TypeError) as e:
+        lerp_keyframes((0, 'xyzzy'), (0, 1), 0.5)
+    assert e.type is TypeError
+
+    with pytest.raises(TypeError) as e:
+        lerp_keyframes((0, 1), (0, 1), 'xyzzy')
+    assert e.type is TypeError
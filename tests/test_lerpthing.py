@@ -1,5 +1,6 @@
+from array import array
 from time import sleep
-from pgcooldown import Cooldown, LTRepeat, LerpThing, AutoLerpThing
+from pgcooldown import Cooldown, LTRepeat, LerpThing, VectorLerpThing, AutoLerpThing
 from pytest import approx
 
 
@@ -132,6 +133,92 @@ def test_iterator():
     assert lt == 1, f'{lt} vs {i / 10} ({i})'
 
 
+def test_catch_up_loop():
+    # Simulate a stall of several periods with a paused cooldown
+    lt = LerpThing(vt0=0, vt1=1, duration=1, repeat=LTRepeat.LOOP)
+    lt.duration.pause()
+    lt.duration.temperature = -3.25
+    assert approx(lt(), abs=0.001) == 0.25
+    assert lt.loops == -6
+
+
+def test_catch_up_bounce():
+    lt = LerpThing(vt0=0, vt1=1, duration=1, repeat=LTRepeat.BOUNCE)
+    lt.duration.pause()
+    lt.duration.temperature = -2.25
+    # 3 periods passed, so we're on the way back
+    assert approx(lt(), abs=0.001) == 0.75
+    assert lt.vt0 == 1
+    assert lt.vt1 == 0
+
+    lt.duration.temperature = -1.25
+    # 2 more periods, direction is unchanged
+    assert approx(lt(), abs=0.001) == 0.75
+    assert lt.vt0 == 1
+
+
+def test_catch_up_loops():
+    lt = LerpThing(vt0=0, vt1=1, duration=1, repeat=LTRepeat.BOUNCE, loops=3)
+    lt.duration.pause()
+    lt.duration.temperature = -1.5
+    assert approx(lt(), abs=0.001) == 0.5
+    assert lt.loops == 0
+    assert not lt.finished()
+
+    lt = LerpThing(vt0=0, vt1=1, duration=1, repeat=LTRepeat.BOUNCE, loops=3)
+    lt.duration.pause()
+    lt.duration.temperature = -7.5
+    assert lt() == 1
+    assert lt.loops == 0
+    assert lt.finished()
+    assert lt() == 1
+
+
+def test_vector():
+    vlt = VectorLerpThing((0, 0), (10, 100), Cooldown(1, paused=True))
+    out = vlt()
+    assert out == [0, 0]
+    assert vlt() is out
+
+    vlt.duration.set_to(0.5)
+    assert approx(vlt()) == [5, 50]
+
+    vlt.duration.set_cold()
+    assert vlt() == [10, 100]
+    assert vlt.finished()
+
+    vlt = VectorLerpThing((0, 0), (10, 100), Cooldown(1, paused=True), repeat=LTRepeat.BOUNCE)
+    vlt.duration.temperature = -0.25
+    assert approx(vlt()) == [7.5, 75]
+    assert vlt.vt0 == (10, 100)
+
+
+def test_sample():
+    lt = LerpThing(0, 10, 1, repeat=LTRepeat.BOUNCE, loops=3)
+    assert list(lt.sample(7)) == [0, 5, 10, 5, 0, 5, 10]
+    assert list(lt.sample(3, span=1)) == [0, 5, 10]
+
+    out = array('d', [0] * 4)
+    assert lt.sample_at((0.25, 1.25, 2.25, 99), out=out) is out
+    assert out.tolist() == [2.5, 7.5, 2.5, 10]
+
+    # The clock is not touched
+    assert lt.loops == 2
+    assert lt.vt0 == 0
+
+    lt = LerpThing(0, 10, 1, ease=lambda t: t * t)
+    assert list(lt.sample_at((-1, 0.5, 2))) == [0, 2.5, 10]
+
+
+def test_sample_matches_call():
+    for repeat in LTRepeat:
+        for elapsed in (0.1, 0.5, 1.3, 2.7, 4.2, 7.9):
+            lt = LerpThing(0, 10, Cooldown(1, paused=True), repeat=repeat, loops=4)
+            expected = next(lt.sample_at([elapsed]))
+            lt.duration.temperature = 1 - elapsed
+            assert approx(lt(), abs=1e-6) == expected, (repeat, elapsed)
+
+
 if __name__ == '__main__':
     test_cooldown()
     test_call_is_v()
@@ -147,3 +234,9 @@ if __name__ == '__main__':
     test_reset()
     test_iterable()
     test_iterator()
+    test_catch_up_loop()
+    test_catch_up_bounce()
+    test_catch_up_loops()
+    test_vector()
+    test_sample()
+    test_sample_matches_call()
@@ -0,0 +1,161 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+import pgcooldown._pgcooldown as c
+import pgcooldown._pure as pure
+
+from pytest import approx
+
+TESTS = os.path.dirname(__file__)
+
+
+def test_easings():
+    rnd = random.Random(42)
+    ts = [i / 1000 for i in range(1001)] + [rnd.random() for _ in range(1000)]
+
+    assert list(pure.easings) == list(c.easings)
+    for name, ease in pure.easings.items():
+        for t in ts:
+            assert ease(t) == c.easings[name](t), (name, t)
+
+
+def test_lerp():
+    rnd = random.Random(42)
+    ease = pure.easings['out_quad']
+    for _ in range(1000):
+        a, b, t = rnd.uniform(-10, 10), rnd.uniform(-10, 10), rnd.random()
+        assert pure.lerp(a, b, t) == c.lerp(a, b, t)
+        assert pure.lerp(a, b, t, ease) == c.lerp(a, b, t, c.easings['out_quad'])
+        assert pure.invlerp(a, b, t) == c.invlerp(a, b, t)
+        assert pure.remap(a, b, 0, 100, t) == c.remap(a, b, 0, 100, t)
+
+    assert repr(pure.remap(0, 0, 0, 1, 1)) == repr(c.remap(0, 0, 0, 1, 1))
+    assert repr(pure.remap(0, 0, 0, 1, 0)) == repr(c.remap(0, 0, 0, 1, 0))
+    assert pure.lerp(True, 3, 0.5) == c.lerp(True, 3, 0.5)
+
+
+def test_lerp_keyframes():
+    rnd = random.Random(42)
+    times = sorted(rnd.uniform(0, 10) for _ in range(20))
+    values = [rnd.uniform(-10, 10) for _ in range(20)]
+    eases = [rnd.choice((None, 'out_quad', 'in_out_elastic')) for _ in range(19)]
+    pure_eases = [pure.easings[e] if e else None for e in eases]
+    c_eases = [c.easings[e] if e else None for e in eases]
+
+    for _ in range(1000):
+        t = rnd.uniform(-1, 11)
+        assert pure.lerp_keyframes(times, values, t) == c.lerp_keyframes(times, values, t)
+        assert (pure.lerp_keyframes(times, values, t, pure_eases)
+                == c.lerp_keyframes(times, values, t, c_eases))
+
+
+@pytest.mark.parametrize('Cooldown', [c.Cooldown, pure.Cooldown])
+def test_cooldown(Cooldown):
+    cd = Cooldown(10, paused=True)
+    assert cd.temperature == 10
+    assert cd.normalized == 0
+    assert repr(cd).startswith('Cooldown(10.0, wrap=False, paused=True) at 0x')
+
+    cd.set_to(4)
+    assert (cd(), int(cd), float(cd), bool(cd)) == (4, 4, 4.0, True)
+    assert cd.normalized == 0.6
+    assert cd > 3 and cd <= 4 and cd == 4 and cd != 5
+
+    with pytest.raises(TypeError):
+        cd < 'xyzzy'
+    with pytest.raises(TypeError):
+        hash(cd)
+    with pytest.raises(ValueError):
+        cd.set_to(11)
+    with pytest.raises(TypeError):
+        cd.duration = 'xyzzy'
+
+    cd.temperature = -3
+    assert (cd.remaining, cd.cold(), cd.hot()) == (0, True, False)
+    with pytest.raises(StopIteration):
+        next(cd)
+
+    assert cd.reset(4, wrap=True) is cd
+    assert (cd.duration, cd.temperature) == (4, 1)
+
+    copy = Cooldown(cd)
+    assert (copy.duration, copy.temperature, copy.paused) == (4, 1, True)
+
+    assert Cooldown(10, cold=True, paused=True).temperature == 0
+
+    running = Cooldown(10)
+    assert running.pause() is running
+    assert approx(running.remaining, abs=0.01) == 10
+    assert running.start() is None
+    assert not running.paused
+    assert approx(running.remaining, abs=0.01) == 10
+
+
+def test_crond():
+    # Same jitter and spread offsets for the same seed
+    def offsets(mod):
+        crond = mod.CronD(jitter=0.5, spread=1, seed=2**64 + 42)
+        return [crond.add(mod.Cooldown(1, paused=True), print, repeat=i % 2).offset
+                for i in range(100)]
+
+    assert offsets(pure) == offsets(c)
+
+
+def test_mixed_cooldowns():
+    # The classes working on a Cooldown refuse the one of the other
+    # implementation instead of taking it for a duration.
+    cd = pure.Cooldown(1)
+
+    with pytest.raises(TypeError, match='pure python Cooldown'):
+        c.CronD().add(cd, print)
+
+    with pytest.raises(TypeError, match='pure python Cooldown'):
+        c.Cronjob(cd, print)
+
+    with pytest.raises(TypeError, match='pure python Cooldown'):
+        c.CooldownRegistry().watch(cd, print)
+
+    cd = c.Cooldown(1)
+
+    with pytest.raises(TypeError, match='C Cooldown'):
+        pure.CronD().add(cd, print)
+
+    with pytest.raises(TypeError, match='C Cooldown'):
+        pure.Cronjob(cd, print)
+
+    with pytest.raises(TypeError, match='C Cooldown'):
+        pure.CooldownRegistry().watch(cd, print)
+
+    job = c.CronD().add(c.Cooldown(1), print)
+    assert isinstance(job.cooldown, c.Cooldown)
+    job = pure.CronD().add(pure.Cooldown(1), print)
+    assert isinstance(job.cooldown, pure.Cooldown)
+
+
+def test_select():
+    code = ('import pgcooldown; '
+            'print(pgcooldown.Cooldown.__module__, pgcooldown.CronD.__module__, '
+            'pgcooldown.TokenBucket.__module__)')
+    env = dict(os.environ)
+
+    env['PGCOOLDOWN_PURE_PYTHON'] = '1'
+    proc = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    assert proc.stdout.split() == ['pgcooldown._pure', 'pgcooldown._pure', '_pgcooldown']
+
+    env['PGCOOLDOWN_PURE_PYTHON'] = '0'
+    proc = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    assert proc.stdout.split() == ['_pgcooldown', '_pgcooldown', '_pgcooldown']
+
+
+def test_suite():
+    # The whole suite must pass with the pure python core, too, the tests
+    # that need the C core are marked `c_only`.
+    env = dict(os.environ, PGCOOLDOWN_PURE_PYTHON='1')
+    proc = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+                           '--ignore', os.path.join(TESTS, 'test_pure.py'), TESTS],
+                          env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout
@@ -0,0 +1,100 @@
+import math
+import pytest
+
+from pgcooldown import TokenBucket, SlidingWindowLimiter, KeyedRateLimiter
+from pytest import approx
+from time import sleep
+
+
+def test_token_bucket():
+    tb = TokenBucket(3, 10)
+    assert repr(tb).startswith('TokenBucket(3.0, 10.0)')
+    assert tb.capacity == 3
+    assert tb.rate == 10
+    assert approx(tb.tokens, abs=0.01) == 3
+
+    assert tb.try_consume(2)
+    assert tb.try_consume()
+    assert not tb.try_consume()
+    assert approx(tb.time_until_available(), abs=0.01) == 0.1
+    assert tb.time_until_available(4) == math.inf
+
+    sleep(0.15)
+    assert tb.try_consume()
+
+    tb.reset()
+    assert approx(tb.tokens, abs=0.01) == 3
+
+    tb = TokenBucket(3, 0, tokens=1)
+    assert tb.try_consume()
+    assert not tb.try_consume()
+    assert tb.time_until_available() == math.inf
+
+    with pytest.raises(ValueError):
+        TokenBucket(-1, 1)
+
+    with pytest.raises(ValueError):
+        tb.try_consume(-1)
+
+
+def test_token_bucket_attributes():
+    tb = TokenBucket(10, 1)
+    tb.capacity = 5
+    assert approx(tb.tokens, abs=0.01) == 5
+
+    tb.tokens = 0
+    tb.rate = 100
+    sleep(0.1)
+    assert approx(tb.tokens, abs=1) == 5
+
+
+def test_sliding_window():
+    sw = SlidingWindowLimiter(3, 0.2)
+    assert repr(sw).startswith('SlidingWindowLimiter(3.0, 0.2)')
+    assert sw.try_consume(2)
+    assert sw.try_consume()
+    assert not sw.try_consume()
+    assert approx(sw.count, abs=0.01) == 3
+
+    # 0.2s until the window rolls over, then 1/3 of it until the previous
+    # window has decayed enough for one more event.
+    assert approx(sw.time_until_available(), abs=0.01) == 0.2 + 0.2 / 3
+    assert sw.time_until_available(4) == math.inf
+
+    sleep(0.3)
+    # Half of the previous window still counts
+    assert approx(sw.count, abs=0.2) == 1.5
+    assert sw.try_consume()
+
+    sw.reset()
+    assert sw.count == 0
+
+    with pytest.raises(ValueError):
+        SlidingWindowLimiter(1, 0)
+
+
+def test_keyed():
+    kl = KeyedRateLimiter(TokenBucket(2, 10))
+    assert kl.try_consume_many(['a', 'b', 'a', 'a']) == [True, True, True, False]
+    assert len(kl) == 2
+    assert 'a' in kl
+    assert not kl.try_consume('a')
+    assert approx(kl.time_until_available('a'), abs=0.01) == 0.1
+    assert kl.time_until_available('new') == 0
+    assert 'new' not in kl
+
+    kl.discard('b')
+    kl.discard('b')
+    assert len(kl) == 1
+
+    assert kl.prune() == 0
+    sleep(0.25)
+    assert kl.prune() == 1
+    assert len(kl) == 0
+
+    kl = KeyedRateLimiter(SlidingWindowLimiter(1, 0.1))
+    assert kl.try_consume_many(range(3)) == [True] * 3
+    assert kl.try_consume_many(range(3)) == [False] * 3
+
+    with pytest.raises(TypeError):
+        KeyedRateLimiter(42)
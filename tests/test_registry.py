@@ -0,0 +1,112 @@
+import gc
+import math
+import time
+
+import pytest
+
+from pgcooldown import Cooldown, CooldownRegistry
+from pytest import approx
+
+
+def test_registry_poll():
+    registry = CooldownRegistry()
+    fired = []
+
+    cooldowns = [Cooldown(d) for d in (0.3, 0.1, 0.2)]
+    for cd in cooldowns:
+        registry.watch(cd, fired.append)
+    assert len(registry) == 3
+    assert cooldowns[0] in registry
+    assert approx(registry.time_until_next(), abs=0.02) == 0.1
+
+    assert registry.poll() == 0
+    time.sleep(0.12)
+    assert registry.poll() == 1
+    assert fired == [cooldowns[1]]
+
+    # Fired cooldowns stay watched, but don't fire again while cold
+    assert registry.poll() == 0
+    time.sleep(0.2)
+    assert registry.poll() == 2
+    assert fired == [cooldowns[1], cooldowns[2], cooldowns[0]]
+    assert registry.time_until_next() == math.inf
+
+    # After a reset, they fire again
+    cooldowns[1].reset()
+    time.sleep(0.12)
+    assert registry.poll() == 1
+    assert fired[-1] is cooldowns[1]
+
+
+def test_registry_rekey():
+    registry = CooldownRegistry()
+    fired = []
+
+    late = Cooldown(10)
+    registry.watch(late, fired.append)
+
+    early = Cooldown(10)
+    registry.watch(early, fired.append)
+    early.duration = 0.05
+    time.sleep(0.07)
+    assert registry.poll() == 1
+    assert fired == [early]
+
+    late.set_cold()
+    assert registry.poll() == 1
+    assert fired == [early, late]
+
+    cd = Cooldown(0.05)
+    registry.watch(cd, fired.append)
+    cd.pause()
+    time.sleep(0.07)
+    assert registry.poll() == 0
+    cd.start()
+    assert approx(registry.time_until_next(), abs=0.02) == 0.05
+
+    cd.reset(1)
+    time.sleep(0.07)
+    assert registry.poll() == 0
+    cd.remaining = 0
+    assert registry.poll() == 1
+
+
+def test_registry_watch():
+    registry = CooldownRegistry()
+    other = CooldownRegistry()
+    fired = []
+
+    # Already cold, didn't cross zero while watched
+    cd = Cooldown(1, cold=True)
+    registry.watch(cd, fired.append)
+    assert registry.poll() == 0
+
+    with pytest.raises(ValueError):
+        other.watch(cd, fired.append)
+    with pytest.raises(TypeError):
+        registry.watch(1, fired.append)
+
+    assert registry.unwatch(cd)
+    assert not registry.unwatch(cd)
+    other.watch(cd, fired.append)
+
+    # Callbacks can change the registry
+    def rewatch(cd):
+        fired.append(cd)
+        cd.reset()
+
+    cd = Cooldown(0.05)
+    registry.watch(cd, print)
+    registry.watch(cd, rewatch)
+    time.sleep(0.07)
+    assert registry.poll() == 1
+    assert cd.hot()
+    time.sleep(0.07)
+    assert registry.poll() == 1
+
+    registry.clear()
+    assert len(registry) == 0 and cd not in registry
+    cd.reset()
+
+    del other
+    gc.collect()
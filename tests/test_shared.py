@@ -0,0 +1,98 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pgcooldown import CooldownTable, SharedCooldownTable
+from pytest import approx
+
+
+def test_cooldown_table():
+    buf = bytearray(CooldownTable.nbytes(4))
+    with pytest.raises(ValueError):
+        CooldownTable(buf)
+
+    table = CooldownTable(buf, create=True, duration=0.1)
+    assert len(table) == 4
+    assert table.cold_indices() == [0, 1, 2, 3]
+
+    assert table.try_acquire(0)
+    assert not table.try_acquire(0)
+    assert table.try_acquire_many([0, 1, -1]) == [False, True, True]
+    assert table.cold_indices() == [2]
+    assert approx(table.remaining(0), abs=0.02) == 0.1
+    assert table.remaining_many([2]) == [0.0]
+    assert len(table.remaining_many()) == 4
+
+    # A second table on the same buffer sees the same cooldowns
+    other = CooldownTable(buf)
+    assert other.cold_indices() == [2]
+
+    deadline = table.deadline(2)
+    assert table.compare_and_set(2, deadline, deadline + 10**9)
+    assert not table.compare_and_set(2, deadline, deadline)
+    assert approx(table.remaining(2), abs=0.02) == 1
+
+    table.set_cold(2)
+    table.reset(3, 0.5)
+    assert approx(table.remaining(3), abs=0.02) == 0.5
+
+    time.sleep(0.12)
+    assert table.cold_indices() == [0, 1, 2]
+
+    with pytest.raises(IndexError):
+        table.try_acquire(4)
+
+    table.release()
+    with pytest.raises(ValueError):
+        table.try_acquire(0)
+
+
+def test_cooldown_view():
+    table = CooldownTable(bytearray(CooldownTable.nbytes(2)), create=True, duration=0.1)
+    cd = table[1]
+    assert cd.index == 1 and cd.table is table
+    assert table[-1].index == 1
+
+    assert cd.cold() and not cd
+    assert cd.try_acquire()
+    assert cd.hot() and cd
+    assert not cd.try_acquire()
+    assert approx(cd(), abs=0.02) == 0.1
+    assert approx(cd.normalized, abs=0.2) == 0
+    assert cd.deadline == table.deadline(1)
+
+    cd.duration = 1
+    cd.reset()
+    assert approx(cd.remaining, abs=0.02) == 1
+    cd.remaining = 0.5
+    assert approx(float(cd), abs=0.02) == 0.5
+
+    cd.set_cold()
+    assert cd.cold()
+    assert cd.temperature <= 0
+
+    with pytest.raises(IndexError):
+        table[2]
+
+
+def test_shared_cooldown_table():
+    with SharedCooldownTable(size=8, duration=5) as table:
+        try:
+            assert len(table) == 8
+            assert table.try_acquire(3)
+
+            code = ('import sys\n'
+                    'from pgcooldown import SharedCooldownTable\n'
+                    'with SharedCooldownTable(sys.argv[1]) as table:\n'
+                    '    print(table.try_acquire(3), table.try_acquire(4))\n')
+            output = subprocess.run([sys.executable, '-c', code, table.name],
+                                    capture_output=True, text=True, check=True).stdout
+            assert output.split() == ['False', 'True']
+            assert not table.try_acquire(4)
+        finally:
+            table.unlink()
+
+    with pytest.raises(ValueError):
+        SharedCooldownTable()
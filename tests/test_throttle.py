@@ -0,0 +1,128 @@
+import pytest
+
+from pgcooldown import Throttle, Debounce, CronD, throttle, debounce
+from time import sleep
+
+
+def test_throttle():
+    calls = []
+
+    @throttle(0.1)
+    def f(x):
+        calls.append(x)
+        return x
+
+    assert f.__name__ == 'f'
+    assert f.__wrapped__ is not None
+    assert f(1) == 1
+    assert f(2) is None
+    assert calls == [1]
+    assert not f.pending
+
+    sleep(0.12)
+    assert f(3) == 3
+    assert calls == [1, 3]
+
+
+def test_throttle_trailing():
+    crond = CronD()
+    calls = []
+
+    t = Throttle(lambda x, y=0: calls.append((x, y)), 0.1, trailing=True, crond=crond)
+    t(1)
+    t(2)
+    t(3, y=4)
+    assert calls == [(1, 0)]
+    assert t.pending
+
+    crond.update()
+    assert calls == [(1, 0)]
+
+    sleep(0.12)
+    crond.update()
+    assert calls == [(1, 0), (3, 4)]
+    assert not t.pending
+    assert t.cooldown.hot()
+
+    t(5)
+    t.cancel()
+    sleep(0.12)
+    crond.update()
+    assert calls == [(1, 0), (3, 4)]
+
+    with pytest.raises(ValueError):
+        Throttle(print, 1, trailing=True)
+
+
+def test_throttle_method():
+    class Gun:
+        def __init__(self):
+            self.shots = 0
+
+        @throttle(1)
+        def fire(self):
+            self.shots += 1
+
+    gun = Gun()
+    gun.fire()
+    gun.fire()
+    assert gun.shots == 1
+
+    # Every instance has its own cooldown
+    other = Gun()
+    other.fire()
+    assert (gun.shots, other.shots) == (1, 1)
+    assert gun.fire.cooldown is not other.fire.cooldown
+    assert gun.fire.__name__ == 'fire'
+
+
+def test_debounce_method():
+    crond = CronD()
+
+    class Settings:
+        def __init__(self):
+            self.saved = []
+
+        @debounce(0.05, crond)
+        def save(self, x):
+            self.saved.append(x)
+
+    a, b = Settings(), Settings()
+    a.save(1)
+    b.save(2)
+    a.save(3)
+    assert a.save.pending and b.save.pending
+
+    sleep(0.07)
+    crond.update()
+    assert (a.saved, b.saved) == ([3], [2])
+
+
+def test_debounce():
+    crond = CronD()
+    calls = []
+
+    @debounce(0.1, crond)
+    def save(x):
+        calls.append(x)
+
+    for i in range(3):
+        save(i)
+        sleep(0.05)
+        crond.update()
+    assert calls == []
+
+    sleep(0.07)
+    crond.update()
+    assert calls == [2]
+
+    save(3)
+    assert save.pending
+    save.flush()
+    assert calls == [2, 3]
+    assert not save.pending
+
+    d = Debounce(calls.append, 0.1, leading=True, trailing=False)
+    d(4)
+    d(5)
+    assert calls == [2, 3, 4]